@@ -0,0 +1,642 @@
+"""
+Backend asíncrono (asyncio + CDP) para los tests E2E de Bright Bogotá
+Varias sesiones sobre una sola conexión DevTools y un solo event loop; las esperas las resuelve el navegador
+"""
+
+import asyncio
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+
+from e2e_browser import DEFAULT_PROFILE, chrome_arguments, find_chrome, get_profile
+from e2e_dom import ANGULAR_STABLE_JS, CART_STATE_JS, SLIDE_INDEX_JS, SNAPSHOT_JS, parse_snapshot
+from e2e_fixtures import CAPTURE_JS, CART_HOOK_JS, INJECT_JS, cookie_params, snapshot_from
+from e2e_results import TestResult
+from e2e_schedule import blocked_by, chains, skipped_result
+
+# websockets solo hace falta con --backend async (opcional); se importa en run_async
+websockets = None
+
+# Espera sin sondeo: la condición se evalúa al empezar y después solo cuando el
+# DOM cambia (MutationObserver) o hay scroll; el navegador resuelve la promesa
+WAIT_FOR_JS = """
+new Promise(function (resolve, reject) {
+  var args = %(args)s;
+  function check() {
+    try { return (function () { %(body)s }).apply(null, args); } catch (e) { return false; }
+  }
+  var first = check();
+  if (first) { resolve(first); return; }
+  var observer, timer;
+  function stop() {
+    observer.disconnect();
+    clearTimeout(timer);
+    window.removeEventListener('scroll', probe, true);
+  }
+  function probe() {
+    var value = check();
+    if (value) { stop(); resolve(value); }
+  }
+  observer = new MutationObserver(probe);
+  observer.observe(document, {subtree: true, childList: true, attributes: true, characterData: true});
+  window.addEventListener('scroll', probe, true);
+  timer = setTimeout(function () { stop(); reject(new Error(%(message)s)); }, %(timeout)d);
+})
+"""
+
+# Centro del elemento (en coordenadas del viewport) tras llevarlo a la vista
+CLICK_POINT_JS = """
+var el = document.querySelector(arguments[0]);
+if (!el) { return null; }
+el.scrollIntoView({block: 'center', inline: 'center', behavior: 'instant'});
+var rect = el.getBoundingClientRect();
+return [rect.left + rect.width / 2, rect.top + rect.height / 2];
+"""
+
+FOCUS_JS = """
+var el = document.querySelector(arguments[0]);
+if (!el) { return false; }
+el.focus();
+if (arguments[1]) { el.value = ''; el.dispatchEvent(new Event('input', {bubbles: true})); }
+return true;
+"""
+
+SELECT_JS = """
+var el = document.querySelector(arguments[0]);
+if (!el) { return false; }
+el.value = arguments[1];
+el.dispatchEvent(new Event('change', {bubbles: true}));
+return el.value === arguments[1];
+"""
+
+SCROLL_BOTTOM_JS = "window.scrollTo({top: document.body.scrollHeight, behavior: 'instant'}); return window.scrollY;"
+
+CART_DRAWER_JS = """
+var el = document.querySelector('.cart-drawer');
+return (!!el && el.classList.contains('open')) === arguments[0];
+"""
+
+
+class CDPError(Exception):
+    """Error devuelto por un comando de CDP o excepción de JavaScript en la página"""
+
+
+class CDPConnection:
+    """Conexión DevTools multiplexada: comandos con id y eventos por (sesión, método)"""
+
+    def __init__(self, websocket):
+        self.websocket = websocket
+        self._next_id = 0
+        self._pending = {}
+        self._listeners = {}
+        self._reader = asyncio.ensure_future(self._read())
+
+    async def _read(self):
+        try:
+            async for raw in self.websocket:
+                message = json.loads(raw)
+                if "id" in message:
+                    future = self._pending.pop(message["id"], None)
+                    if future is None or future.done():
+                        continue
+                    if "error" in message:
+                        future.set_exception(CDPError(message["error"].get("message", message["error"])))
+                    else:
+                        future.set_result(message.get("result", {}))
+                    continue
+                key = (message.get("sessionId"), message.get("method"))
+                for callback in list(self._listeners.get(key, ())):
+                    callback(message.get("params", {}))
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(CDPError("La conexión con Chrome se cerró"))
+            self._pending.clear()
+
+    async def send(self, method, params=None, session_id=None):
+        self._next_id += 1
+        message = {"id": self._next_id, "method": method, "params": params or {}}
+        if session_id:
+            message["sessionId"] = session_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[self._next_id] = future
+        await self.websocket.send(json.dumps(message))
+        return await future
+
+    def on(self, method, callback, session_id=None):
+        self._listeners.setdefault((session_id, method), []).append(callback)
+
+    def off(self, method, callback, session_id=None):
+        listeners = self._listeners.get((session_id, method), [])
+        if callback in listeners:
+            listeners.remove(callback)
+
+    def expect(self, method, session_id=None, predicate=None):
+        """Future con los parámetros del próximo evento ``method`` (registrado ya, antes de enviar nada)"""
+        future = asyncio.get_running_loop().create_future()
+
+        def callback(params):
+            if not future.done() and (predicate is None or predicate(params)):
+                future.set_result(params)
+
+        self.on(method, callback, session_id)
+        future.add_done_callback(lambda _: self.off(method, callback, session_id))
+        return future
+
+    async def close(self):
+        await self.websocket.close()
+        await self._reader
+
+
+class AsyncBrowser:
+    """Un Chrome controlado por CDP; cada página vive en su propio contexto (cookies y storage aislados)"""
+
+    def __init__(self, process, connection, user_data_dir, profile):
+        self.process = process
+        self.connection = connection
+        self.user_data_dir = user_data_dir
+        self.profile = profile
+
+    @classmethod
+    async def launch(cls, profile=DEFAULT_PROFILE, binary=None, timeout=30):
+        profile = get_profile(profile) if isinstance(profile, str) else profile
+        user_data_dir = tempfile.mkdtemp(prefix="e2e-async-")
+        arguments = [
+            binary or find_chrome(),
+            *chrome_arguments(profile),
+            "--remote-debugging-port=0",
+            f"--user-data-dir={user_data_dir}",
+            "about:blank",
+        ]
+        started = time.perf_counter()
+        process = await asyncio.create_subprocess_exec(
+            *arguments, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        # Chrome escribe el puerto y la ruta del websocket del navegador al arrancar
+        port_file = os.path.join(user_data_dir, "DevToolsActivePort")
+        lines = []
+        while len(lines) < 2:
+            if process.returncode is not None:
+                raise RuntimeError(f"Chrome terminó al arrancar (código {process.returncode})")
+            if time.perf_counter() - started > timeout:
+                process.kill()
+                raise RuntimeError("Chrome no abrió el puerto de DevTools")
+            await asyncio.sleep(0.05)
+            if os.path.exists(port_file):
+                with open(port_file, encoding="utf-8") as f:
+                    lines = f.read().split()
+        websocket = await websockets.connect(f"ws://127.0.0.1:{lines[0]}{lines[1]}", max_size=None)
+        print(f"[ASYNC] Chrome (perfil '{profile.name}') listo en {time.perf_counter() - started:.2f}s")
+        return cls(process, CDPConnection(websocket), user_data_dir, profile)
+
+    async def new_page(self):
+        """Página nueva en un contexto de navegador nuevo (equivale a una sesión limpia)"""
+        send = self.connection.send
+        context = (await send("Target.createBrowserContext"))["browserContextId"]
+        target = (await send("Target.createTarget", {"url": "about:blank", "browserContextId": context}))["targetId"]
+        session = (await send("Target.attachToTarget", {"targetId": target, "flatten": True}))["sessionId"]
+        page = AsyncPage(self.connection, session, target, context)
+        await page.send("Page.enable")
+        if self.profile.blocked_urls:
+            await page.send("Network.enable")
+            await page.send("Network.setBlockedURLs", {"urls": list(self.profile.blocked_urls)})
+        return page
+
+    async def close(self):
+        try:
+            await self.connection.send("Browser.close")
+            await self.connection.close()
+        except Exception:
+            pass
+        try:
+            await asyncio.wait_for(self.process.wait(), 10)
+        except asyncio.TimeoutError:
+            self.process.kill()
+            await self.process.wait()
+        shutil.rmtree(self.user_data_dir, ignore_errors=True)
+
+
+class AsyncPage:
+    """Página adjunta por CDP con las operaciones que usan los tests"""
+
+    def __init__(self, connection, session_id, target_id, context_id):
+        self.connection = connection
+        self.session_id = session_id
+        self.target_id = target_id
+        self.context_id = context_id
+        self.viewport = None
+
+    async def send(self, method, params=None):
+        return await self.connection.send(method, params, self.session_id)
+
+    def expect(self, method, predicate=None):
+        return self.connection.expect(method, self.session_id, predicate)
+
+    async def _evaluate(self, expression):
+        response = await self.send("Runtime.evaluate", {
+            "expression": expression, "returnByValue": True, "awaitPromise": True,
+        })
+        if "exceptionDetails" in response:
+            details = response["exceptionDetails"]
+            raise CDPError(details.get("exception", {}).get("description") or details.get("text"))
+        return response["result"].get("value")
+
+    async def call(self, body, *args):
+        """Ejecutar ``body`` como execute_script (con ``arguments``) y devolver su resultado"""
+        return await self._evaluate(f"(function () {{ {body} }}).apply(null, {json.dumps(list(args))})")
+
+    async def call_async(self, body, *args):
+        """Como execute_async_script: ``body`` llama al último argumento con el resultado"""
+        return await self._evaluate(
+            "new Promise(function (done) { (function () { %s }).apply(null, %s.concat([done])); })"
+            % (body, json.dumps(list(args)))
+        )
+
+    async def wait_for(self, body, *args, message="La condición no se cumplió", timeout=15):
+        """Esperar a que ``body`` devuelva un valor verdadero; la página avisa al cambiar el DOM"""
+        expression = WAIT_FOR_JS % {
+            "args": json.dumps(list(args)), "body": body, "message": json.dumps(message),
+            "timeout": int(timeout * 1000),
+        }
+        try:
+            return await asyncio.wait_for(self._evaluate(expression), timeout + 5)
+        except CDPError as e:
+            raise TimeoutError(message) from e
+
+    async def goto(self, url, timeout=30):
+        """Navegar y esperar al evento load y a que Angular quede estable"""
+        loaded = self.expect("Page.loadEventFired")
+        response = await self.send("Page.navigate", {"url": url})
+        if response.get("errorText"):
+            loaded.cancel()
+            raise CDPError(f"No se pudo cargar {url}: {response['errorText']}")
+        await asyncio.wait_for(loaded, timeout)
+        await self.angular_stable()
+
+    async def angular_stable(self):
+        return await self.call_async(ANGULAR_STABLE_JS)
+
+    async def set_viewport(self, width, height):
+        if self.viewport == (width, height):
+            return
+        await self.send("Emulation.setDeviceMetricsOverride", {
+            "width": width, "height": height, "deviceScaleFactor": 1, "mobile": False,
+        })
+        self.viewport = (width, height)
+        await self.angular_stable()
+
+    async def snapshot(self, selectors, attributes=()):
+        selectors = list(selectors)
+        return parse_snapshot(selectors, await self.call(SNAPSHOT_JS, selectors, list(attributes)))
+
+    async def wait_snapshot(self, selectors, attributes=(), timeout=15):
+        """Esperar a que exista el primer selector y devolver el DomSnapshot de todos"""
+        selectors = list(selectors)
+        await self.wait_for(
+            "return !!document.querySelector(arguments[0]);", selectors[0],
+            message=f"No apareció {selectors[0]}", timeout=timeout,
+        )
+        return await self.snapshot(selectors, attributes)
+
+    async def first_present(self, selectors, timeout=15):
+        """Esperar a que exista alguno de los ``selectors`` y devolver (selector, ElementState) del primero"""
+        selectors = list(selectors)
+        await self.wait_for(
+            "return arguments[0].some(function (s) { return !!document.querySelector(s); });", selectors,
+            message=f"No apareció ninguno de {selectors}", timeout=timeout,
+        )
+        dom = await self.snapshot(selectors)
+        return next((selector, dom[selector]) for selector in selectors if dom[selector].present)
+
+    async def visible(self, selector):
+        """Estado del primer elemento de ``selector``"""
+        return (await self.snapshot([selector]))[selector]
+
+    async def click(self, selector):
+        """Clic real (eventos de ratón de CDP) en el centro del elemento"""
+        point = await self.call(CLICK_POINT_JS, selector)
+        if point is None:
+            raise CDPError(f"No existe {selector}")
+        x, y = point
+        for kind in ("mousePressed", "mouseReleased"):
+            await self.send("Input.dispatchMouseEvent", {
+                "type": kind, "x": x, "y": y, "button": "left", "clickCount": 1,
+            })
+
+    async def type(self, selector, text, clear=True):
+        if not await self.call(FOCUS_JS, selector, clear):
+            raise CDPError(f"No existe {selector}")
+        await self.send("Input.insertText", {"text": text})
+
+    async def select(self, selector, value):
+        if not await self.call(SELECT_JS, selector, value):
+            raise CDPError(f"No se pudo elegir '{value}' en {selector}")
+
+    async def close(self):
+        await self.connection.send("Target.closeTarget", {"targetId": self.target_id})
+        await self.connection.send("Target.disposeBrowserContext", {"browserContextId": self.context_id})
+
+
+class AsyncBrightBogota:
+    """Los flujos de TestBrightBogota sobre una AsyncPage.
+
+    Los métodos tienen los mismos nombres que los del registro ``TESTS`` y
+    fallan con una excepción; la salida se acumula en ``lines`` para no
+    mezclarse con la de otras páginas del mismo event loop.
+    """
+
+    def __init__(self, page, base_url, timeout=15, fixtures=None, fixture_builders=None, fixture_locks=None):
+        self.page = page
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.fixtures = fixtures
+        self.fixture_builders = fixture_builders or {}
+        self.fixture_locks = fixture_locks if fixture_locks is not None else {}
+        self.current = None
+        self.lines = []
+
+    def log(self, text):
+        self.lines.append(text)
+
+    async def load_page(self, path="/"):
+        await self.page.goto(self.base_url + path)
+        self.current = path
+
+    async def prepare(self, spec, isolated=False):
+        """Viewport, fixture y página inicial del test (como TestBrightBogota.prepare)"""
+        if isolated:
+            self.current = None
+        if spec.viewport:
+            await self.page.set_viewport(*spec.viewport)
+        if spec.fixture:
+            await self.load_with_fixture(spec.fixture, spec.start_url or "/")
+        elif spec.start_url is not None and spec.start_url != self.current:
+            await self.load_page(spec.start_url)
+
+    async def load_with_fixture(self, name, path):
+        lock = self.fixture_locks.setdefault(name, asyncio.Lock())
+        async with lock:
+            # cached() y save() leen disco y cached() puede pedir el index.html: fuera del event loop
+            snapshot = await asyncio.to_thread(self.fixtures.cached, name, self.base_url)
+            if snapshot is None:
+                snapshot = await self.build_fixture(name)
+        url = self.base_url + path
+        for cookie in snapshot.cookies:
+            await self.page.send("Network.setCookie", cookie_params(cookie, url))
+        script = (await self.page.send("Page.addScriptToEvaluateOnNewDocument", {
+            "source": INJECT_JS % (json.dumps(snapshot.local_storage), json.dumps(snapshot.cart)),
+        }))["identifier"]
+        try:
+            await self.load_page(path)
+        finally:
+            await self.page.send("Page.removeScriptToEvaluateOnNewDocument", {"identifier": script})
+
+    async def build_fixture(self, name):
+        spec = self.fixture_builders[name]
+        self.log(f"[FIXTURE] Preparando '{name}' desde la UI...")
+        hook = (await self.page.send("Page.addScriptToEvaluateOnNewDocument", {"source": CART_HOOK_JS}))["identifier"]
+        try:
+            await self.prepare(spec, isolated=True)
+            await getattr(self, spec.method)()
+            captured = await self.page.call(CAPTURE_JS)
+        finally:
+            await self.page.send("Page.removeScriptToEvaluateOnNewDocument", {"identifier": hook})
+        cookies = (await self.page.send("Network.getCookies"))["cookies"]
+        snapshot = snapshot_from(name, captured, cookies)
+        await asyncio.to_thread(self.fixtures.save, snapshot, self.base_url)
+        return snapshot
+
+    async def run_test(self, spec, isolated=False):
+        result = TestResult(spec.label, spec.method, False)
+        started = time.perf_counter()
+        try:
+            await self.prepare(spec, isolated)
+            await getattr(self, spec.method)()
+            result.passed = True
+            self.log(f"✓ {spec.label}")
+        except Exception as e:
+            self.log(f"✗ Error en {spec.method}: {e}")
+            result.set_error(e)
+        result.duration = time.perf_counter() - started
+        result.output = "\n".join(self.lines) + "\n"
+        self.lines = []
+        return result
+
+    async def test_homepage_loads(self):
+        await self.load_page("/")
+        # Los mismos selectores, con sus alternativas, que TestBrightBogota.test_homepage_loads
+        selector, header = await self.page.first_present(["#header-component", ".header-component, header, app-header"])
+        if selector == "#header-component":
+            assert header.visible, "El header debería estar visible"
+        else:
+            self.log("[TEST] ⚠ Header no encontrado con ID, usando selector alternativo...")
+        selector, logo = await self.page.first_present(
+            ["#site-logo", ".logo-box img, img[alt*='logo' i], img[alt*='LOGO' i]"]
+        )
+        if selector == "#site-logo":
+            assert logo.visible, "El logo debería estar visible"
+        else:
+            self.log("[TEST] ⚠ Logo no encontrado con ID, usando selector alternativo...")
+
+    async def test_top_banner_display(self):
+        dom = await self.page.wait_snapshot(["#top-banner"])
+        assert dom["#top-banner"].visible, "El banner debería estar visible"
+
+    async def test_search_box_functionality(self):
+        dom = await self.page.wait_snapshot(["#header-search"], attributes=["placeholder"])
+        search = dom["#header-search"]
+        assert search.visible, "La caja de búsqueda debería estar visible"
+        assert "buscando" in (search.attribute("placeholder") or "").lower(), \
+            "El placeholder debería contener 'buscando'"
+        await self.page.type("#header-search", "zapatos")
+
+    async def test_hamburger_menu_mobile(self):
+        dom = await self.page.wait_snapshot(["#hamburger-menu-btn"])
+        assert dom["#hamburger-menu-btn"].visible, "El botón hamburguesa debería estar visible"
+        await self.page.click("#hamburger-menu-btn")
+        await self.page.wait_for(
+            "var el = document.getElementById('main-header'); return !!el && el.classList.contains('open-menu');",
+            message="El menú debería estar abierto", timeout=self.timeout,
+        )
+        await self.page.click("#close-menu-btn")
+        await self.page.wait_for(
+            "var el = document.getElementById('main-header'); return !!el && !el.classList.contains('open-menu');",
+            message="El menú debería cerrarse", timeout=self.timeout,
+        )
+
+    async def test_main_menu_desktop(self):
+        dom = await self.page.wait_snapshot(["#main-menu", "#main-menu li > a"])
+        assert dom["#main-menu"].visible, "El menú principal debería estar visible"
+        texts = [item.text for item in dom.all("#main-menu li > a")]
+        assert texts, "El menú debería tener items"
+        for expected in ("Catálogo", "Acerca de", "Contacto"):
+            assert expected in texts, f"'{expected}' debería estar en el menú"
+
+    async def slide_changed(self, previous):
+        return await self.page.wait_for(
+            SLIDE_INDEX_JS.replace("return i + 1;", "if (i + 1 !== arguments[0]) { return i + 1; }"),
+            previous, message=f"El slideshow no cambió del slide {previous}", timeout=self.timeout,
+        )
+
+    async def test_slideshow_navigation(self):
+        dom = await self.page.wait_snapshot(["#slideshow-container", "#slide-prev", "#slide-next"])
+        assert dom["#slideshow-container"].visible, "El slideshow debería estar visible"
+        first = await self.page.call(SLIDE_INDEX_JS)
+        await self.page.click("#slide-next")
+        following = await self.slide_changed(first)
+        await self.page.click("#slide-prev")
+        previous = await self.slide_changed(following)
+        assert previous == first, "El botón anterior debería volver al slide inicial"
+
+    async def test_product_details_display(self):
+        dom = await self.page.wait_snapshot(
+            ["#product-details", "#product-title", "#product-sku", "#product-description"]
+        )
+        assert dom["#product-details"].visible, "La sección de producto debería estar visible"
+        assert "Stiletto" in dom["#product-title"].text, "El título debería contener 'Stiletto'"
+        assert "SKU" in dom["#product-sku"].text, "Debería mostrar el SKU"
+        assert dom["#product-description"].text, "Debería tener descripción"
+
+    async def cart_drawer(self, open=True):
+        await self.page.wait_for(CART_DRAWER_JS, open, message="El drawer del carrito no cambió de estado",
+                                 timeout=self.timeout)
+
+    async def test_add_to_cart_functionality(self):
+        await self.page.wait_snapshot(["#product-details"])
+        await self.page.select("#size", "34")
+        await self.page.angular_stable()
+        dom = await self.page.snapshot(["#quantity", "#add-to-cart-btn"], attributes=["value", "disabled"])
+        assert dom["#quantity"].attribute("value") == "1", "La cantidad por defecto debería ser 1"
+        assert not dom["#add-to-cart-btn"].attribute("disabled"), "El botón debería estar habilitado"
+        before = await self.page.call(CART_STATE_JS)
+        await self.page.click("#add-to-cart-btn")
+        await self.page.wait_for(
+            CART_STATE_JS.replace("return [items.length, quantity];",
+                                  "return items.length !== arguments[0][0] || quantity !== arguments[0][1];"),
+            before, message=f"El carrito no cambió de {before}", timeout=self.timeout,
+        )
+        await self.cart_drawer()
+
+    async def test_cart_icon_clickable(self):
+        dom = await self.page.wait_snapshot(["#cart-nav"])
+        assert dom["#cart-nav"].visible, "El icono del carrito debería estar visible"
+        await self.page.click("#cart-nav")
+        await self.cart_drawer()
+
+    async def test_cart_functionality(self):
+        await self.page.click("#cart-nav")
+        await self.cart_drawer()
+        dom = await self.page.wait_snapshot([
+            "#cart-container", "[id^='cart-item-']", "#increase-qty-0", "#decrease-qty-0",
+            "#cart-checkout", "#cart-clear", "#cart-empty",
+        ])
+        if dom.all("[id^='cart-item-']"):
+            hidden = [selector for selector in ("#increase-qty-0", "#decrease-qty-0", "#cart-checkout", "#cart-clear")
+                      if not dom[selector].visible]
+            assert not hidden, f"Controles del carrito no visibles: {hidden}"
+        else:
+            assert "vacío" in dom["#cart-empty"].text.lower(), "Debería mostrar mensaje de carrito vacío"
+
+    async def test_contact_form_display(self):
+        await self.page.call(SCROLL_BOTTOM_JS)
+        await self.page.wait_snapshot(["#contact-form"])
+        fields = ("#contact-form", "#form-name", "#form-email", "#form-phone", "#form-city", "#form-message",
+                  "#form-submit")
+        # Cada comprobación es un mensaje independiente sobre el mismo websocket: van solapadas
+        states = await asyncio.gather(*(self.page.visible(selector) for selector in fields))
+        hidden = [state.selector for state in states if not state.visible]
+        assert not hidden, f"Elementos del formulario no visibles: {hidden}"
+
+    async def test_contact_form_validation(self):
+        await self.page.call(SCROLL_BOTTOM_JS)
+        await self.page.wait_snapshot(["#form-submit"])
+        await self.page.type("#form-name", "Juan Pérez García")
+        await self.page.type("#form-email", "test@example.com")
+
+    async def test_responsive_design(self):
+        await self.page.set_viewport(375, 667)
+        dom = await self.page.wait_snapshot(["#hamburger-menu-btn"])
+        assert dom["#hamburger-menu-btn"].visible, "Menú hamburguesa debería estar visible en móvil"
+        await self.page.set_viewport(768, 1024)
+        await self.page.set_viewport(1024, 768)
+        dom = await self.page.wait_snapshot(["#main-menu"])
+        assert dom["#main-menu"].visible, "Menú principal debería estar visible en desktop"
+
+
+async def _run(specs, base_url, profile, sessions, timeout, fixtures, fixture_builders):
+    groups = chains(specs)
+    print(f"[ASYNC] Ejecutando {len(specs)} tests ({len(groups)} cadenas) con {sessions} páginas "
+          "en un solo event loop...")
+    browser = await AsyncBrowser.launch(profile)
+    limit = asyncio.Semaphore(sessions)
+    fixture_locks = {}
+
+    async def run_chain(chain):
+        results, outcomes = [], {}
+        async with limit:
+            page = await browser.new_page()
+            try:
+                suite = AsyncBrightBogota(page, base_url, timeout, fixtures, fixture_builders, fixture_locks)
+                for position, spec in enumerate(chain):
+                    requirement = blocked_by(spec, outcomes)
+                    if requirement:
+                        result = skipped_result(spec, requirement)
+                    else:
+                        result = await suite.run_test(spec, isolated=position == 0)
+                    outcomes[spec.method] = result.passed
+                    results.append(result)
+            finally:
+                await page.close()
+        return results
+
+    started = time.perf_counter()
+    try:
+        by_method = {}
+        for results in await asyncio.gather(*(run_chain(chain) for chain in groups)):
+            for result in results:
+                print(result.output, end="")
+                by_method[result.test] = result
+    finally:
+        await browser.close()
+    print(f"\n[ASYNC] Tiempo total: {time.perf_counter() - started:.2f}s")
+    return [by_method[spec.method] for spec in specs]
+
+
+def run_async(specs, base_url, profile=DEFAULT_PROFILE, sessions=4, timeout=15, fixtures=None,
+              fixture_builders=None):
+    """Ejecutar ``specs`` con el backend asíncrono y devolver sus TestResult en el orden del registro.
+
+    Cada cadena de tests (ver ``e2e_schedule.chains``) usa una página en su
+    propio contexto de navegador; hasta ``sessions`` cadenas avanzan a la vez
+    sobre un único Chrome, una única conexión DevTools y un único hilo.
+    """
+    global websockets
+    if websockets is None:
+        try:
+            import websockets
+        except ImportError:
+            raise RuntimeError("El backend asíncrono necesita websockets: pip install websockets")
+    return asyncio.run(_run(specs, base_url, profile, max(1, sessions), timeout, fixtures, fixture_builders))
+
+
+class AsyncRunner:
+    """``run_async`` con la interfaz de ``ParallelRunner.run``, para los reintentos de ``e2e_flaky.rerun_failed``.
+
+    Cada llamada arranca un Chrome nuevo, así que los tests reintentados no
+    heredan nada de la ejecución que falló.
+    """
+
+    def __init__(self, base_url, **options):
+        self.base_url = base_url
+        self.options = options
+
+    def run(self, specs, iteration=1):
+        results = run_async(specs, self.base_url, **self.options)
+        for result in results:
+            result.iteration = iteration
+        return results
@@ -0,0 +1,327 @@
+"""
+Creación de sesiones de Chrome para los tests E2E de Bright Bogotá
+Incluye los perfiles de navegador seleccionables en tiempo de ejecución (full, headless, lean)
+y la resolución de ChromeDriver cacheada por versión de Chrome
+"""
+
+import json
+import os
+import re
+import shutil
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from e2e_network import enable_performance_log
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DRIVER_CACHE = os.path.join(ROOT, ".e2e", "chromedriver.json")
+
+CHROME_BINARIES = ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome")
+CHROME_LOCATIONS = (
+    r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+    r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
+    "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+)
+
+VERSION_RE = re.compile(r"(\d+)\.(\d+)\.(\d+)\.(\d+)")
+
+
+@dataclass(frozen=True)
+class BrowserProfile:
+    """Configuración de Chrome con la que se arrancan las sesiones"""
+    name: str
+    description: str
+    headless: bool = False
+    images: bool = True
+    page_load_strategy: str = "normal"
+    blocked_urls: tuple = ()
+
+
+# Analítica, fuentes y fotos de producto (heel-01/*.webp, bck.webp, men-chatting.jpg):
+# no afectan a lo que verifican los tests de DOM
+LEAN_BLOCKED_URLS = (
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*doubleclick.net*",
+    "*connect.facebook.net*",
+    "*fonts.googleapis.com*",
+    "*fonts.gstatic.com*",
+    "*.woff",
+    "*.woff2",
+    "*.ttf",
+    "*.otf",
+    "*.webp",
+    "*.jpg",
+    "*.jpeg",
+    "*.gif",
+)
+
+PROFILES = {
+    "full": BrowserProfile("full", "Chrome con ventana y todos los recursos"),
+    "headless": BrowserProfile("headless", "Chrome sin ventana y todos los recursos", headless=True),
+    "lean": BrowserProfile(
+        "lean",
+        "Headless sin imágenes, fuentes ni analítica y carga 'eager' (solo checks de DOM)",
+        headless=True,
+        images=False,
+        page_load_strategy="eager",
+        blocked_urls=LEAN_BLOCKED_URLS,
+    ),
+}
+
+DEFAULT_PROFILE = "full"
+
+
+def get_profile(name):
+    """Buscar un perfil por nombre"""
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Perfil de navegador desconocido: '{name}' (disponibles: {', '.join(PROFILES)})")
+
+
+def chrome_arguments(profile=PROFILES[DEFAULT_PROFILE]):
+    """Argumentos de línea de comandos de Chrome para un perfil (los usan los dos backends)"""
+    arguments = []
+    if profile.headless:
+        arguments.append('--headless=new')
+    if not profile.images:
+        arguments.append('--blink-settings=imagesEnabled=false')
+    arguments += [
+        '--no-sandbox',
+        '--disable-dev-shm-usage',
+        '--disable-blink-features=AutomationControlled',
+        '--disable-gpu',
+        '--window-size=1920,1080',
+    ]
+    return arguments
+
+
+def chrome_options(profile=PROFILES[DEFAULT_PROFILE]):
+    """Opciones de ChromeDriver para un perfil"""
+    # Selenium solo hace falta al arrancar sesiones de ChromeDriver
+    from selenium.webdriver.chrome.options import Options
+
+    options = Options()
+    for argument in chrome_arguments(profile):
+        options.add_argument(argument)
+    if not profile.images:
+        options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    options.page_load_strategy = profile.page_load_strategy
+    options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    options.add_experimental_option('useAutomationExtension', False)
+    return options
+
+
+def apply_profile(driver, profile):
+    """Ajustes del perfil que se aplican por CDP una vez arrancada la sesión"""
+    if profile.blocked_urls:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(profile.blocked_urls)})
+
+
+class StartupTimer:
+    """Tiempo de arranque del runner por fase (imports, ChromeDriver, sesiones...)"""
+
+    def __init__(self):
+        self.phases = []
+        self._lock = threading.Lock()
+
+    def add(self, name, seconds):
+        with self._lock:
+            self.phases.append((name, seconds))
+
+    @contextmanager
+    def phase(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started)
+
+    def report(self):
+        if not self.phases:
+            return
+        total = sum(seconds for _, seconds in self.phases)
+        parts = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in self.phases)
+        print(f"[STARTUP] {total:.2f}s: {parts}")
+
+
+STARTUP = StartupTimer()
+
+
+def find_chrome():
+    """Ejecutable de Chrome: CHROME_BIN, el PATH o las rutas de instalación habituales"""
+    binary = os.environ.get("CHROME_BIN")
+    if binary:
+        return binary
+    for name in CHROME_BINARIES:
+        path = shutil.which(name)
+        if path:
+            return path
+    for path in CHROME_LOCATIONS:
+        if os.path.exists(path):
+            return path
+    raise RuntimeError("No se encontró Chrome; indica el ejecutable con CHROME_BIN")
+
+
+def _binary_version(binary):
+    """Versión que imprime ``binary --version`` (None si no se puede leer)"""
+    try:
+        output = subprocess.run([binary, "--version"], capture_output=True, text=True, timeout=10).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = VERSION_RE.search(output)
+    return match.group(0) if match else None
+
+
+def chrome_version(binary=None):
+    """Versión de Chrome instalada, sin arrancar el navegador.
+
+    En Windows ``chrome.exe --version`` no imprime nada; la versión se toma
+    de la carpeta con su número que hay junto al ejecutable.
+    """
+    try:
+        binary = binary or find_chrome()
+    except RuntimeError:
+        return None
+    version = _binary_version(binary)
+    if version is None and os.name == "nt":
+        folder = os.path.dirname(binary)
+        versions = [name for name in os.listdir(folder) if VERSION_RE.fullmatch(name)]
+        version = max(versions, key=lambda name: tuple(map(int, name.split(".")))) if versions else None
+    return version
+
+
+def _major(version):
+    return version.split(".")[0] if version else None
+
+
+class DriverResolver:
+    """Ruta de ChromeDriver para la versión de Chrome instalada, resuelta una vez por ejecución.
+
+    Orden: ``CHROMEDRIVER`` del entorno, la caché en disco para esa versión
+    de Chrome, un chromedriver del PATH con la misma versión mayor y, solo si
+    nada de eso sirve, webdriver-manager (que consulta la red). Lo que se
+    resuelve se guarda en ``cache`` por versión de Chrome, así que las
+    ejecuciones siguientes funcionan sin red. Si todo falla devuelve None y
+    Selenium Manager busca el driver por su cuenta.
+    """
+
+    def __init__(self, cache=DRIVER_CACHE):
+        self.cache = cache
+        self._lock = threading.Lock()
+        self._resolved = False
+        self.path = None
+        self.source = None
+        self.chrome = None
+
+    def _load(self):
+        if not os.path.exists(self.cache):
+            return {}
+        try:
+            with open(self.cache, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _store(self, path):
+        entries = self._load()
+        entries[self.chrome] = {"path": path, "driver_version": _binary_version(path)}
+        os.makedirs(os.path.dirname(self.cache), exist_ok=True)
+        with open(self.cache, "w", encoding="utf-8") as f:
+            json.dump(entries, f, indent=2, sort_keys=True)
+
+    def _candidates(self):
+        path = os.environ.get("CHROMEDRIVER")
+        if path:
+            yield path, "CHROMEDRIVER"
+        if self.chrome:
+            cached = self._load().get(self.chrome, {}).get("path")
+            if cached and os.path.exists(cached):
+                yield cached, "caché"
+            path = shutil.which("chromedriver")
+            if path and _major(_binary_version(path)) == _major(self.chrome):
+                yield path, "PATH"
+        try:
+            # Import tardío: webdriver-manager es opcional y solo hace falta sin caché
+            from webdriver_manager.chrome import ChromeDriverManager
+        except ImportError:
+            print("[INIT] ⚠ webdriver-manager no está instalado y no hay ChromeDriver en caché para "
+                  f"Chrome {self.chrome or '?'}; se usará Selenium Manager (pip install webdriver-manager)")
+            return
+        try:
+            yield ChromeDriverManager().install(), "webdriver-manager"
+        except Exception as e:
+            print(f"[INIT] ⚠ Error con webdriver-manager: {e}")
+
+    def resolve(self):
+        with self._lock:
+            if self._resolved:
+                return self.path
+            with STARTUP.phase("versión de Chrome"):
+                self.chrome = chrome_version()
+            with STARTUP.phase("ChromeDriver"):
+                for path, source in self._candidates():
+                    self.path, self.source = path, source
+                    if self.chrome and source not in ("caché", "CHROMEDRIVER"):
+                        self._store(path)
+                    break
+            self._resolved = True
+            return self.path
+
+    def probe(self):
+        """Comprobación barata antes de arrancar sesiones: versiones de Chrome y ChromeDriver"""
+        path = self.resolve()
+        driver = _binary_version(path) if path else None
+        print(f"[INIT] Chrome {self.chrome or '?'}, ChromeDriver {driver or '?'} "
+              f"({self.source or 'Selenium Manager'})")
+        if self.chrome and driver and _major(driver) != _major(self.chrome):
+            print("[INIT] ⚠ Las versiones mayores de Chrome y ChromeDriver no coinciden")
+        return self.chrome, path
+
+
+DRIVERS = DriverResolver()
+
+
+def create_driver(profile=DEFAULT_PROFILE, performance_log=False):
+    """Arrancar una sesión nueva de Chrome lista para los tests.
+
+    Con ``performance_log=True`` ChromeDriver guarda los eventos de red de CDP
+    (lo usa el registro de red de ``--network``).
+    """
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+
+    profile = get_profile(profile) if isinstance(profile, str) else profile
+    print(f"\n[INIT] Inicializando ChromeDriver (perfil '{profile.name}')...")
+
+    try:
+        options = chrome_options(profile)
+        if performance_log:
+            enable_performance_log(options)
+
+        path = DRIVERS.resolve()
+        service = Service(path) if path else Service()
+        driver = webdriver.Chrome(service=service, options=options)
+        print(f"[INIT] ✓ ChromeDriver inicializado ({DRIVERS.source or 'Selenium Manager'})")
+
+        if not profile.headless:
+            driver.maximize_window()
+        apply_profile(driver, profile)
+        print("[INIT] ✓ Navegador configurado correctamente\n")
+        return driver
+
+    except Exception as e:
+        print(f"\n✗ ERROR CRÍTICO al inicializar ChromeDriver:")
+        print(f"  {str(e)}")
+        print("\nPosibles soluciones:")
+        print("1. Verifica que Chrome esté instalado")
+        print("2. Instala webdriver-manager: pip install webdriver-manager")
+        print("3. O descarga ChromeDriver manualmente desde:")
+        print("   https://chromedriver.chromium.org/downloads")
+        print("4. Asegúrate de que la versión de ChromeDriver coincida con tu versión de Chrome")
+        print(f"5. O indica la ruta con CHROMEDRIVER (la caché está en {DRIVERS.cache})")
+        raise
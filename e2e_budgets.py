@@ -0,0 +1,165 @@
+"""
+Presupuestos de rendimiento y detección de regresiones para los tests E2E de Bright Bogotá
+Compara las métricas de la ejecución contra umbrales fijos y contra una línea base móvil
+"""
+
+import json
+import os
+import statistics
+from dataclasses import dataclass
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BUDGETS = os.path.join(ROOT, "e2e_budgets.json")
+DEFAULT_BASELINE = os.path.join(ROOT, ".e2e", "baseline.json")
+
+# Factor para convertir la MAD en una estimación de la desviación típica (datos normales)
+MAD_SCALE = 1.4826
+
+
+@dataclass
+class Violation:
+    """Métrica que superó su presupuesto o empeoró respecto a la línea base"""
+    test: str
+    metric: str
+    kind: str
+    value: float
+    limit: float
+    samples: int
+
+    def __str__(self):
+        reason = "presupuesto" if self.kind == "budget" else "línea base"
+        return (f"{self.test}.{self.metric}: {self.value:.4g} > {self.limit:.4g} "
+                f"({reason}, mediana de {self.samples} muestras)")
+
+
+def load_budgets(path=DEFAULT_BUDGETS):
+    """Leer el fichero de presupuestos"""
+    with open(path, encoding="utf-8") as f:
+        budgets = json.load(f)
+    budgets.setdefault("tolerance", {})
+    budgets.setdefault("tests", {})
+    return budgets
+
+
+def sample_key(sample):
+    """Clave de presupuesto y línea base de una muestra: el test, o ``test@celda`` en la matriz de red y CPU.
+
+    Las muestras con red o CPU limitadas no se mezclan con las normales: solo
+    se comprueban si ``e2e_budgets.json`` tiene presupuesto para su celda.
+    """
+    cell = sample.get("cell")
+    return f"{sample['test']}@{cell}" if cell else sample["test"]
+
+
+def group_samples(samples):
+    """{clave: {métrica: [valores]}} a partir de las muestras del PerformanceRecorder (ver ``sample_key``)"""
+    grouped = {}
+    for sample in samples:
+        metrics = grouped.setdefault(sample_key(sample), {})
+        for key, value in sample.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool) and key != "timestamp":
+                metrics.setdefault(key, []).append(value)
+    return grouped
+
+
+class BaselineStore:
+    """Línea base móvil: las últimas ``window`` medianas de cada test y métrica"""
+
+    def __init__(self, path=DEFAULT_BASELINE, window=20):
+        self.path = path
+        self.window = window
+        self.data = {}
+        if os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    self.data = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"[BUDGETS] ⚠ No se pudo leer la línea base {path} ({e}); se empieza sin historial")
+
+    def history(self, test, metric):
+        return self.data.get(test, {}).get(metric, [])
+
+    def add(self, test, metric, value):
+        values = self.data.setdefault(test, {}).setdefault(metric, [])
+        values.append(value)
+        del values[:-self.window]
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temporary = f"{self.path}.{os.getpid()}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump(self.data, f, indent=2, sort_keys=True)
+        os.replace(temporary, self.path)
+
+
+def regression_limit(history, relative, mad_factor):
+    """Límite superior tolerado frente a la línea base.
+
+    Mediana histórica más el mayor entre un margen relativo y ``mad_factor``
+    desviaciones robustas (MAD escalada), para no disparar con el ruido normal.
+    """
+    median = statistics.median(history)
+    mad = statistics.median(abs(value - median) for value in history) * MAD_SCALE
+    return median + max(relative * median, mad_factor * mad)
+
+
+def evaluate(samples, budgets, baseline=None):
+    """Comparar las muestras de la ejecución y devolver la lista de violaciones.
+
+    Cada test y métrica se resume con la mediana de sus muestras (varias con
+    ``--repeat``). Se compara contra el umbral del fichero de presupuestos y,
+    si hay suficiente historia, contra la línea base.
+    """
+    tolerance = budgets["tolerance"]
+    relative = tolerance.get("relative", 0.2)
+    mad_factor = tolerance.get("mad_factor", 3)
+    min_history = tolerance.get("min_baseline_samples", 5)
+
+    violations = []
+    for test, metrics in sorted(group_samples(samples).items()):
+        limits = budgets["tests"].get(test, {})
+        for metric, values in sorted(metrics.items()):
+            current = statistics.median(values)
+            if metric in limits and current > limits[metric]:
+                violations.append(Violation(test, metric, "budget", current, limits[metric], len(values)))
+            if baseline is None or metric not in limits:
+                continue
+            history = baseline.history(test, metric)
+            if len(history) >= min_history:
+                limit = regression_limit(history, relative, mad_factor)
+                if current > limit:
+                    violations.append(Violation(test, metric, "regression", current, limit, len(values)))
+    return violations
+
+
+def update_baseline(samples, budgets, baseline):
+    """Añadir a la línea base las medianas de las métricas con presupuesto"""
+    for test, metrics in group_samples(samples).items():
+        limits = budgets["tests"].get(test, {})
+        for metric, values in metrics.items():
+            if metric in limits:
+                baseline.add(test, metric, statistics.median(values))
+    baseline.save()
+
+
+def check_budgets(samples, budgets_path=DEFAULT_BUDGETS, baseline_path=DEFAULT_BASELINE):
+    """Evaluar presupuestos, imprimir el resultado y devolver True si no hay regresiones.
+
+    La línea base solo se actualiza con ejecuciones que pasan, para que una
+    regresión no se convierta en la nueva normalidad.
+    """
+    budgets = load_budgets(budgets_path)
+    baseline = BaselineStore(baseline_path, window=budgets["tolerance"].get("baseline_window", 20))
+    violations = evaluate(samples, budgets, baseline)
+
+    print("\n" + "-" * 60)
+    print("PRESUPUESTOS DE RENDIMIENTO")
+    print("-" * 60)
+    if violations:
+        for violation in violations:
+            print(f"✗ {violation}")
+        return False
+
+    update_baseline(samples, budgets, baseline)
+    print("✓ Todas las métricas dentro de presupuesto y de la línea base")
+    return True
@@ -0,0 +1,141 @@
+"""
+Consultas al DOM en bloque para los tests E2E de Bright Bogotá
+Un solo execute_script devuelve presencia, visibilidad, texto, atributos y clases de varios selectores
+Incluye los scripts de página que usan las esperas de los dos backends (Selenium y asíncrono)
+"""
+
+from dataclasses import dataclass, field
+
+# arguments[0]: selectores CSS; arguments[1]: nombres de atributos/propiedades a leer.
+# Para cada selector devuelve el estado de todos los elementos que coinciden.
+# Las propiedades primitivas (value, disabled, checked, placeholder...) tienen
+# prioridad sobre el atributo, igual que WebElement.get_attribute.
+SNAPSHOT_JS = """
+var selectors = arguments[0], names = arguments[1];
+function visible(el) {
+  if (typeof el.checkVisibility === 'function') {
+    return el.checkVisibility({checkOpacity: true, checkVisibilityCSS: true});
+  }
+  var style = window.getComputedStyle(el);
+  return el.getClientRects().length > 0 && style.visibility !== 'hidden' && style.opacity !== '0';
+}
+function read(el, name) {
+  var value = el[name];
+  if (value !== undefined && value !== null && typeof value !== 'object' && typeof value !== 'function') {
+    return value;
+  }
+  return el.getAttribute(name);
+}
+var result = {};
+selectors.forEach(function (selector) {
+  result[selector] = Array.prototype.map.call(document.querySelectorAll(selector), function (el) {
+    var attributes = {};
+    names.forEach(function (name) { attributes[name] = read(el, name); });
+    return {
+      visible: visible(el),
+      text: (el.innerText || '').trim(),
+      attributes: attributes,
+      classes: Array.prototype.slice.call(el.classList)
+    };
+  });
+});
+return result;
+"""
+
+# Resuelve cuando todas las aplicaciones Angular de la página están estables
+# (sin tareas de zone.js ni peticiones HTTP pendientes). Si la página no expone
+# testabilities de Angular, se conforma con document.readyState === 'complete'.
+ANGULAR_STABLE_JS = """
+var done = arguments[arguments.length - 1];
+if (document.readyState !== 'complete') { done(false); return; }
+if (typeof window.getAllAngularTestabilities !== 'function') { done(true); return; }
+var testabilities = window.getAllAngularTestabilities();
+if (!testabilities.length) { done(true); return; }
+var pending = testabilities.length;
+testabilities.forEach(function (testability) {
+  testability.whenStable(function () { if (--pending === 0) { done(true); } });
+});
+"""
+
+# Tamaño del viewport medido después de dos frames, cuando el relayout ya terminó
+VIEWPORT_JS = """
+var done = arguments[arguments.length - 1];
+requestAnimationFrame(function () {
+  requestAnimationFrame(function () {
+    done([window.innerWidth, window.innerHeight, window.outerWidth, window.outerHeight]);
+  });
+});
+"""
+
+# Índice (1..n) del slide visible en #slideshow-container, 0 si no hay ninguno
+SLIDE_INDEX_JS = """
+var slides = document.querySelectorAll('#slideshow-container .slides');
+for (var i = 0; i < slides.length; i++) {
+  if (slides[i].style.display !== 'none') { return i + 1; }
+}
+return 0;
+"""
+
+# Estado del carrito tal como lo renderiza CartComponent a partir de CartService:
+# número de líneas y suma de cantidades
+CART_STATE_JS = """
+var items = document.querySelectorAll("[id^='cart-item-']");
+var quantity = 0;
+document.querySelectorAll("[id^='item-qty-']").forEach(function (input) {
+  quantity += parseInt(input.value, 10) || 0;
+});
+return [items.length, quantity];
+"""
+
+SCROLL_POSITION_JS = "return [window.scrollX, window.scrollY];"
+
+
+@dataclass
+class ElementState:
+    """Estado de un elemento en el momento de la consulta"""
+    selector: str
+    present: bool = False
+    visible: bool = False
+    text: str = ""
+    attributes: dict = field(default_factory=dict)
+    classes: list = field(default_factory=list)
+
+    def attribute(self, name):
+        return self.attributes.get(name)
+
+
+class DomSnapshot:
+    """Resultado de ``snapshot``: ``snap[selector]`` es el primer elemento, ``snap.all(selector)`` todos"""
+
+    def __init__(self, states):
+        self.states = states
+
+    def __getitem__(self, selector):
+        matches = self.states.get(selector)
+        return matches[0] if matches else ElementState(selector)
+
+    def all(self, selector):
+        return list(self.states.get(selector, []))
+
+    def missing(self):
+        """Selectores sin ningún elemento"""
+        return [selector for selector, matches in self.states.items() if not matches]
+
+    def hidden(self):
+        """Selectores cuyo primer elemento no existe o no es visible"""
+        return [selector for selector in self.states if not self[selector].visible]
+
+
+def parse_snapshot(selectors, raw):
+    """DomSnapshot a partir de lo que devuelve SNAPSHOT_JS"""
+    raw = raw or {}
+    return DomSnapshot({
+        selector: [ElementState(selector, True, **state) for state in raw.get(selector, [])]
+        for selector in selectors
+    })
+
+
+def snapshot(driver, selectors, attributes=()):
+    """Consultar todos los ``selectors`` (CSS) en un solo viaje a ChromeDriver"""
+    selectors = list(selectors)
+    return parse_snapshot(selectors, driver.execute_script(SNAPSHOT_JS, selectors, list(attributes)))
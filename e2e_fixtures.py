@@ -0,0 +1,192 @@
+"""
+Fixtures de estado para los tests E2E de Bright Bogotá
+Captura localStorage, cookies y el carrito tras un paso de preparación y los inyecta antes de navegar
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import urllib.request
+from dataclasses import asdict, dataclass, field
+from urllib.parse import urlsplit
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_FIXTURES_DIR = os.path.join(ROOT, ".e2e", "fixtures")
+
+# Gancho de CartService solo para tests (E2E_CART_HOOK en src/app/_services/cart.service.ts):
+# si existe antes de que arranque la app, el carrito empieza con sus items y los mantiene al día
+CART_HOOK_JS = "window.__e2eCart = window.__e2eCart || { items: [] };"
+
+CAPTURE_JS = """
+var entries = {};
+for (var i = 0; i < localStorage.length; i++) {
+  var key = localStorage.key(i);
+  entries[key] = localStorage.getItem(key);
+}
+var hook = window.__e2eCart;
+return [location.origin, entries, hook ? (hook.active ? hook.items : null) : []];
+"""
+
+# Se ejecuta en cada documento nuevo antes que los scripts de la app
+INJECT_JS = """
+(function (entries, cart) {
+  try {
+    Object.keys(entries).forEach(function (key) { localStorage.setItem(key, entries[key]); });
+  } catch (e) {}
+  window.__e2eCart = { items: cart };
+})(%s, %s);
+"""
+
+# Bundles de la app en el index.html (con outputHashing cambian con cada compilación)
+SCRIPT_SRC = re.compile(r"<script[^>]*\ssrc=[\"']([^\"']+)[\"']", re.I)
+
+# Campos de get_cookies() que acepta Network.setCookie
+COOKIE_FIELDS = ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite", "expires")
+
+
+@dataclass
+class StateSnapshot:
+    """Estado de la app guardado con un nombre"""
+    name: str
+    origin: str
+    local_storage: dict = field(default_factory=dict)
+    cookies: list = field(default_factory=list)
+    cart: list = field(default_factory=list)
+    build: str = None
+
+
+def cookie_params(cookie, url):
+    """Parámetros de Network.setCookie para una cookie de get_cookies() o de Network.getCookies"""
+    params = {key: cookie[key] for key in COOKIE_FIELDS if key in cookie}
+    if "expiry" in cookie:
+        params["expires"] = cookie["expiry"]
+    if params.get("expires", 0) < 0:
+        # Cookie de sesión en el formato de CDP
+        del params["expires"]
+    params.pop("domain", None)
+    params["url"] = url
+    return params
+
+
+def origin_of(url):
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def app_build(base_url, timeout=10):
+    """Identificador de la compilación servida en ``base_url``: hash de los bundles de su index.html"""
+    try:
+        with urllib.request.urlopen(base_url.rstrip("/") + "/", timeout=timeout) as response:
+            html = response.read().decode("utf-8", "replace")
+    except Exception as e:
+        print(f"[FIXTURE] ⚠ No se pudo identificar la compilación de {base_url}: {e}")
+        return "unknown"
+    scripts = sorted(set(SCRIPT_SRC.findall(html)))
+    return hashlib.sha1("\n".join(scripts).encode("utf-8")).hexdigest()[:12] if scripts else "unknown"
+
+
+def install_hook(driver):
+    """Activar el gancho del carrito en las próximas navegaciones; devuelve el id para ``remove``"""
+    return driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": CART_HOOK_JS})["identifier"]
+
+
+def snapshot_from(name, captured, cookies):
+    """StateSnapshot a partir del resultado de CAPTURE_JS.
+
+    Si el harness activó el gancho del carrito pero la app no lo atendió (una
+    compilación de producción, sin ``environment.e2eHooks``), el carrito no se
+    puede capturar y el fixture no se guarda.
+    """
+    origin, entries, cart = captured
+    if cart is None:
+        raise RuntimeError(f"No se puede capturar el carrito del fixture '{name}': la compilación servida no "
+                           f"tiene los ganchos E2E (usa npm run build:e2e o build:ssr:e2e)")
+    return StateSnapshot(name, origin, entries, cookies, cart)
+
+
+def capture(driver, name):
+    """Capturar el localStorage, las cookies y el carrito (si el gancho está activo) de la página actual"""
+    return snapshot_from(name, driver.execute_script(CAPTURE_JS), driver.get_cookies())
+
+
+def inject(driver, snapshot, url):
+    """Programar el estado de ``snapshot`` para la próxima navegación a ``url``.
+
+    Las cookies se fijan por CDP para el origen de ``url``; el localStorage y
+    el carrito, con un script que corre antes que la app. Devuelve el
+    identificador del script, que hay que quitar con ``remove`` después de
+    navegar para que las recargas siguientes no vuelvan a pisar el estado.
+    """
+    for cookie in snapshot.cookies:
+        driver.execute_cdp_cmd("Network.setCookie", cookie_params(cookie, url))
+    source = INJECT_JS % (json.dumps(snapshot.local_storage), json.dumps(snapshot.cart))
+    return driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": source})["identifier"]
+
+
+def remove(driver, identifier):
+    driver.execute_cdp_cmd("Page.removeScriptToEvaluateOnNewDocument", {"identifier": identifier})
+
+
+def _slug(text):
+    return re.sub(r"[^\w.-]+", "_", text).strip("_")
+
+
+class FixtureStore:
+    """Snapshots con nombre guardados en ``directory`` como JSON.
+
+    Cada snapshot es del sitio y la compilación en los que se preparó: se
+    guarda en ``directory/<origen>/<compilación>/<nombre>.json``, así que un
+    fixture de otro entorno o de otra versión de la app no se reutiliza y se
+    vuelve a preparar. ``get_or_build(name, build, base_url)`` devuelve el
+    snapshot guardado o lo crea con ``build()`` una sola vez aunque lo pidan
+    varios workers a la vez.
+    """
+
+    def __init__(self, directory=DEFAULT_FIXTURES_DIR, refresh=False):
+        self.directory = directory
+        self.refresh = refresh
+        self._lock = threading.Lock()
+        self._built = set()
+        self._builds = {}
+
+    def build_id(self, base_url):
+        """Compilación servida en ``base_url`` (se consulta una vez por ejecución)"""
+        origin = origin_of(base_url)
+        if origin not in self._builds:
+            self._builds[origin] = app_build(base_url)
+        return self._builds[origin]
+
+    def _path(self, name, base_url):
+        return os.path.join(self.directory, _slug(origin_of(base_url)), self.build_id(base_url), _slug(name) + ".json")
+
+    def load(self, name, base_url):
+        path = self._path(name, base_url)
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as f:
+            return StateSnapshot(**json.load(f))
+
+    def save(self, snapshot, base_url):
+        path = self._path(snapshot.name, base_url)
+        snapshot.build = self.build_id(base_url)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(asdict(snapshot), f, indent=2, ensure_ascii=False)
+        self._built.add(path)
+
+    def cached(self, name, base_url):
+        """Snapshot guardado, salvo que haya que rehacerlo (``refresh``) y aún no se haya hecho"""
+        if self.refresh and self._path(name, base_url) not in self._built:
+            return None
+        return self.load(name, base_url)
+
+    def get_or_build(self, name, build, base_url):
+        with self._lock:
+            snapshot = self.cached(name, base_url)
+            if snapshot is None:
+                print(f"[FIXTURE] Preparando '{name}' desde la UI...")
+                snapshot = build()
+                self.save(snapshot, base_url)
+            return snapshot
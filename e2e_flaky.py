@@ -0,0 +1,167 @@
+"""
+Detección de tests inestables para los tests E2E de Bright Bogotá
+Reejecuta los fallos en sesiones nuevas, guarda el historial en SQLite y pone en cuarentena los tests inestables
+"""
+
+import os
+import sqlite3
+import statistics
+import threading
+import time
+import uuid
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_HISTORY = os.path.join(ROOT, ".e2e", "history.sqlite3")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS attempts (
+    run_id TEXT NOT NULL,
+    test TEXT NOT NULL,
+    iteration INTEGER NOT NULL,
+    attempt INTEGER NOT NULL,
+    passed INTEGER NOT NULL,
+    duration REAL NOT NULL,
+    error_type TEXT,
+    timestamp REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS attempts_test ON attempts (test, timestamp);
+"""
+
+
+def rerun_failed(runner, specs, results, reruns, iteration=1):
+    """Reejecutar hasta ``reruns`` veces los tests fallidos (y los omitidos por ellos).
+
+    Cada reintento pasa por ``runner`` (un ParallelRunner o, con el backend
+    asíncrono, un AsyncRunner), así que los tests reintentados van en
+    paralelo, cada cadena en una sesión recién reiniciada. Devuelve (resultados finales en el orden de ``specs``, todos los
+    intentos). Un test que falla y luego pasa queda marcado como ``flaky``.
+    """
+    final = {result.test: result for result in results}
+    attempts = list(results)
+    failed_once = {result.test for result in results if not result.passed and not result.skipped}
+    for attempt in range(2, reruns + 2):
+        retry = [spec for spec in specs if not final[spec.method].passed]
+        if not retry:
+            break
+        print(f"\n[RERUN] Intento {attempt}: {len(retry)} tests en sesiones nuevas")
+        for result in runner.run(retry, iteration=iteration):
+            result.attempts = attempt
+            attempts.append(result)
+            if result.passed and result.test in failed_once:
+                result.flaky = True
+            elif not result.passed and not result.skipped:
+                failed_once.add(result.test)
+            final[result.test] = result
+    return [final[spec.method] for spec in specs], attempts
+
+
+def _is_flaky(rows):
+    """Si los intentos (run_id, iteración, intento, pasó, duración), en orden cronológico, muestran
+    un fallo que pasó al reintentar en la misma ejecución o resultados que alternan"""
+    runs = {}
+    for run_id, iteration, attempt, passed, _ in rows:
+        runs.setdefault((run_id, iteration), []).append((attempt, passed))
+    for attempts in runs.values():
+        outcomes = [passed for _, passed in sorted(attempts)]
+        if any(not outcome and later for position, outcome in enumerate(outcomes) for later in outcomes[position + 1:]):
+            return True
+    recoveries = sum(1 for previous, current in zip(rows, rows[1:]) if not previous[3] and current[3])
+    return recoveries >= 2
+
+
+class TestHistory:
+    """Historial de intentos por test en una base SQLite local.
+
+    La cuarentena se decide con los intentos de ejecuciones anteriores (los
+    de la actual no cuentan) y solo para tests con inestabilidad demostrada:
+    algún fallo que pasó al reintentar en la misma ejecución, o resultados
+    que alternan (al menos dos veces un fallo seguido de un pase). Con al
+    menos ``min_runs`` intentos en los últimos ``window``, un test así se pone
+    en cuarentena si falla en al menos ``max_failure_rate`` de ellos, o si el
+    coeficiente de variación de su duración supera ``max_duration_cv``; este
+    segundo motivo no oculta un fallo que se repite en todos los intentos de
+    la ejecución actual. Un test que simplemente se rompe sigue fallando.
+    """
+
+    def __init__(self, path=DEFAULT_HISTORY, window=30, min_runs=10, max_failure_rate=0.1, max_duration_cv=0.5):
+        self.path = path
+        self.window = window
+        self.min_runs = min_runs
+        self.max_failure_rate = max_failure_rate
+        self.max_duration_cv = max_duration_cv
+        self.run_id = uuid.uuid4().hex
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as db:
+            db.executescript(SCHEMA)
+
+    def _connect(self):
+        return sqlite3.connect(self.path)
+
+    def record(self, attempts):
+        """Guardar los intentos (TestResult) de esta ejecución; los omitidos no cuentan"""
+        rows = [
+            (self.run_id, result.test, result.iteration, getattr(result, "attempts", 1), int(result.passed),
+             result.duration, result.error_type, time.time())
+            for result in attempts if not result.skipped
+        ]
+        with self._lock, self._connect() as db:
+            db.executemany("INSERT INTO attempts VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def stats(self, test):
+        """(intentos, tasa de fallos, CV de la duración, si es inestable) de la ventana anterior a esta ejecución"""
+        with self._lock, self._connect() as db:
+            rows = db.execute(
+                "SELECT run_id, iteration, attempt, passed, duration FROM attempts "
+                "WHERE test = ? AND run_id != ? ORDER BY timestamp DESC LIMIT ?",
+                (test, self.run_id, self.window),
+            ).fetchall()
+        if not rows:
+            return 0, 0.0, 0.0, False
+        rows.reverse()
+        failure_rate = sum(1 for row in rows if not row[3]) / len(rows)
+        durations = [row[4] for row in rows if row[3]]
+        cv = 0.0
+        if len(durations) >= 2 and statistics.mean(durations) > 0:
+            cv = statistics.stdev(durations) / statistics.mean(durations)
+        return len(rows), failure_rate, cv, _is_flaky(rows)
+
+    def quarantine_reason(self, test, failed=False):
+        """Motivo de cuarentena de ``test`` o None (``failed``: falló en todos los intentos de esta ejecución)"""
+        runs, failure_rate, cv, flaky = self.stats(test)
+        if runs < self.min_runs or not flaky:
+            return None
+        if failure_rate >= self.max_failure_rate:
+            return f"inestable: falla en el {failure_rate:.0%} de los últimos {runs} intentos"
+        if cv > self.max_duration_cv and not failed:
+            return f"duración inestable (CV {cv:.2f} en {runs} intentos)"
+        return None
+
+    def apply_quarantine(self, results):
+        """Marcar en cuarentena los resultados de tests inestables; devuelve {test: motivo}.
+
+        ``results`` son los resultados finales: uno fallido falló en todos sus intentos.
+        """
+        reasons = {}
+        for result in results:
+            if result.skipped:
+                continue
+            if result.test not in reasons:
+                reasons[result.test] = self.quarantine_reason(result.test, failed=not result.passed)
+            if reasons[result.test]:
+                result.quarantined = True
+        return {test: reason for test, reason in reasons.items() if reason}
+
+    def report(self, results, reasons):
+        """Tests que pasaron tras reintentar y tests en cuarentena"""
+        flaky = sorted({result.label for result in results if result.flaky})
+        if not flaky and not reasons:
+            return
+        print("\n" + "-" * 60)
+        print("TESTS INESTABLES")
+        print("-" * 60)
+        for label in flaky:
+            print(f"↻ {label}: pasó tras reintentar")
+        labels = {result.test: result.label for result in results}
+        for test, reason in sorted(reasons.items()):
+            print(f"⚠ CUARENTENA {labels.get(test, test)}: {reason} (no bloquea el resultado)")
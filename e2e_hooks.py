@@ -0,0 +1,45 @@
+"""
+Punto de enganche sobre los comandos de WebDriver para los tests E2E de Bright Bogotá
+Todos los comandos (del driver y de los WebElement) pasan por WebDriver.execute
+"""
+
+import time
+
+
+def add_command_listener(driver, listener):
+    """Registrar ``listener(command, params, response, elapsed, error)`` para cada comando.
+
+    El wrapper sobre ``driver.execute`` se instala una sola vez por driver, de
+    modo que las sesiones reutilizadas del pool no acumulan capas.
+    """
+    listeners = getattr(driver, "_e2e_command_listeners", None)
+    if listeners is None:
+        listeners = driver._e2e_command_listeners = []
+        original = driver.execute
+
+        def execute(driver_command, params=None):
+            started = time.perf_counter()
+            response = error = None
+            try:
+                response = original(driver_command, params)
+                return response
+            except Exception as e:
+                error = e
+                raise
+            finally:
+                elapsed = time.perf_counter() - started
+                for callback in list(listeners):
+                    try:
+                        callback(driver_command, params, response, elapsed, error)
+                    except Exception:
+                        pass
+
+        driver.execute = execute
+    listeners.append(listener)
+
+
+def remove_command_listener(driver, listener):
+    """Quitar un listener registrado con ``add_command_listener``"""
+    listeners = getattr(driver, "_e2e_command_listeners", None)
+    if listeners and listener in listeners:
+        listeners.remove(listener)
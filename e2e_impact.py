@@ -0,0 +1,379 @@
+"""
+Selección de tests E2E de Bright Bogotá según los ficheros cambiados
+Indexa qué plantillas y componentes de Angular definen cada selector que usan los tests y lo cruza con git diff
+
+    python e2e_impact.py --changed-since origin/main
+    python e2e_impact.py src/app/shared/form/form.component.html
+"""
+
+import argparse
+import ast
+import fnmatch
+import os
+import re
+import subprocess
+from dataclasses import dataclass, field
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+APP_DIR = "src/app"
+
+# Cambios que pueden afectar a cualquier página: se ejecuta la suite completa
+GLOBAL_PATTERNS = (
+    "src/styles.scss", "src/assets/sass/*", "src/index.html", "src/main.ts", "src/main.server.ts",
+    "src/polyfills.ts", "src/environments/*", "src/app/*.module.ts", "src/app/app.component.*",
+    "server.ts", "angular.json", "package.json", "package-lock.json", "tsconfig*.json",
+    "test_e2e.py", "e2e_*.py", "e2e_*.json", "visual-baselines/*", "run_tests.sh", "requirements*.txt",
+)
+
+# Cambios que no llegan al sitio servido ni a los tests de Selenium
+IGNORED_PATTERNS = (
+    "*.md", "*.spec.ts", "src/test.ts", "e2e/*", "tests/*", "karma.conf.js", "tslint.json",
+    "scripts/*", "test-no-warn.*", ".editorconfig", ".gitignore",
+)
+
+# Alias de tsconfig.json (compilerOptions.paths)
+IMPORT_ALIASES = {"@core/": "src/app/", "@env/": "src/environments/", "src/": "src/"}
+
+# Métodos de las esperas (AppWaits) cuyo primer argumento es un id sin '#'
+ID_ARGUMENTS = ("has_class",)
+SELECTOR_CALLS = ("snapshot", "first_present")
+SCRIPT_CALLS = ("execute_script", "execute_async_script")
+BY_KINDS = {"ID": "id", "CLASS_NAME": "class", "TAG_NAME": "tag"}
+
+CSS_ID = re.compile(r"#(-?[A-Za-z_][\w-]*)")
+CSS_CLASS = re.compile(r"(?<![\w-])\.(-?[A-Za-z_][\w-]*)")
+CSS_ID_PREFIX = re.compile(r"\[id\^=['\"]?([\w-]+)")
+CSS_COMPONENT = re.compile(r"(?:^|[\s,>+~(])(app-[\w-]+)")
+JS_QUERY = re.compile(r"querySelector(?:All)?\(\s*(['\"])(.+?)\1\s*\)")
+
+HTML_ID = re.compile(r"\sid=\"([^\"{]*)(\{\{)?")
+HTML_BOUND_ID = re.compile(r"\[(?:attr\.)?id\]=\"'([^']*)'(\s*\+)?")
+HTML_CLASS = re.compile(r"\sclass=\"([^\"]*)\"")
+HTML_BOUND_CLASS = re.compile(r"\[class\.([\w-]+)\]")
+
+TS_COMPONENT = re.compile(r"@Component\s*\(\s*\{(.*?)\}\s*\)", re.S)
+TS_SELECTOR = re.compile(r"selector:\s*['\"]([^'\"]+)['\"]")
+TS_TEMPLATE = re.compile(r"templateUrl:\s*['\"]([^'\"]+)['\"]")
+TS_STYLES = re.compile(r"styleUrls:\s*\[([^\]]*)\]")
+TS_IMPORT = re.compile(r"""(?:from|import)\s+['"]([^'"]+)['"]""")
+
+
+def css_tokens(selector):
+    """Ids, prefijos de id, clases y componentes que usa un selector CSS: {(tipo, valor)}"""
+    tokens = {("id", value) for value in CSS_ID.findall(selector)}
+    tokens |= {("id^", value) for value in CSS_ID_PREFIX.findall(selector)}
+    tokens |= {("class", value) for value in CSS_CLASS.findall(selector)}
+    tokens |= {("tag", value) for value in CSS_COMPONENT.findall(selector)}
+    return tokens
+
+
+def js_tokens(source):
+    """Selectores de los querySelector de un script"""
+    tokens = set()
+    for _, selector in JS_QUERY.findall(source):
+        tokens |= css_tokens(selector)
+    return tokens
+
+
+@dataclass
+class Component:
+    """Componente de Angular con sus ficheros y lo que define su plantilla"""
+    path: str
+    selector: str = None
+    files: set = field(default_factory=set)
+    ids: set = field(default_factory=set)
+    id_prefixes: set = field(default_factory=set)
+    classes: set = field(default_factory=set)
+
+    def defines(self, token):
+        """Si la plantilla del componente puede generar el elemento que busca ``token``"""
+        kind, value = token
+        if kind == "id":
+            return value in self.ids or any(value.startswith(prefix) for prefix in self.id_prefixes)
+        if kind == "id^":
+            return (any(element.startswith(value) for element in self.ids)
+                    or any(prefix.startswith(value) or value.startswith(prefix) for prefix in self.id_prefixes))
+        if kind == "class":
+            return value in self.classes
+        if kind == "tag":
+            return value == self.selector
+        return False
+
+
+def _read(path):
+    with open(os.path.join(ROOT, path), encoding="utf-8") as f:
+        return f.read()
+
+
+def _relative(path):
+    return os.path.relpath(path, ROOT).replace(os.sep, "/")
+
+
+def _resolve_import(source, module):
+    """Fichero .ts de un import relativo o con alias; None si es de node_modules"""
+    if module.startswith("."):
+        path = os.path.normpath(os.path.join(os.path.dirname(source), module)).replace(os.sep, "/")
+    else:
+        alias = next((alias for alias in IMPORT_ALIASES if module.startswith(alias)), None)
+        if alias is None:
+            return None
+        path = IMPORT_ALIASES[alias] + module[len(alias):]
+    for candidate in (path + ".ts", path + "/index.ts", path):
+        if os.path.isfile(os.path.join(ROOT, candidate)):
+            return candidate
+    return None
+
+
+def index_templates(app_dir=APP_DIR):
+    """Componentes de ``app_dir`` y, por fichero, los componentes a los que afecta un cambio en él.
+
+    Un componente depende de su .ts, su plantilla y sus estilos, y de los
+    ficheros .ts que importa directa o indirectamente (servicios, modelos,
+    pipes). Los imports no se siguen a través de otros componentes: un cambio
+    en la cabecera no afecta a los elementos propios de la página que la usa.
+    """
+    components = {}
+    imports = {}
+    for directory, _, names in os.walk(os.path.join(ROOT, app_dir)):
+        for name in names:
+            path = _relative(os.path.join(directory, name))
+            if not name.endswith(".ts") or name.endswith(".spec.ts"):
+                continue
+            source = _read(path)
+            imports[path] = {target for target in (_resolve_import(path, m) for m in TS_IMPORT.findall(source))
+                             if target}
+            match = TS_COMPONENT.search(source)
+            if not match:
+                continue
+            component = components[path] = Component(path, files={path})
+            body = match.group(1)
+            selector = TS_SELECTOR.search(body)
+            component.selector = selector.group(1) if selector else None
+            template = TS_TEMPLATE.search(body)
+            styles = TS_STYLES.search(body)
+            base = os.path.dirname(path)
+            if styles:
+                for style in re.findall(r"['\"]([^'\"]+)['\"]", styles.group(1)):
+                    component.files.add(os.path.normpath(os.path.join(base, style)).replace(os.sep, "/"))
+            if template:
+                template_path = os.path.normpath(os.path.join(base, template.group(1))).replace(os.sep, "/")
+                component.files.add(template_path)
+                _index_template(component, _read(template_path))
+
+    affects = {}
+    for component in components.values():
+        for path in component.files:
+            affects.setdefault(path, set()).add(component.path)
+        # Dependencias .ts que no son componentes, recorridas en profundidad
+        pending, seen = list(imports.get(component.path, ())), set()
+        while pending:
+            path = pending.pop()
+            if path in seen or path in components:
+                continue
+            seen.add(path)
+            affects.setdefault(path, set()).add(component.path)
+            pending.extend(imports.get(path, ()))
+    return components, affects
+
+
+def _index_template(component, html):
+    for value, interpolated in HTML_ID.findall(html):
+        (component.id_prefixes if interpolated else component.ids).add(value)
+    for value, concatenated in HTML_BOUND_ID.findall(html):
+        (component.id_prefixes if concatenated else component.ids).add(value)
+    for classes in HTML_CLASS.findall(html):
+        component.classes.update(classes.split())
+    component.classes.update(HTML_BOUND_CLASS.findall(html))
+
+
+class _SelectorCollector:
+    """Selectores que usa cada test, leídos del código (sin importar Selenium).
+
+    Se recogen los ``(By.ID, "...")`` y demás localizadores, los selectores
+    de ``snapshot``/``first_present``, los ``querySelector`` de los scripts y
+    los de las esperas de ``AppWaits`` a las que llama el test.
+    """
+
+    def __init__(self, suite_path="test_e2e.py", waits_path="e2e_waits.py", suite_class="TestBrightBogota",
+                 scripts_path="e2e_dom.py"):
+        self.constants = {}
+        self.suite = self._methods(suite_path, suite_class)
+        self.waits = self._methods(waits_path, "AppWaits")
+        # Scripts de página que las esperas importan de e2e_dom (SLIDE_INDEX_JS, CART_STATE_JS...)
+        self._constants(ast.parse(_read(scripts_path)))
+
+    def _methods(self, path, class_name):
+        tree = ast.parse(_read(path))
+        self._constants(tree)
+        suite = next(node for node in tree.body if isinstance(node, ast.ClassDef) and node.name == class_name)
+        return {node.name: node for node in suite.body if isinstance(node, ast.FunctionDef)}
+
+    def _constants(self, tree):
+        for node in tree.body:
+            if isinstance(node, ast.Assign) and isinstance(node.value, ast.Constant) \
+                    and isinstance(node.value.value, str):
+                for target in node.targets:
+                    if isinstance(target, ast.Name):
+                        self.constants[target.id] = node.value.value
+
+    def tokens(self, method):
+        """Selectores que usa el método ``method`` de la suite"""
+        return self._collect(self.suite[method], self.suite, set())
+
+    def _collect(self, function, methods, visited):
+        visited.add(function.name)
+        tokens = set()
+        for node in ast.walk(function):
+            if isinstance(node, ast.Name) and node.id in self.constants:
+                tokens |= js_tokens(self.constants[node.id])
+            elif isinstance(node, (ast.Tuple, ast.Call)):
+                tokens |= self._locator(node.elts if isinstance(node, ast.Tuple) else node.args)
+            if not isinstance(node, ast.Call) or not isinstance(node.func, ast.Attribute):
+                continue
+            name, owner = node.func.attr, node.func.value
+            strings = [arg.value for arg in ast.walk(node) if isinstance(arg, ast.Constant) and isinstance(arg.value, str)]
+            if name in SELECTOR_CALLS:
+                for value in strings:
+                    tokens |= css_tokens(value)
+            elif name in SCRIPT_CALLS:
+                for value in strings:
+                    tokens |= js_tokens(value)
+            elif name in ID_ARGUMENTS and node.args and isinstance(node.args[0], ast.Constant):
+                tokens.add(("id", node.args[0].value))
+            # self.waits.<espera>(...) y self.<método>(...) de la misma clase
+            if _is_attribute(owner, "self", "waits") and name in self.waits and name not in visited:
+                tokens |= self._collect(self.waits[name], self.waits, set())
+            elif isinstance(owner, ast.Name) and owner.id == "self" and name in methods and name not in visited:
+                tokens |= self._collect(methods[name], methods, visited)
+        return tokens
+
+    @staticmethod
+    def _locator(values):
+        """``By.X, "valor"`` dentro de una tupla o de los argumentos de una llamada"""
+        for by, value in zip(values, values[1:]):
+            if (isinstance(by, ast.Attribute) and isinstance(by.value, ast.Name) and by.value.id == "By"
+                    and isinstance(value, ast.Constant) and isinstance(value.value, str)):
+                if by.attr == "CSS_SELECTOR":
+                    return css_tokens(value.value)
+                if by.attr in BY_KINDS:
+                    return {(BY_KINDS[by.attr], value.value)}
+        return set()
+
+
+def _is_attribute(node, owner, name):
+    return (isinstance(node, ast.Attribute) and node.attr == name
+            and isinstance(node.value, ast.Name) and node.value.id == owner)
+
+
+def changed_files(since=None):
+    """Ficheros cambiados respecto a ``since`` (commits, cambios sin commitear y ficheros nuevos)"""
+    commands = [["git", "diff", "--name-only", "HEAD"], ["git", "ls-files", "--others", "--exclude-standard"]]
+    if since:
+        commands.insert(0, ["git", "diff", "--name-only", f"{since}...HEAD"])
+    files = set()
+    for command in commands:
+        output = subprocess.run(command, cwd=ROOT, capture_output=True, text=True, check=True).stdout
+        files.update(line.strip() for line in output.splitlines() if line.strip())
+    return sorted(files)
+
+
+@dataclass
+class Selection:
+    """Tests elegidos y por qué"""
+    specs: list
+    full: bool = False
+    reason: str = ""
+    reasons: dict = field(default_factory=dict)
+
+    def report(self, total):
+        if self.full:
+            print(f"[IMPACT] Suite completa ({total} tests): {self.reason}")
+            return
+        print(f"[IMPACT] {len(self.specs)} de {total} tests afectados por los cambios")
+        for spec in self.specs:
+            print(f"  {spec.label}: {', '.join(sorted(self.reasons.get(spec.method, ())))}")
+
+
+def select(specs, files):
+    """Tests de ``specs`` afectados por ``files`` (rutas relativas a la raíz del repo).
+
+    Un test está afectado si usa un selector que define la plantilla de un
+    componente afectado por algún fichero. Los cambios globales (estilos
+    globales, módulos, el propio runner, presupuestos, baselines...) y
+    cualquier fichero no ignorado que no se pueda atribuir a ningún
+    componente ejecutan la suite completa. Se
+    añaden los prerrequisitos de los tests elegidos y los tests que dependen
+    de ellos.
+    """
+    relevant = [path for path in files if not any(fnmatch.fnmatch(path, p) for p in IGNORED_PATTERNS)]
+    for path in relevant:
+        if any(fnmatch.fnmatch(path, pattern) for pattern in GLOBAL_PATTERNS):
+            return Selection(list(specs), True, f"cambio global en {path}")
+
+    components, affects = index_templates()
+    affected = {}
+    for path in relevant:
+        if path in affects:
+            for component in affects[path]:
+                affected.setdefault(component, set()).add(path)
+        else:
+            return Selection(list(specs), True, f"{path} no se puede atribuir a ningún componente")
+
+    collector = _SelectorCollector()
+    reasons = {}
+    for spec in specs:
+        tokens = collector.tokens(spec.method)
+        for component, paths in affected.items():
+            if any(components[component].defines(token) for token in tokens):
+                reasons.setdefault(spec.method, set()).update(paths)
+
+    by_method = {spec.method: spec for spec in specs}
+    selected = set(reasons)
+    changed = True
+    while changed:
+        changed = False
+        for spec in specs:
+            if spec.method in selected:
+                new = {requirement for requirement in spec.requires if requirement in by_method} - selected
+            elif any(requirement in selected for requirement in spec.requires):
+                new = {spec.method}
+            else:
+                continue
+            for method in new:
+                reasons.setdefault(method, {"(dependencia)"})
+            selected |= new
+            changed = changed or bool(new)
+    return Selection([spec for spec in specs if spec.method in selected], reasons=reasons)
+
+
+def _describe(token):
+    kind, value = token
+    return {"id": f"#{value}", "id^": f"[id^={value}]", "class": f".{value}"}.get(kind, value)
+
+
+def explain(specs):
+    """Imprimir qué componentes definen los selectores de cada test"""
+    components, _ = index_templates()
+    collector = _SelectorCollector()
+    for spec in specs:
+        tokens = collector.tokens(spec.method)
+        owners = sorted({c.path for c in components.values() for token in tokens if c.defines(token)})
+        print(f"{spec.label} ({spec.method}):")
+        print(f"  selectores: {', '.join(sorted(_describe(token) for token in tokens))}")
+        print(f"  componentes: {', '.join(owners) or '(ninguno)'}")
+
+
+if __name__ == "__main__":
+    from test_e2e import TESTS
+
+    parser = argparse.ArgumentParser(description="Tests E2E afectados por un cambio")
+    parser.add_argument("files", nargs="*", help="Ficheros cambiados (por defecto, los de git)")
+    parser.add_argument("--changed-since", metavar="REF", help="Comparar con REF (p. ej. origin/main)")
+    parser.add_argument("--explain", action="store_true", help="Mostrar el índice de selectores por test")
+    args = parser.parse_args()
+    if args.explain:
+        explain(TESTS)
+    else:
+        files = args.files or changed_files(args.changed_since)
+        print(f"[IMPACT] {len(files)} ficheros cambiados")
+        select(TESTS, files).report(len(TESTS))
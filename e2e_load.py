@@ -0,0 +1,196 @@
+"""
+Generación de carga con los recorridos E2E de Bright Bogotá
+Repite escenarios ponderados (secuencias de tests del registro) sobre M sesiones concurrentes
+"""
+
+import random
+import sys
+import threading
+import time
+from dataclasses import dataclass
+
+from e2e_profiler import percentile
+from e2e_runner import _ThreadOutput
+
+PERCENTILES = (0.5, 0.9, 0.95, 0.99)
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """Recorrido de un comprador: pasos (TestSpec) que se ejecutan en orden sobre una sesión limpia"""
+    name: str
+    weight: float
+    steps: tuple
+
+
+@dataclass
+class StepSample:
+    """Un paso ejecutado durante la carga"""
+    scenario: str
+    step: str
+    started: float
+    duration: float
+    passed: bool
+    error_type: str = None
+
+
+@dataclass
+class JourneySample:
+    """Un recorrido completo (se corta en el primer paso que falla)"""
+    scenario: str
+    user: int
+    started: float
+    duration: float
+    passed: bool
+
+
+class LoadGenerator:
+    """Ejecuta escenarios ponderados con ``users`` compradores concurrentes.
+
+    Cada comprador es un hilo que entra tras su parte del ``ramp_up`` y repite:
+    elegir un escenario según su peso, tomar una sesión reiniciada del pool y
+    ejecutar sus pasos con ``suite.run_test``. Para cuando pasa ``duration``
+    (segundos) o cuando se han lanzado ``iterations`` recorridos en total.
+    """
+
+    def __init__(self, suite_factory, pool, scenarios, users, duration=None, iterations=None,
+                 ramp_up=0.0, seed=None):
+        if duration is None and iterations is None:
+            raise ValueError("Indica una duración o un número de iteraciones")
+        self.suite_factory = suite_factory
+        self.pool = pool
+        self.scenarios = list(scenarios)
+        self.users = max(1, int(users))
+        self.duration = duration
+        self.iterations = iterations
+        self.ramp_up = max(0.0, ramp_up or 0.0)
+        self.seed = seed
+        self.steps = []
+        self.journeys = []
+        self.elapsed = 0.0
+        self._lock = threading.Lock()
+        self._launched = 0
+        self._stop = threading.Event()
+
+    def _next_journey(self):
+        """Reservar un recorrido; False cuando la carga debe terminar"""
+        if self._stop.is_set():
+            return False
+        if self.duration is not None and time.perf_counter() - self._started >= self.duration:
+            return False
+        with self._lock:
+            if self.iterations is not None and self._launched >= self.iterations:
+                return False
+            self._launched += 1
+            return True
+
+    def _run_journey(self, user, scenario):
+        journey_started = time.perf_counter()
+        passed = True
+        with self.pool.session() as session:
+            suite = self.suite_factory(session.driver)
+            for spec in scenario.steps:
+                started = time.perf_counter()
+                try:
+                    result = suite.run_test(spec)
+                    sample = StepSample(scenario.name, spec.label, started - self._started,
+                                        result.duration, result.passed, result.error_type)
+                except Exception as e:
+                    sample = StepSample(scenario.name, spec.label, started - self._started,
+                                        time.perf_counter() - started, False, type(e).__name__)
+                with self._lock:
+                    self.steps.append(sample)
+                if not sample.passed:
+                    passed = False
+                    break
+        journey = JourneySample(scenario.name, user, journey_started - self._started,
+                                time.perf_counter() - journey_started, passed)
+        with self._lock:
+            self.journeys.append(journey)
+
+    def _user(self, user):
+        rng = random.Random(None if self.seed is None else self.seed + user)
+        weights = [scenario.weight for scenario in self.scenarios]
+        # Arranque escalonado: el usuario i entra en i * ramp_up / users
+        if self._stop.wait(user * self.ramp_up / self.users):
+            return
+        self._output.capture()
+        try:
+            while self._next_journey():
+                scenario = rng.choices(self.scenarios, weights)[0]
+                try:
+                    self._run_journey(user, scenario)
+                except Exception as e:
+                    # La sesión no se pudo obtener o se rompió: cuenta como recorrido fallido
+                    with self._lock:
+                        self.journeys.append(JourneySample(scenario.name, user, time.perf_counter() - self._started,
+                                                           0.0, False))
+                        self.steps.append(StepSample(scenario.name, "(sesión)", time.perf_counter() - self._started,
+                                                     0.0, False, type(e).__name__))
+                self._output.release()
+                self._output.capture()
+        finally:
+            self._output.release()
+
+    def run(self):
+        """Lanzar la carga y esperar a que terminen todos los compradores"""
+        limit = f"{self.duration:g}s" if self.duration is not None else f"{self.iterations} recorridos"
+        print(f"[LOAD] {self.users} usuarios, {limit}, ramp-up {self.ramp_up:g}s, "
+              f"escenarios: {', '.join(f'{s.name} ({s.weight:g})' for s in self.scenarios)}")
+        # La salida de los tests de cada recorrido se descarta
+        self._output = _ThreadOutput(sys.stdout)
+        original_stdout = sys.stdout
+        sys.stdout = self._output
+        self._started = time.perf_counter()
+        threads = [
+            threading.Thread(target=self._user, args=(user,), name=f"load-{user}", daemon=True)
+            for user in range(self.users)
+        ]
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(0.5)
+        except KeyboardInterrupt:
+            self._stop.set()
+            raise
+        finally:
+            sys.stdout = original_stdout
+            self.elapsed = time.perf_counter() - self._started
+        return self
+
+    @property
+    def failed(self):
+        return [journey for journey in self.journeys if not journey.passed]
+
+    def report(self):
+        """Throughput, tasa de error por escenario y percentiles de latencia por paso"""
+        print("\n" + "-" * 60)
+        print("CARGA")
+        print("-" * 60)
+        total = len(self.journeys)
+        minutes = self.elapsed / 60 if self.elapsed else 0
+        throughput = total / minutes if minutes else 0.0
+        print(f"Duración: {self.elapsed:.1f}s con {self.users} usuarios")
+        print(f"Recorridos: {total} ({len(self.failed)} fallidos), {throughput:.1f} recorridos/min")
+
+        print(f"\n{'escenario':<20}{'recorridos':>11}{'errores':>9}{'p50':>9}{'p95':>9}")
+        for scenario in self.scenarios:
+            journeys = [j for j in self.journeys if j.scenario == scenario.name]
+            if not journeys:
+                continue
+            times = [j.duration for j in journeys]
+            errors = sum(1 for j in journeys if not j.passed) / len(journeys)
+            print(f"{scenario.name:<20}{len(journeys):>11}{errors:>9.1%}"
+                  f"{percentile(times, 0.5):>8.2f}s{percentile(times, 0.95):>8.2f}s")
+
+        print(f"\n{'paso':<28}{'n':>5}{'errores':>9}" + "".join(f"{'p%d' % round(p * 100):>9}" for p in PERCENTILES))
+        steps = {}
+        for sample in self.steps:
+            steps.setdefault(sample.step, []).append(sample)
+        for step, samples in steps.items():
+            times = [sample.duration for sample in samples]
+            errors = sum(1 for sample in samples if not sample.passed) / len(samples)
+            print(f"{step:<28}{len(samples):>5}{errors:>9.1%}"
+                  + "".join(f"{percentile(times, p):>8.2f}s" for p in PERCENTILES))
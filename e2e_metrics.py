@@ -0,0 +1,155 @@
+"""
+Métricas de rendimiento por página para los tests E2E de Bright Bogotá
+Navigation Timing, paint, LCP, CLS, long tasks y heap de JS, por test y por viewport
+"""
+
+import json
+import statistics
+import threading
+import time
+
+# Observadores que se registran antes de que arranque la app (Page.addScriptToEvaluateOnNewDocument)
+# y acumulan LCP, layout shifts y long tasks en window.__e2ePerf
+OBSERVERS_JS = """
+(function () {
+  if (window.__e2ePerf) { return; }
+  var perf = window.__e2ePerf = { lcp: null, cls: 0, longTasks: 0, longTaskMs: 0 };
+  function observe(type, callback) {
+    try {
+      new PerformanceObserver(function (list) { list.getEntries().forEach(callback); })
+        .observe({ type: type, buffered: true });
+    } catch (e) {}
+  }
+  observe('largest-contentful-paint', function (entry) { perf.lcp = entry.startTime; });
+  observe('layout-shift', function (entry) { if (!entry.hadRecentInput) { perf.cls += entry.value; } });
+  observe('longtask', function (entry) { perf.longTasks += 1; perf.longTaskMs += entry.duration; });
+})();
+"""
+
+COLLECT_JS = """
+var perf = window.__e2ePerf || {};
+var nav = performance.getEntriesByType('navigation')[0];
+var paints = {};
+performance.getEntriesByType('paint').forEach(function (entry) { paints[entry.name] = entry.startTime; });
+var memory = performance.memory || {};
+return {
+  url: location.href,
+  inner_size: [window.innerWidth, window.innerHeight],
+  ttfb: nav ? nav.responseStart : null,
+  dom_content_loaded: nav ? nav.domContentLoadedEventEnd : null,
+  load: nav ? nav.loadEventEnd : null,
+  transfer_size: nav ? nav.transferSize : null,
+  first_paint: paints['first-paint'] === undefined ? null : paints['first-paint'],
+  first_contentful_paint: paints['first-contentful-paint'] === undefined ? null : paints['first-contentful-paint'],
+  lcp: perf.lcp === undefined ? null : perf.lcp,
+  cls: perf.cls === undefined ? null : perf.cls,
+  long_tasks: perf.longTasks === undefined ? null : perf.longTasks,
+  long_task_ms: perf.longTaskMs === undefined ? null : perf.longTaskMs,
+  js_heap_used: memory.usedJSHeapSize === undefined ? null : memory.usedJSHeapSize,
+  js_heap_total: memory.totalJSHeapSize === undefined ? null : memory.totalJSHeapSize
+};
+"""
+
+# Métricas que se muestran en el resumen (clave, etiqueta, unidad)
+SUMMARY_METRICS = (
+    ("ttfb", "TTFB", "ms"),
+    ("first_contentful_paint", "FCP", "ms"),
+    ("lcp", "LCP", "ms"),
+    ("cls", "CLS", ""),
+    ("long_tasks", "Long tasks", ""),
+    ("js_heap_used", "Heap JS", "MB"),
+    ("click_to_cart_update", "Clic→carrito", "ms"),
+    ("click_to_slide_change", "Clic→slide", "ms"),
+)
+
+
+def viewport_label(width, height):
+    return f"{width}x{height}"
+
+
+class PerformanceRecorder:
+    """Almacén de métricas de rendimiento compartido por todas las sesiones.
+
+    ``install`` registra los observadores en un driver (una vez por sesión,
+    aunque la usen varios recorders, como las celdas de la matriz) y
+    ``capture`` toma una muestra de la página actual asociada a un test y un
+    viewport. Es seguro usarlo desde varios workers a la vez.
+    """
+
+    def __init__(self):
+        self.samples = []
+        self._lock = threading.Lock()
+
+    def install(self, driver):
+        """Registrar los observadores de rendimiento para todas las páginas que cargue el driver"""
+        if getattr(driver, "_e2e_perf_observers", False):
+            return
+        try:
+            driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": OBSERVERS_JS})
+        except Exception as e:
+            # Sin CDP los observadores se instalan al capturar y dependen de buffered: true
+            print(f"[METRICS] ⚠ No se pudieron registrar los observadores por CDP: {e}")
+        driver._e2e_perf_observers = True
+
+    def capture(self, driver, test, viewport=None):
+        """Tomar una muestra de la página actual y guardarla bajo (test, viewport)"""
+        driver.execute_script(OBSERVERS_JS)
+        metrics = driver.execute_script(COLLECT_JS)
+        if viewport is None:
+            size = driver.get_window_size()
+            viewport = viewport_label(size["width"], size["height"])
+        sample = {**metrics, "test": test, "viewport": viewport, "timestamp": time.time()}
+        with self._lock:
+            self.samples.append(sample)
+        return sample
+
+    def record(self, test, name, value, viewport=None):
+        """Guardar una medida propia del test (p. ej. tiempo de clic a actualización del carrito)"""
+        sample = {name: value, "test": test, "viewport": viewport or "-", "timestamp": time.time()}
+        with self._lock:
+            self.samples.append(sample)
+        return sample
+
+    def extend(self, samples):
+        """Añadir muestras tomadas con otro PerformanceRecorder (p. ej. las de una celda de la matriz)"""
+        with self._lock:
+            self.samples.extend(samples)
+
+    def by_test(self):
+        """Muestras agrupadas por (test, viewport)"""
+        groups = {}
+        with self._lock:
+            for sample in self.samples:
+                groups.setdefault((sample["test"], sample["viewport"]), []).append(sample)
+        return groups
+
+    def report(self):
+        """Imprimir la mediana de cada métrica por test y viewport"""
+        groups = self.by_test()
+        if not groups:
+            return
+        print("\n" + "-" * 60)
+        print("MÉTRICAS DE RENDIMIENTO (mediana)")
+        print("-" * 60)
+        for (test, viewport), samples in sorted(groups.items(), key=lambda item: (str(item[0][0]), item[0][1])):
+            values = []
+            for key, label, unit in SUMMARY_METRICS:
+                data = [s[key] for s in samples if s.get(key) is not None]
+                if not data:
+                    continue
+                value = statistics.median(data)
+                if unit == "MB":
+                    values.append(f"{label} {value / 1048576:.1f}MB")
+                elif unit == "ms":
+                    values.append(f"{label} {value:.0f}ms")
+                else:
+                    values.append(f"{label} {value:.3g}")
+            print(f"{test} @ {viewport} [{len(samples)}]: " + ", ".join(values))
+
+    def save(self, path):
+        """Guardar todas las muestras en JSON"""
+        with self._lock:
+            samples = list(self.samples)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"samples": samples}, f, indent=2, ensure_ascii=False)
+        print(f"[METRICS] Métricas guardadas en {path}")
@@ -0,0 +1,225 @@
+"""
+Registro de la cascada de red y el peso de cada recurso para los tests E2E de Bright Bogotá
+Usa el performance log de ChromeDriver (eventos Network.* de CDP) y escribe un HAR por test
+"""
+
+import json
+import os
+import re
+import threading
+from datetime import datetime, timezone
+
+# Capacidades que activan el performance log con los eventos de red de CDP
+LOGGING_PREFS = {"performance": "ALL"}
+PERF_LOGGING_PREFS = {"enableNetwork": True, "enablePage": False}
+
+
+def enable_performance_log(options):
+    """Activar en las opciones de Chrome el performance log con eventos de red"""
+    options.set_capability("goog:loggingPrefs", LOGGING_PREFS)
+    options.add_experimental_option("perfLoggingPrefs", PERF_LOGGING_PREFS)
+
+
+def network_events(log_entries):
+    """Extraer los eventos Network.* de las entradas del performance log"""
+    for entry in log_entries:
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, ValueError):
+            continue
+        if message.get("method", "").startswith("Network."):
+            yield message["method"], message.get("params", {})
+
+
+def _phase(start, end):
+    """Duración en ms de una fase de ResourceTiming (-1 si no aplica, como en HAR)"""
+    if start is None or end is None or start < 0 or end < 0:
+        return -1
+    return round(end - start, 3)
+
+
+class _Request:
+    __slots__ = ("id", "url", "method", "type", "document", "started", "wall_time", "status",
+                 "mime_type", "protocol", "timing", "cache", "transfer_size", "decoded_size",
+                 "finished", "error")
+
+    def __init__(self, request_id, params):
+        request = params.get("request", {})
+        self.id = request_id
+        self.url = request.get("url", "")
+        self.method = request.get("method", "GET")
+        self.type = params.get("type", "Other")
+        self.document = params.get("documentURL", "")
+        self.started = params.get("timestamp")
+        self.wall_time = params.get("wallTime")
+        self.status = 0
+        self.mime_type = ""
+        self.protocol = ""
+        self.timing = None
+        self.cache = "network"
+        self.transfer_size = 0
+        self.decoded_size = 0
+        self.finished = None
+        self.error = None
+
+    def timings(self):
+        """Fases HAR (ms) a partir de response.timing y del fin de la descarga"""
+        t = self.timing or {}
+        wait = _phase(t.get("sendEnd"), t.get("receiveHeadersEnd"))
+        receive = -1
+        if t and self.finished is not None:
+            headers_end = t["requestTime"] + t.get("receiveHeadersEnd", 0) / 1000
+            receive = round(max(0.0, (self.finished - headers_end) * 1000), 3)
+        blocked = t.get("dnsStart", -1)
+        if blocked < 0:
+            blocked = t.get("connectStart", -1)
+        if blocked < 0:
+            blocked = t.get("sendStart", -1)
+        return {
+            "blocked": round(blocked, 3) if blocked >= 0 else -1,
+            "dns": _phase(t.get("dnsStart"), t.get("dnsEnd")),
+            "connect": _phase(t.get("connectStart"), t.get("connectEnd")),
+            "ssl": _phase(t.get("sslStart"), t.get("sslEnd")),
+            "send": _phase(t.get("sendStart"), t.get("sendEnd")),
+            "wait": wait,
+            "receive": receive,
+        }
+
+    def har_entry(self):
+        timings = self.timings()
+        total = sum(value for value in timings.values() if value > 0)
+        started = (datetime.fromtimestamp(self.wall_time, timezone.utc).isoformat()
+                   if self.wall_time else None)
+        return {
+            "startedDateTime": started,
+            "time": round(total, 3),
+            "request": {"method": self.method, "url": self.url},
+            "response": {
+                "status": self.status,
+                "httpVersion": self.protocol,
+                "bodySize": self.transfer_size,
+                "content": {"size": self.decoded_size, "mimeType": self.mime_type},
+            },
+            "cache": {},
+            "timings": timings,
+            "_resourceType": self.type,
+            "_documentURL": self.document,
+            "_transferSize": self.transfer_size,
+            "_cacheStatus": self.cache,
+            "_error": self.error,
+        }
+
+
+def build_entries(events):
+    """Reconstruir las peticiones a partir de los eventos Network.* en orden"""
+    requests = {}
+    order = []
+    for method, params in events:
+        request_id = params.get("requestId")
+        if method == "Network.requestWillBeSent":
+            if request_id in requests and params.get("redirectResponse"):
+                # Una redirección reutiliza el requestId: la petición anterior queda cerrada
+                requests[request_id].status = params["redirectResponse"].get("status", 0)
+            requests[request_id] = _Request(request_id, params)
+            order.append(requests[request_id])
+            continue
+        request = requests.get(request_id)
+        if request is None:
+            continue
+        if method == "Network.responseReceived":
+            response = params.get("response", {})
+            request.status = response.get("status", 0)
+            request.mime_type = response.get("mimeType", "")
+            request.protocol = response.get("protocol", "")
+            request.timing = response.get("timing")
+            request.type = params.get("type", request.type)
+            if response.get("fromDiskCache"):
+                request.cache = "disk"
+            elif response.get("fromPrefetchCache"):
+                request.cache = "prefetch"
+            elif response.get("fromServiceWorker"):
+                request.cache = "service-worker"
+        elif method == "Network.requestServedFromCache":
+            request.cache = "memory"
+        elif method == "Network.dataReceived":
+            request.decoded_size += params.get("dataLength", 0)
+        elif method == "Network.loadingFinished":
+            request.transfer_size = int(params.get("encodedDataLength", 0))
+            request.finished = params.get("timestamp")
+        elif method == "Network.loadingFailed":
+            request.finished = params.get("timestamp")
+            request.error = params.get("blockedReason") or params.get("errorText")
+    return [request.har_entry() for request in order]
+
+
+def _safe_name(name):
+    return re.sub(r"[^\w.-]+", "_", name)
+
+
+class NetworkRecorder:
+    """Graba la actividad de red de cada test.
+
+    ``begin`` descarta lo que haya en el performance log del driver, ``end``
+    reconstruye las peticiones del test, escribe ``<test>.har`` en
+    ``output_dir`` y guarda un resumen para el informe final.
+    """
+
+    def __init__(self, output_dir, top=10):
+        self.output_dir = output_dir
+        self.top = top
+        self.pages = {}
+        self._lock = threading.Lock()
+        os.makedirs(output_dir, exist_ok=True)
+
+    def begin(self, driver):
+        driver.get_log("performance")
+
+    def end(self, driver, test):
+        entries = build_entries(network_events(driver.get_log("performance")))
+        har = {
+            "log": {
+                "version": "1.2",
+                "creator": {"name": "bright-bogota-e2e", "version": "1.0"},
+                "pages": [{"id": test, "title": test}],
+                "entries": [dict(entry, pageref=test) for entry in entries],
+            }
+        }
+        path = os.path.join(self.output_dir, f"{_safe_name(test)}.har")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(har, f, indent=2)
+        with self._lock:
+            # Con --repeat se conserva la última ejecución de cada test
+            self.pages[test] = entries
+        return entries
+
+    def report(self):
+        """Bytes por página y los recursos más pesados de toda la ejecución"""
+        with self._lock:
+            pages = {test: list(entries) for test, entries in self.pages.items()}
+        if not pages:
+            return
+        print("\n" + "-" * 60)
+        print("RED: BYTES POR PÁGINA")
+        print("-" * 60)
+        heaviest = {}
+        for test, entries in sorted(pages.items()):
+            per_document = {}
+            for entry in entries:
+                document = entry["_documentURL"] or entry["request"]["url"]
+                totals = per_document.setdefault(document, [0, 0, 0])
+                totals[0] += entry["_transferSize"]
+                totals[1] += entry["response"]["content"]["size"]
+                totals[2] += 1
+                known = heaviest.get(entry["request"]["url"])
+                if known is None or entry["_transferSize"] > known["_transferSize"]:
+                    heaviest[entry["request"]["url"]] = entry
+            for document, (transfer, decoded, count) in per_document.items():
+                print(f"{test}: {document} — {count} peticiones, "
+                      f"{transfer / 1024:.1f} KB transferidos, {decoded / 1024:.1f} KB descomprimidos")
+
+        print(f"\nTop {self.top} recursos más pesados:")
+        ranked = sorted(heaviest.values(), key=lambda entry: entry["_transferSize"], reverse=True)
+        for entry in ranked[:self.top]:
+            print(f"  {entry['_transferSize'] / 1024:8.1f} KB  {entry['_resourceType']:<10} "
+                  f"{entry['_cacheStatus']:<8} {entry['request']['url']}")
+        print(f"\n[NETWORK] HAR por test en {self.output_dir}")
@@ -0,0 +1,210 @@
+"""
+Pool de sesiones de Chrome reutilizables para los tests E2E de Bright Bogotá
+Arranca los navegadores una sola vez y los reinicia entre tests en lugar de relanzarlos
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+
+# Limpia el storage del origen en el que está la sesión (el de la app tras un test)
+CLEAR_STORAGE_JS = """
+try { window.localStorage.clear(); } catch (e) {}
+try { window.sessionStorage.clear(); } catch (e) {}
+"""
+
+# Espera máxima por una sesión libre y cada cuánto se comprueba si se liberó un hueco
+ACQUIRE_TIMEOUT = 300
+ACQUIRE_POLL = 1.0
+
+
+@dataclass
+class Session:
+    """Sesión de navegador prestada por el pool"""
+    id: int
+    driver: object
+    created_at: float = field(default_factory=time.time)
+    uses: int = 0
+
+
+@dataclass
+class PoolStats:
+    """Tiempo invertido en crear sesiones frente a reutilizarlas"""
+    created: int = 0
+    creation_seconds: float = 0.0
+    reused: int = 0
+    reset_seconds: float = 0.0
+    evicted: int = 0
+
+    def report(self):
+        print("\n" + "-" * 60)
+        print("POOL DE SESIONES")
+        print("-" * 60)
+        avg_creation = self.creation_seconds / self.created if self.created else 0.0
+        avg_reset = self.reset_seconds / self.reused if self.reused else 0.0
+        print(f"Sesiones creadas: {self.created} ({self.creation_seconds:.2f}s, {avg_creation:.2f}s c/u)")
+        print(f"Reutilizaciones: {self.reused} ({self.reset_seconds:.2f}s en reinicios, {avg_reset:.3f}s c/u)")
+        print(f"Sesiones descartadas: {self.evicted}")
+        if self.reused:
+            saved = self.reused * (avg_creation - avg_reset)
+            print(f"Ahorro estimado frente a relanzar Chrome: {saved:.2f}s")
+
+
+class SessionPool:
+    """Pool acotado de sesiones de Chrome.
+
+    ``factory`` crea un driver nuevo. Las sesiones devueltas con ``release``
+    se reinician (cookies, localStorage/sessionStorage, tamaño de ventana y
+    about:blank) antes de volver a prestarse; si el reinicio falla la sesión se
+    descarta y se reemplaza por una nueva.
+    """
+
+    def __init__(self, factory, size=1, window_size=(1920, 1080)):
+        self.factory = factory
+        self.size = max(1, int(size))
+        self.window_size = window_size
+        self.stats = PoolStats()
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._sessions = {}
+        self._slots = 0
+        self._next_id = 0
+        self._closed = False
+
+    def _reserve(self):
+        with self._lock:
+            if self._slots >= self.size:
+                return False
+            self._slots += 1
+            return True
+
+    def _create(self):
+        started = time.perf_counter()
+        try:
+            driver = self.factory()
+        except Exception:
+            with self._lock:
+                self._slots -= 1
+            raise
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self._next_id += 1
+            session = Session(self._next_id, driver)
+            self._sessions[session.id] = session
+            self.stats.created += 1
+            self.stats.creation_seconds += elapsed
+        print(f"[POOL] Sesión {session.id} creada en {elapsed:.2f}s")
+        return session
+
+    def start(self):
+        """Arrancar todas las sesiones del pool en paralelo"""
+        missing = 0
+        while self._reserve():
+            missing += 1
+        if not missing:
+            return
+        with ThreadPoolExecutor(max_workers=missing) as pool:
+            for session in pool.map(lambda _: self._create(), range(missing)):
+                self._idle.put(session)
+
+    def acquire(self, timeout=ACQUIRE_TIMEOUT):
+        """Prestar una sesión libre, creando una nueva si el pool no está completo.
+
+        Mientras espera se comprueba periódicamente si se liberó un hueco (una
+        sesión descartada cuyo reemplazo no se pudo crear) para crear la
+        sesión aquí; si en ``timeout`` segundos no hay ninguna lanza TimeoutError.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            if self._closed:
+                raise RuntimeError("El pool de sesiones está cerrado")
+            try:
+                session = self._idle.get_nowait()
+                break
+            except queue.Empty:
+                pass
+            if self._reserve():
+                session = self._create()
+                break
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"No hubo ninguna sesión libre en {timeout}s")
+            try:
+                session = self._idle.get(timeout=min(remaining, ACQUIRE_POLL))
+                break
+            except queue.Empty:
+                continue
+        session.uses += 1
+        if session.uses > 1:
+            with self._lock:
+                self.stats.reused += 1
+        return session
+
+    def release(self, session):
+        """Devolver una sesión al pool, reiniciándola o descartándola si está rota"""
+        started = time.perf_counter()
+        try:
+            self.reset(session.driver)
+        except Exception as e:
+            print(f"[POOL] ⚠ Sesión {session.id} descartada: {e}")
+            self.evict(session)
+            if not self._closed and self._reserve():
+                try:
+                    self._idle.put(self._create())
+                except Exception as e:
+                    # _create ya devolvió el hueco: lo ocupará el próximo acquire
+                    print(f"[POOL] ⚠ No se pudo reemplazar la sesión {session.id}: {e}")
+            return
+        with self._lock:
+            self.stats.reset_seconds += time.perf_counter() - started
+        self._idle.put(session)
+
+    def reset(self, driver):
+        """Reinicio barato del estado del navegador entre tests"""
+        driver.execute_script(CLEAR_STORAGE_JS)
+        driver.delete_all_cookies()
+        driver.set_window_size(*self.window_size)
+        driver.get("about:blank")
+
+    def evict(self, session):
+        """Sacar una sesión del pool y cerrar su navegador"""
+        with self._lock:
+            if self._sessions.pop(session.id, None) is not None:
+                self._slots -= 1
+            self.stats.evicted += 1
+        try:
+            session.driver.quit()
+        except Exception:
+            pass
+
+    def session(self):
+        """Context manager: ``with pool.session() as session: ...``"""
+        return _Lease(self)
+
+    def close(self):
+        """Cerrar todos los navegadores del pool"""
+        self._closed = True
+        with self._lock:
+            sessions, self._sessions = list(self._sessions.values()), {}
+        for session in sessions:
+            try:
+                session.driver.quit()
+            except Exception as e:
+                print(f"⚠ Error al cerrar la sesión {session.id}: {e}")
+
+
+class _Lease:
+    def __init__(self, pool):
+        self.pool = pool
+        self.session = None
+
+    def __enter__(self):
+        self.session = self.pool.acquire()
+        return self.session
+
+    def __exit__(self, exc_type, exc, tb):
+        self.pool.release(self.session)
+        return False
@@ -0,0 +1,157 @@
+"""
+Perfil de comandos de WebDriver para los tests E2E de Bright Bogotá
+Registra cada comando (y cada WebDriverWait.until) con su selector, duración y reintentos
+"""
+
+import json
+import threading
+from dataclasses import asdict, dataclass
+
+# Comandos de búsqueda: el selector viene en los parámetros ("using", "value")
+FIND_COMMANDS = {"findElement", "findElements", "findChildElement", "findChildElements"}
+SCRIPT_COMMANDS = {"w3cExecuteScript", "w3cExecuteScriptAsync", "executeScript", "executeAsyncScript"}
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+
+
+@dataclass
+class CommandRecord:
+    """Un comando (o una espera) del perfil"""
+    test: str
+    command: str
+    selector: str
+    elapsed: float
+    retries: int = 0
+    error: str = None
+
+
+def _element_ids(value):
+    if isinstance(value, dict) and ELEMENT_KEY in value:
+        return [value[ELEMENT_KEY]]
+    if isinstance(value, list):
+        return [item[ELEMENT_KEY] for item in value if isinstance(item, dict) and ELEMENT_KEY in item]
+    return []
+
+
+def _closure_locator(method):
+    """Locator (By, valor) capturado por las condiciones de expected_conditions"""
+    for cell in getattr(method, "__closure__", None) or ():
+        try:
+            value = cell.cell_contents
+        except ValueError:
+            continue
+        if isinstance(value, tuple) and len(value) == 2 and all(isinstance(part, str) for part in value):
+            return value
+    return None
+
+
+def describe_condition(method, message=""):
+    """Nombre legible de una condición de espera"""
+    qualname = getattr(method, "__qualname__", None)
+    if qualname is None:
+        return message or type(method).__name__
+    base = qualname.split(".<locals>")[0]
+    locator = _closure_locator(method)
+    if locator:
+        return f"{base}({locator[0]}={locator[1]})"
+    if base == "<lambda>":
+        return message or base
+    return base
+
+
+def percentile(values, fraction):
+    """Percentil por rango más cercano (``fraction`` entre 0 y 1)"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+class CommandProfiler:
+    """Perfil en memoria de todos los comandos de WebDriver de la ejecución.
+
+    ``listener(test)`` devuelve un callback para ``add_command_listener`` y
+    ``record_wait`` registra cada ``WebDriverWait.until`` con sus reintentos.
+    Los comandos sobre elementos se atribuyen al selector con el que se
+    encontró el elemento; ese mapa es de cada listener, así que se descarta
+    al terminar el test en lugar de crecer durante toda la ejecución.
+    """
+
+    def __init__(self):
+        self.records = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _selector(command, params, selectors):
+        params = params or {}
+        if command in FIND_COMMANDS:
+            selector = f"{params.get('using')}={params.get('value')}"
+            return f"{selectors.get(params.get('id'))} > {selector}" if "id" in params else selector
+        if command in SCRIPT_COMMANDS:
+            script = " ".join((params.get("script") or "").split())
+            return f"script: {script[:60]}"
+        if command == "get":
+            return params.get("url", "")
+        if "id" in params:
+            return selectors.get(params["id"], f"element {params['id'][:8]}")
+        return ""
+
+    def listener(self, test):
+        """Callback de comandos que atribuye cada registro a ``test``"""
+        # Selector con el que se encontró cada elemento de este test (los ids no sobreviven al test)
+        selectors = {}
+
+        def on_command(command, params, response, elapsed, error):
+            selector = self._selector(command, params, selectors)
+            record = CommandRecord(test, command, selector, elapsed, error=type(error).__name__ if error else None)
+            if command in FIND_COMMANDS and response:
+                for element_id in _element_ids(response.get("value")):
+                    selectors[element_id] = selector
+            with self._lock:
+                self.records.append(record)
+        return on_command
+
+    def record_wait(self, test, description, elapsed, retries, error=None):
+        """Registrar un WebDriverWait.until completo"""
+        record = CommandRecord(test, "wait.until", description, elapsed, retries,
+                               type(error).__name__ if error else None)
+        with self._lock:
+            self.records.append(record)
+
+    def aggregate(self, key):
+        """{clave: (llamadas, total, media, p95, reintentos)} agrupando por ``key(record)``"""
+        groups = {}
+        with self._lock:
+            records = list(self.records)
+        for record in records:
+            groups.setdefault(key(record), []).append(record)
+        summary = {}
+        for name, items in groups.items():
+            times = [item.elapsed for item in items]
+            summary[name] = (len(items), sum(times), sum(times) / len(times),
+                             percentile(times, 0.95), sum(item.retries for item in items))
+        return summary
+
+    def report(self, top=15):
+        """Imprimir el tiempo total por tipo de comando y los selectores más costosos"""
+        if not self.records:
+            return
+        print("\n" + "-" * 60)
+        print("PERFIL DE COMANDOS WEBDRIVER")
+        print("-" * 60)
+        print(f"{'comando':<24}{'llamadas':>9}{'total':>10}{'media':>10}{'p95':>10}")
+        by_command = self.aggregate(lambda record: record.command)
+        for name, (count, total, mean, p95, _) in sorted(by_command.items(), key=lambda item: -item[1][1]):
+            print(f"{name:<24}{count:>9}{total:>9.2f}s{mean * 1000:>8.1f}ms{p95 * 1000:>8.1f}ms")
+
+        print(f"\nTop {top} selectores por tiempo total:")
+        by_selector = self.aggregate(lambda record: (record.command, record.selector))
+        ranked = sorted(by_selector.items(), key=lambda item: -item[1][1])
+        for (command, selector), (count, total, mean, _, retries) in ranked[:top]:
+            retry_text = f", {retries} reintentos" if retries else ""
+            print(f"  {total:7.2f}s  {count:>4}x {command:<20} {selector[:70]}{retry_text}")
+
+    def save(self, path):
+        """Guardar todos los registros en JSON"""
+        with self._lock:
+            records = [asdict(record) for record in self.records]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"commands": records}, f, indent=2, ensure_ascii=False)
+        print(f"[PROFILE] Perfil de comandos en {path}")
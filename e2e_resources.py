@@ -0,0 +1,196 @@
+"""
+Consumo de recursos del navegador durante los tests E2E de Bright Bogotá
+Muestrea RSS, CPU y número de procesos del árbol ChromeDriver/Chrome de cada sesión y el heap de JS por test
+"""
+
+import statistics
+import threading
+import time
+
+# psutil solo hace falta con --resources (opcional); se importa al crear el ResourceSampler
+psutil = None
+
+HEAP_JS = """
+var memory = performance.memory;
+return memory ? [memory.usedJSHeapSize, memory.totalJSHeapSize] : null;
+"""
+
+MB = 1048576
+
+
+def _driver_pid(driver):
+    """PID del proceso de ChromeDriver que lanzó la sesión (None en sesiones remotas)"""
+    process = getattr(getattr(driver, "service", None), "process", None)
+    return getattr(process, "pid", None)
+
+
+def _heap(driver):
+    try:
+        return driver.execute_script(HEAP_JS)
+    except Exception:
+        return None
+
+
+def _peak_avg(values):
+    return (max(values), statistics.fmean(values)) if values else (None, None)
+
+
+class ResourceSampler:
+    """Muestreo periódico de los árboles de procesos de las sesiones activas.
+
+    ``begin(driver, test)`` empieza a atribuir al test las muestras del árbol
+    de procesos de ese driver (ChromeDriver y todos sus Chrome) y ``end``
+    devuelve su resumen: pico y media de RSS, CPU y procesos, y el heap de JS
+    al empezar y al terminar. Un solo hilo muestrea todas las sesiones cada
+    ``interval`` segundos; el heap se lee desde el hilo del test, nunca desde
+    el del muestreo, para no mandar comandos concurrentes a la misma sesión.
+    """
+
+    def __init__(self, interval=0.5):
+        global psutil
+        if psutil is None:
+            try:
+                import psutil
+            except ImportError:
+                raise RuntimeError("El muestreo de recursos necesita psutil: pip install psutil")
+        self.interval = interval
+        self.summaries = []
+        self.host_peak_rss = 0
+        self.host_peak_processes = 0
+        self._active = {}
+        self._processes = {}
+        self._lock = threading.Lock()
+        self._sample_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._warned = False
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name="e2e-resources", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _process(self, pid):
+        process = self._processes.get(pid)
+        if process is None:
+            process = self._processes[pid] = psutil.Process(pid)
+            # La primera lectura de cpu_percent solo fija la referencia
+            process.cpu_percent(None)
+        return process
+
+    def _sample_tree(self, pid):
+        """(RSS en bytes, CPU %, procesos) del proceso ``pid`` y sus descendientes"""
+        with self._sample_lock:
+            root = self._process(pid)
+            rss = cpu = count = 0
+            for process in [root, *root.children(recursive=True)]:
+                try:
+                    process = self._process(process.pid)
+                    rss += process.memory_info().rss
+                    cpu += process.cpu_percent(None)
+                    count += 1
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    self._processes.pop(process.pid, None)
+            return rss, cpu, count
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            with self._lock:
+                active = list(self._active.values())
+            total_rss = total_processes = 0
+            for entry in active:
+                try:
+                    rss, cpu, count = self._sample_tree(entry["pid"])
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    continue
+                entry["samples"].append((rss, cpu, count))
+                total_rss += rss
+                total_processes += count
+            with self._lock:
+                self.host_peak_rss = max(self.host_peak_rss, total_rss)
+                self.host_peak_processes = max(self.host_peak_processes, total_processes)
+
+    def begin(self, driver, test):
+        pid = _driver_pid(driver)
+        if pid is None:
+            if not self._warned:
+                print("[RESOURCES] ⚠ La sesión no tiene proceso de ChromeDriver local; solo se mide el heap de JS")
+                self._warned = True
+        entry = {"test": test, "pid": pid, "samples": [], "heap": _heap(driver), "started": time.time()}
+        with self._lock:
+            if pid is not None:
+                self._active[id(driver)] = entry
+            else:
+                self._active.pop(id(driver), None)
+        driver._e2e_resources = entry
+
+    def end(self, driver):
+        """Resumen de recursos del test en curso en ``driver``"""
+        entry = getattr(driver, "_e2e_resources", None)
+        if entry is None:
+            return {}
+        with self._lock:
+            self._active.pop(id(driver), None)
+        driver._e2e_resources = None
+        if entry["pid"] is not None and not entry["samples"]:
+            # Test más corto que el intervalo: al menos una muestra al terminar
+            try:
+                entry["samples"].append(self._sample_tree(entry["pid"]))
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pass
+        rss_peak, rss_avg = _peak_avg([rss for rss, _, _ in entry["samples"]])
+        cpu_peak, cpu_avg = _peak_avg([cpu for _, cpu, _ in entry["samples"]])
+        processes_peak, _ = _peak_avg([count for _, _, count in entry["samples"]])
+        heap_start, heap_end = entry["heap"], _heap(driver)
+        summary = {
+            "samples": len(entry["samples"]),
+            "rss_peak_mb": None if rss_peak is None else round(rss_peak / MB, 1),
+            "rss_avg_mb": None if rss_avg is None else round(rss_avg / MB, 1),
+            "cpu_peak": None if cpu_peak is None else round(cpu_peak, 1),
+            "cpu_avg": None if cpu_avg is None else round(cpu_avg, 1),
+            "processes_peak": processes_peak,
+            "js_heap_start_mb": round(heap_start[0] / MB, 2) if heap_start else None,
+            "js_heap_end_mb": round(heap_end[0] / MB, 2) if heap_end else None,
+        }
+        with self._lock:
+            self.summaries.append({"test": entry["test"], **summary})
+        return summary
+
+    def report(self):
+        """Pico y media por test, pico del host y cuántas sesiones caben en la memoria libre"""
+        with self._lock:
+            summaries = list(self.summaries)
+        if not summaries:
+            return
+        print("\n" + "-" * 60)
+        print("RECURSOS DEL NAVEGADOR")
+        print("-" * 60)
+        by_test = {}
+        for summary in summaries:
+            by_test.setdefault(summary["test"], []).append(summary)
+        for test, entries in sorted(by_test.items()):
+            rss = [e["rss_peak_mb"] for e in entries if e["rss_peak_mb"] is not None]
+            cpu = [e["cpu_avg"] for e in entries if e["cpu_avg"] is not None]
+            heap = [e["js_heap_end_mb"] - e["js_heap_start_mb"] for e in entries
+                    if e["js_heap_end_mb"] is not None and e["js_heap_start_mb"] is not None]
+            parts = []
+            if rss:
+                parts.append(f"RSS pico {max(rss):.0f}MB")
+            if cpu:
+                parts.append(f"CPU media {statistics.fmean(cpu):.0f}%")
+            if heap:
+                parts.append(f"heap JS {statistics.fmean(heap):+.2f}MB")
+            print(f"{test} [{len(entries)}]: " + ", ".join(parts))
+        session_peak = max((s["rss_peak_mb"] for s in summaries if s["rss_peak_mb"] is not None), default=None)
+        if session_peak:
+            available = psutil.virtual_memory().available / MB
+            print(f"\nPico del host: {self.host_peak_rss / MB:.0f}MB en {self.host_peak_processes} procesos")
+            print(f"Pico por sesión: {session_peak:.0f}MB; con {available:.0f}MB libres caben "
+                  f"~{int(available // session_peak)} sesiones más")
@@ -0,0 +1,273 @@
+"""
+Resultados estructurados de los tests E2E de Bright Bogotá
+Estado, excepción y desglose de tiempos por test, exportables a JSON y JUnit XML
+"""
+
+import json
+import platform
+import socket
+import time
+import traceback
+import xml.etree.ElementTree as ET
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field, fields
+from datetime import datetime, timezone
+
+# Categoría de cada comando de WebDriver en el desglose de tiempos
+COMMAND_CATEGORIES = {
+    "get": "navigation",
+    "refresh": "navigation",
+    "goBack": "navigation",
+    "goForward": "navigation",
+    "clickElement": "click",
+    "sendKeysToElement": "input",
+    "clearElement": "input",
+    "w3cExecuteScript": "script",
+    "w3cExecuteScriptAsync": "script",
+    "executeScript": "script",
+    "executeAsyncScript": "script",
+}
+
+# navigation/click/input/script/command: comandos fuera de una espera.
+# wait: comandos de sondeo dentro de una espera; sleep: pausas entre sondeos.
+# Las categorías son disjuntas; "other" es el resto (Python, asserts, prints).
+STEP_CATEGORIES = ("navigation", "click", "input", "script", "command", "wait", "sleep")
+
+
+class StepTimer:
+    """Acumula el tiempo de un test por tipo de paso.
+
+    ``on_command`` se registra como listener de comandos del driver y
+    ``waiting()`` envuelve cada espera; los comandos que ocurren dentro de una
+    espera cuentan como "wait" y el tiempo restante de la espera como "sleep".
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.totals = dict.fromkeys(STEP_CATEGORIES, 0.0)
+        self.counts = dict.fromkeys(STEP_CATEGORIES, 0)
+        self._wait_depth = 0
+        self._wait_commands = 0.0
+
+    def on_command(self, command, params, response, elapsed, error):
+        if self._wait_depth:
+            self._wait_commands += elapsed
+            return
+        category = COMMAND_CATEGORIES.get(command, "command")
+        self.totals[category] += elapsed
+        self.counts[category] += 1
+
+    @contextmanager
+    def waiting(self):
+        """Marcar un bloque como espera (las esperas anidadas cuentan una sola vez)"""
+        self._wait_depth += 1
+        if self._wait_depth > 1:
+            try:
+                yield
+            finally:
+                self._wait_depth -= 1
+            return
+        self._wait_commands = 0.0
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self._wait_depth -= 1
+            self.totals["wait"] += self._wait_commands
+            self.totals["sleep"] += max(0.0, elapsed - self._wait_commands)
+            self.counts["wait"] += 1
+
+    def breakdown(self, duration):
+        """Desglose en segundos, con "other" como lo no atribuido a ningún paso"""
+        steps = {category: round(value, 4) for category, value in self.totals.items()}
+        steps["other"] = round(max(0.0, duration - sum(self.totals.values())), 4)
+        return steps
+
+
+@dataclass
+class TestResult:
+    """Resultado de un test del registro"""
+    label: str
+    test: str
+    passed: bool
+    duration: float = 0.0
+    steps: dict = field(default_factory=dict)
+    error: str = None
+    error_type: str = None
+    traceback: str = None
+    iteration: int = 1
+    output: str = ""
+    skipped: bool = False
+    # Intento en el que se obtuvo el resultado, si pasó tras fallar y si
+    # el test está en cuarentena (ver e2e_flaky)
+    attempts: int = 1
+    flaky: bool = False
+    quarantined: bool = False
+    # Pico/media de RSS, CPU y procesos y heap de JS (ver e2e_resources)
+    resources: dict = field(default_factory=dict)
+    # Directorio con la traza del fallo (ver e2e_trace)
+    trace: str = None
+
+    @property
+    def status(self):
+        if self.skipped:
+            return "skipped"
+        return "passed" if self.passed else "failed"
+
+    def set_error(self, error):
+        self.error = str(error)
+        self.error_type = type(error).__name__
+        self.traceback = "".join(traceback.format_exception(type(error), error, error.__traceback__))
+
+    def to_dict(self):
+        data = asdict(self)
+        data["status"] = self.status
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        """Reconstruir un resultado de ``to_dict`` (p. ej. el JSON de otro shard)"""
+        names = {f.name for f in fields(cls)}
+        return cls(**{name: value for name, value in data.items() if name in names})
+
+
+class ResultsReport:
+    """Resultados de toda la ejecución (todas las iteraciones) y su exportación"""
+
+    def __init__(self, suite="TestBrightBogota", **context):
+        self.suite = suite
+        self.context = context
+        self.results = []
+        self.started = time.time()
+        self.finished = None
+
+    def extend(self, results):
+        self.results.extend(results)
+
+    @property
+    def failed(self):
+        """Fallos que cuentan para el resultado (sin omitidos ni tests en cuarentena)"""
+        return [
+            result for result in self.results
+            if not result.passed and not result.skipped and not result.quarantined
+        ]
+
+    @property
+    def quarantined(self):
+        return [
+            result for result in self.results
+            if result.quarantined and not result.passed and not result.skipped
+        ]
+
+    @property
+    def skipped(self):
+        return [result for result in self.results if result.skipped]
+
+    def finish(self):
+        self.finished = time.time()
+
+    def _duration(self):
+        return (self.finished or time.time()) - self.started
+
+    def to_dict(self):
+        return {
+            "suite": self.suite,
+            "started": datetime.fromtimestamp(self.started, timezone.utc).isoformat(),
+            "duration": round(self._duration(), 3),
+            "host": socket.gethostname(),
+            "python": platform.python_version(),
+            "context": self.context,
+            "summary": {
+                "total": len(self.results),
+                "passed": len(self.results) - len(self.failed) - len(self.skipped) - len(self.quarantined),
+                "failed": len(self.failed),
+                "skipped": len(self.skipped),
+                "quarantined": len(self.quarantined),
+                "flaky": sum(1 for result in self.results if result.flaky),
+            },
+            "tests": [result.to_dict() for result in self.results],
+        }
+
+    def write_json(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+        print(f"[RESULTS] Resultados JSON en {path}")
+
+    def write_junit(self, path):
+        testsuites = ET.Element("testsuites", {
+            "name": self.suite,
+            "tests": str(len(self.results)),
+            "failures": str(len(self.failed)),
+            "time": f"{self._duration():.3f}",
+        })
+        testsuite = ET.SubElement(testsuites, "testsuite", {
+            "name": self.suite,
+            "tests": str(len(self.results)),
+            "failures": str(len(self.failed)),
+            "errors": "0",
+            "skipped": str(len(self.skipped) + len(self.quarantined)),
+            "time": f"{sum(result.duration for result in self.results):.3f}",
+            "timestamp": datetime.fromtimestamp(self.started, timezone.utc).isoformat(),
+            "hostname": socket.gethostname(),
+        })
+        properties = ET.SubElement(testsuite, "properties")
+        for name, value in sorted(self.context.items()):
+            ET.SubElement(properties, "property", {"name": name, "value": str(value)})
+
+        for result in self.results:
+            name = result.test if result.iteration == 1 else f"{result.test}[{result.iteration}]"
+            testcase = ET.SubElement(testsuite, "testcase", {
+                "classname": f"test_e2e.{self.suite}",
+                "name": name,
+                "time": f"{result.duration:.3f}",
+            })
+            case_properties = ET.SubElement(testcase, "properties")
+            ET.SubElement(case_properties, "property", {"name": "label", "value": result.label})
+            ET.SubElement(case_properties, "property", {"name": "attempts", "value": str(result.attempts)})
+            if result.flaky:
+                ET.SubElement(case_properties, "property", {"name": "flaky", "value": "true"})
+            if result.trace:
+                ET.SubElement(case_properties, "property", {"name": "trace", "value": result.trace})
+            for category, seconds in result.steps.items():
+                ET.SubElement(case_properties, "property", {"name": f"step.{category}", "value": f"{seconds:.4f}"})
+            for name, value in result.resources.items():
+                if value is not None:
+                    ET.SubElement(case_properties, "property", {"name": f"resource.{name}", "value": str(value)})
+            if result.skipped:
+                ET.SubElement(testcase, "skipped", {"message": result.error or ""})
+            elif result.quarantined and not result.passed:
+                # El fallo queda visible pero no rompe el build
+                skipped = ET.SubElement(testcase, "skipped", {"message": f"En cuarentena: {result.error or ''}"})
+                skipped.text = result.traceback or ""
+            elif not result.passed:
+                failure = ET.SubElement(testcase, "failure", {
+                    "message": result.error or "El test devolvió False",
+                    "type": result.error_type or "AssertionError",
+                })
+                failure.text = result.traceback or ""
+            if result.output:
+                ET.SubElement(testcase, "system-out").text = result.output
+
+        ET.indent(testsuites)
+        ET.ElementTree(testsuites).write(path, encoding="utf-8", xml_declaration=True)
+        print(f"[RESULTS] Resultados JUnit en {path}")
+
+    def report_slowest_steps(self, top=5):
+        """Imprimir los pasos en los que más tiempo se fue"""
+        if not self.results:
+            return
+        totals = {}
+        for result in self.results:
+            for category, seconds in result.steps.items():
+                totals[category] = totals.get(category, 0.0) + seconds
+        print("\n" + "-" * 60)
+        print("TIEMPO POR TIPO DE PASO")
+        print("-" * 60)
+        for category, seconds in sorted(totals.items(), key=lambda item: item[1], reverse=True):
+            print(f"{category:<12} {seconds:8.2f}s")
+        print("\nTests más lentos:")
+        for result in sorted(self.results, key=lambda r: r.duration, reverse=True)[:top]:
+            print(f"  {result.duration:6.2f}s  {result.label}")
@@ -0,0 +1,164 @@
+"""
+Ejecución paralela de los tests E2E de Bright Bogotá
+Reparte los tests registrados entre N sesiones de Chrome aisladas del pool
+"""
+
+import io
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from e2e_results import TestResult
+from e2e_schedule import blocked_by, chains, skipped_result
+
+
+@dataclass(frozen=True)
+class TestSpec:
+    """Entrada del registro de tests.
+
+    ``viewport`` es el tamaño de ventana (ancho, alto) que necesita el test,
+    ``start_url`` la ruta en la que empieza (None si navega por su cuenta) y
+    ``requires`` los tests cuyo estado da por hecho; el planificador los usa
+    para ordenar y agrupar los tests y para omitir los dependientes.
+    ``fixture`` es el nombre de un snapshot de estado (ver ``e2e_fixtures``)
+    que se inyecta antes de cargar ``start_url``.
+    """
+    label: str
+    method: str
+    viewport: tuple = None
+    start_url: str = "/"
+    requires: tuple = ()
+    fixture: str = None
+
+
+class _ThreadOutput:
+    """Redirige print() a un buffer por hilo para no mezclar la salida de los workers"""
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
+
+    def capture(self):
+        self._local.buffer = io.StringIO()
+
+    def release(self):
+        buffer = getattr(self._local, "buffer", None)
+        self._local.buffer = None
+        return buffer.getvalue() if buffer else ""
+
+    def write(self, text):
+        buffer = getattr(self._local, "buffer", None)
+        return (buffer or self._stream).write(text)
+
+    def flush(self):
+        self._stream.flush()
+
+
+def print_summary(results):
+    """Mostrar el resumen PASS/FAIL de una lista de TestResult"""
+    print("\n" + "=" * 60)
+    print("RESUMEN DE RESULTADOS")
+    print("=" * 60)
+
+    passed = sum(1 for result in results if result.passed)
+    skipped = sum(1 for result in results if result.skipped)
+    quarantined = sum(1 for result in results if result.quarantined and not result.passed and not result.skipped)
+    failed = len(results) - passed - skipped - quarantined
+
+    for result in results:
+        if result.skipped:
+            status = "↷ SKIP"
+        elif result.passed:
+            status = "↻ PASS" if result.flaky else "✓ PASS"
+        else:
+            status = "⚠ FAIL" if result.quarantined else "✗ FAIL"
+        attempts = f", intento {result.attempts}" if result.attempts > 1 else ""
+        print(f"{status} - {result.label} ({result.duration:.2f}s{attempts})")
+
+    print("\n" + "-" * 60)
+    print(f"Total: {len(results)} tests")
+    print(f"Exitosos: {passed}")
+    print(f"Fallidos: {failed}")
+    if skipped:
+        print(f"Omitidos: {skipped}")
+    if quarantined:
+        print(f"Fallidos en cuarentena (no bloquean): {quarantined}")
+    print("=" * 60)
+    return passed, failed
+
+
+class ParallelRunner:
+    """Ejecuta los tests sobre un pool de hilos, cada cadena con una sesión del pool.
+
+    Los tests se agrupan en cadenas según sus ``requires`` (ver
+    ``e2e_schedule.chains``). Cada cadena toma una sesión de ``pool`` (ya
+    reiniciada), construye la suite sobre ella con ``suite_factory(driver)`` y
+    ejecuta sus tests en orden; el primero arranca cargando su página y los
+    dependientes de un test fallido se omiten. Así ningún estado se filtra
+    entre cadenas y los dependientes ven el estado que dejó su prerrequisito.
+    """
+
+    def __init__(self, suite_factory, pool, workers=None):
+        self.suite_factory = suite_factory
+        self.pool = pool
+        self.workers = max(1, int(workers or pool.size))
+
+    def _run_chain(self, chain, iteration):
+        results = []
+        outcomes = {}
+        self._output.capture()
+        started = time.perf_counter()
+        try:
+            with self.pool.session() as session:
+                suite = self.suite_factory(session.driver)
+                for position, spec in enumerate(chain):
+                    requirement = blocked_by(spec, outcomes)
+                    if requirement:
+                        result = skipped_result(spec, requirement)
+                    else:
+                        test_started = time.perf_counter()
+                        result = suite.run_test(spec, isolated=position == 0)
+                        print(f"[WORKER {threading.current_thread().name}] {spec.label}: "
+                              f"{time.perf_counter() - test_started:.2f}s")
+                    outcomes[spec.method] = result.passed
+                    result.output = self._output.release()
+                    self._output.capture()
+                    results.append(result)
+        except Exception as e:
+            remaining = chain[len(results):]
+            print(f"✗ Error crítico en '{(remaining or chain)[0].label}': {e}")
+            for spec in remaining:
+                result = TestResult(spec.label, spec.method, False, time.perf_counter() - started)
+                result.set_error(e)
+                result.output = self._output.release()
+                self._output.capture()
+                results.append(result)
+        finally:
+            self._output.release()
+        for result in results:
+            result.iteration = iteration
+        return results
+
+    def run(self, specs, iteration=1):
+        """Ejecutar los tests y devolver sus TestResult en el orden del registro"""
+        groups = chains(specs)
+        print(f"[RUNNER] Ejecutando {len(specs)} tests ({len(groups)} cadenas) con {self.workers} workers...")
+        self._output = _ThreadOutput(sys.stdout)
+        original_stdout = sys.stdout
+        sys.stdout = self._output
+        started = time.perf_counter()
+        by_method = {}
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="e2e") as pool:
+                futures = [pool.submit(self._run_chain, chain, iteration) for chain in groups]
+                for future in futures:
+                    for result in future.result():
+                        original_stdout.write(result.output)
+                        original_stdout.flush()
+                        by_method[result.test] = result
+        finally:
+            sys.stdout = original_stdout
+        print(f"\n[RUNNER] Tiempo total: {time.perf_counter() - started:.2f}s")
+        return [by_method[spec.method] for spec in specs]
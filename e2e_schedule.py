@@ -0,0 +1,89 @@
+"""
+Planificación de los tests E2E de Bright Bogotá
+Ordena los tests según su viewport, página inicial y prerrequisitos para evitar cambios de tamaño y cargas
+"""
+
+from e2e_results import TestResult
+
+
+def _cost(spec, viewport, page):
+    """Cambios de tamaño y navegaciones que necesita ``spec`` desde el estado actual"""
+    resize = spec.viewport is not None and spec.viewport != viewport
+    load = spec.fixture is not None or (spec.start_url is not None and spec.start_url != page)
+    return int(resize) + int(load)
+
+
+def plan(specs, viewport=None, page=None):
+    """Ordenar ``specs`` respetando ``requires`` y minimizando resizes y cargas.
+
+    Algoritmo voraz: entre los tests cuyos prerrequisitos ya están en el plan
+    se elige el que menos cambios necesita desde el estado actual; si todos
+    necesitan cambiar de viewport se elige el viewport con más tests listos.
+    Los empates respetan el orden del registro. Los prerrequisitos que no
+    están en ``specs`` se ignoran.
+    """
+    index = {spec.method: position for position, spec in enumerate(specs)}
+    remaining = list(specs)
+    ordered = []
+    while remaining:
+        pending = {spec.method for spec in remaining}
+        ready = [spec for spec in remaining if not any(req in pending for req in spec.requires)]
+        if not ready:
+            cycle = ", ".join(spec.method for spec in remaining)
+            raise ValueError(f"Dependencias circulares entre: {cycle}")
+        group_sizes = {}
+        for spec in ready:
+            group_sizes[spec.viewport] = group_sizes.get(spec.viewport, 0) + 1
+
+        def key(spec):
+            cost = _cost(spec, viewport, page)
+            return cost, -group_sizes[spec.viewport] if cost else 0, index[spec.method]
+
+        chosen = min(ready, key=key)
+        ordered.append(chosen)
+        remaining.remove(chosen)
+        viewport = chosen.viewport or viewport
+        page = chosen.start_url or page
+    return ordered
+
+
+def chains(specs):
+    """Agrupar los tests unidos por ``requires`` en cadenas planificadas.
+
+    Cada cadena debe ejecutarse en orden sobre una misma sesión; cadenas
+    distintas son independientes y pueden ir en paralelo.
+    """
+    methods = {spec.method for spec in specs}
+    parent = {spec.method: spec.method for spec in specs}
+
+    def find(method):
+        while parent[method] != method:
+            parent[method] = parent[parent[method]]
+            method = parent[method]
+        return method
+
+    for spec in specs:
+        for requirement in spec.requires:
+            if requirement in methods:
+                parent[find(spec.method)] = find(requirement)
+
+    groups = {}
+    for spec in specs:
+        groups.setdefault(find(spec.method), []).append(spec)
+    return [plan(group) for group in groups.values()]
+
+
+def blocked_by(spec, outcomes):
+    """Primer prerrequisito de ``spec`` que no pasó (según ``outcomes``: método -> bool)"""
+    for requirement in spec.requires:
+        if outcomes.get(requirement) is False:
+            return requirement
+    return None
+
+
+def skipped_result(spec, requirement):
+    """TestResult de un test que no se ejecuta porque falló su prerrequisito"""
+    result = TestResult(spec.label, spec.method, False, skipped=True)
+    result.error = f"Omitido: falló el prerrequisito {requirement}"
+    print(f"\n[SCHEDULE] ↷ {spec.label} omitido: falló {requirement}")
+    return result
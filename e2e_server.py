@@ -0,0 +1,162 @@
+"""
+Servidor local del sitio para ejecutar los tests E2E sin depender del despliegue en Hostinger
+Sirve el build de Angular (estático) o arranca la app SSR de server.ts en un puerto libre
+"""
+
+import functools
+import os
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DIST_DIR = os.path.join(ROOT, "dist", "bright-bogota-test")
+BROWSER_DIST = os.path.join(DIST_DIR, "browser")
+SERVER_MAIN = os.path.join(DIST_DIR, "server", "main.js")
+
+MODES = ("static", "ssr")
+
+
+class _SpaRequestHandler(SimpleHTTPRequestHandler):
+    """Igual que server.ts: los ficheros se sirven tal cual y el resto de rutas devuelve index.html"""
+
+    protocol_version = "HTTP/1.1"
+    index_file = "index.html"
+
+    def translate_path(self, path):
+        translated = super().translate_path(path)
+        route = path.split("?", 1)[0].split("#", 1)[0]
+        if not os.path.exists(translated) and "." not in os.path.basename(route):
+            return os.path.join(self.directory, self.index_file)
+        return translated
+
+    def end_headers(self):
+        if "." in os.path.basename(self.path.split("?", 1)[0]):
+            self.send_header("Cache-Control", "public, max-age=31536000")
+        super().end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _free_port(host):
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+class LocalSiteServer:
+    """Servidor HTTP local del sitio en un puerto aleatorio.
+
+    ``mode="static"`` sirve ``dist/bright-bogota-test/browser`` desde un hilo de
+    este mismo proceso; ``mode="ssr"`` lanza ``node dist/bright-bogota-test/server/main.js``
+    (la app Express de server.ts). En ambos casos ``start()`` no devuelve el
+    control hasta que el servidor responde 200.
+
+        with LocalSiteServer("static") as server:
+            TestBrightBogota.BASE_URL = server.url
+    """
+
+    def __init__(self, mode="static", host="127.0.0.1", startup_timeout=30):
+        if mode not in MODES:
+            raise ValueError(f"Modo de servidor desconocido: '{mode}' (disponibles: {', '.join(MODES)})")
+        self.mode = mode
+        self.host = host
+        self.startup_timeout = startup_timeout
+        self.port = None
+        self._httpd = None
+        self._thread = None
+        self._process = None
+        self._stderr = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def start(self):
+        """Arrancar el servidor y esperar a que esté sano"""
+        started = time.perf_counter()
+        if self.mode == "static":
+            self._start_static()
+        else:
+            self._start_ssr()
+        try:
+            self.wait_healthy()
+        except Exception:
+            self.stop()
+            raise
+        print(f"[SERVER] ✓ Sitio local ({self.mode}) en {self.url} ({time.perf_counter() - started:.2f}s)")
+        return self
+
+    def _start_static(self):
+        if not os.path.isfile(os.path.join(BROWSER_DIST, "index.html")):
+            raise RuntimeError(f"No existe el build en {BROWSER_DIST}. Ejecuta primero: npm run build")
+        handler = functools.partial(_SpaRequestHandler, directory=BROWSER_DIST)
+        self._httpd = ThreadingHTTPServer((self.host, 0), handler)
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="e2e-server", daemon=True)
+        self._thread.start()
+
+    def _start_ssr(self):
+        if not os.path.isfile(SERVER_MAIN):
+            raise RuntimeError(f"No existe el build SSR en {SERVER_MAIN}. Ejecuta primero: npm run build:ssr:e2e")
+        self.port = _free_port(self.host)
+        env = dict(os.environ, PORT=str(self.port))
+        # stderr va a un fichero temporal para no bloquear a node si escribe mucho
+        self._stderr = tempfile.TemporaryFile()
+        # server.ts resuelve dist/ a partir de process.cwd()
+        self._process = subprocess.Popen(
+            ["node", "--no-deprecation", SERVER_MAIN],
+            cwd=ROOT,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=self._stderr,
+        )
+
+    def wait_healthy(self):
+        """Esperar a que la página principal responda 200"""
+        deadline = time.monotonic() + self.startup_timeout
+        last_error = None
+        while time.monotonic() < deadline:
+            if self._process is not None and self._process.poll() is not None:
+                self._stderr.seek(0)
+                stderr = self._stderr.read().decode(errors="replace")
+                raise RuntimeError(f"El servidor SSR terminó al arrancar (código {self._process.returncode}):\n{stderr}")
+            try:
+                with urllib.request.urlopen(self.url + "/", timeout=2) as response:
+                    if response.status == 200:
+                        return
+            except (urllib.error.URLError, OSError) as e:
+                last_error = e
+            time.sleep(0.05)
+        raise TimeoutError(f"El servidor local no respondió en {self.startup_timeout}s: {last_error}")
+
+    def stop(self):
+        """Detener el servidor"""
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+        if self._process is not None:
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+            self._process = None
+        if self._stderr is not None:
+            self._stderr.close()
+            self._stderr = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
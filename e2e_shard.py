@@ -0,0 +1,232 @@
+"""
+Reparto de los tests E2E de Bright Bogotá entre varios nodos de CI
+Particiona la suite por duración histórica (--shard i/N) y fusiona los resultados JSON de cada shard
+
+    python e2e_shard.py run --shards 3 --local-server static -- --profile headless --repeat 2
+    python e2e_shard.py merge shard-*.json --json resultados.json --update-durations
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+from e2e_results import ResultsReport, TestResult
+from e2e_runner import print_summary
+from e2e_schedule import chains
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DURATIONS = os.path.join(ROOT, "e2e_durations.json")
+
+
+def parse_shard(value):
+    """``"i/N"`` -> (i, N) con 1 <= i <= N (para argparse)"""
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Shard inválido '{value}': se espera i/N, p. ej. 2/4")
+    if not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"Shard inválido '{value}': i debe estar entre 1 y N")
+    return index, count
+
+
+def load_durations(path=DEFAULT_DURATIONS):
+    """Duración media por test ({método: segundos}); vacío si no hay fichero"""
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def shard_iterations(specs, repeat, index, count, durations=None):
+    """Iteraciones y tests que le tocan al shard ``index`` de ``count``: [(iteración, specs)].
+
+    Las unidades de reparto son las cadenas de ``e2e_schedule.chains`` (un
+    test y sus dependientes no se separan) de cada iteración. Se asignan de
+    mayor a menor duración histórica al shard menos cargado (LPT); los tests
+    sin historial cuentan como la mediana de los conocidos. El reparto solo
+    depende de ``specs``, ``repeat`` y ``durations``, así que todos los nodos
+    calculan el mismo sin comunicarse si comparten el fichero de duraciones.
+    """
+    durations = durations or {}
+    default = statistics.median(durations.values()) if durations else 1.0
+    units = []
+    for chain in chains(specs):
+        weight = sum(durations.get(spec.method, default) for spec in chain)
+        for iteration in range(1, repeat + 1):
+            units.append((weight, chain[0].method, iteration, chain))
+    units.sort(key=lambda unit: (-unit[0], unit[1], unit[2]))
+
+    loads = [0.0] * count
+    assigned = [[] for _ in range(count)]
+    for weight, _, iteration, chain in units:
+        shard = min(range(count), key=lambda position: (loads[position], position))
+        loads[shard] += weight
+        assigned[shard].append((iteration, chain))
+
+    mine = assigned[index - 1]
+    order = {spec.method: position for position, spec in enumerate(specs)}
+    iterations = []
+    for iteration in sorted({iteration for iteration, _ in mine}):
+        selected = [spec for it, chain in mine if it == iteration for spec in chain]
+        iterations.append((iteration, sorted(selected, key=lambda spec: order[spec.method])))
+    print(f"[SHARD] {index}/{count}: {sum(len(s) for _, s in iterations)} tests en {len(iterations)} "
+          f"iteraciones, ~{loads[index - 1]:.1f}s estimados (reparto: "
+          + ", ".join(f"{load:.1f}s" for load in loads) + ")")
+    return iterations
+
+
+def load_report(paths):
+    """ResultsReport con los resultados de todos los JSON de shard.
+
+    Un mismo test e iteración en varios shards (las comprobaciones de humo
+    fallidas, que guarda cada nodo) cuenta una sola vez; si alguna copia
+    falló, se conserva la que falló.
+    """
+    data = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            data.append(json.load(f))
+    context = dict(data[0].get("context", {})) if data else {}
+    context.pop("shard", None)
+    context["shards"] = len(data)
+    report = ResultsReport(suite=data[0]["suite"] if data else "TestBrightBogota", **context)
+    starts = []
+    unique = {}
+    for shard in data:
+        started = datetime.fromisoformat(shard["started"]).timestamp()
+        starts.append((started, started + shard["duration"]))
+        for result in map(TestResult.from_dict, shard["tests"]):
+            key = (result.iteration, result.test)
+            if key not in unique or (unique[key].passed and not result.passed):
+                unique[key] = result
+    report.extend(unique.values())
+    if starts:
+        report.started = min(start for start, _ in starts)
+        report.finished = max(end for _, end in starts)
+    report.results.sort(key=lambda result: (result.iteration, result.test))
+    return report
+
+
+def update_durations(report, path=DEFAULT_DURATIONS):
+    """Guardar la duración media de los tests que pasaron, mezclada con la anterior"""
+    durations = load_durations(path)
+    samples = {}
+    for result in report.results:
+        if result.passed and not result.skipped:
+            samples.setdefault(result.test, []).append(result.duration)
+    for test, values in samples.items():
+        current = statistics.fmean(values)
+        previous = durations.get(test)
+        durations[test] = round(current if previous is None else (previous + current) / 2, 3)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(durations, f, indent=2, sort_keys=True)
+    print(f"[SHARD] Duraciones de {len(samples)} tests guardadas en {path}")
+
+
+def merge(paths, json_path=None, junit_path=None, durations_path=None):
+    """Fusionar los JSON de shard, imprimir el resumen y devolver el código de salida"""
+    report = load_report(paths)
+    print(f"\n[SHARD] {len(paths)} shards, {len(report.results)} resultados")
+    iterations = sorted({result.iteration for result in report.results})
+    for iteration in iterations:
+        if len(iterations) > 1:
+            print(f"\n[SHARD] Iteración {iteration}")
+        print_summary([result for result in report.results if result.iteration == iteration])
+    report.report_slowest_steps()
+    if json_path:
+        report.write_json(json_path)
+    if junit_path:
+        report.write_junit(junit_path)
+    if durations_path:
+        update_durations(report, durations_path)
+    return 1 if report.failed else 0
+
+
+def _stream(process, prefix):
+    for line in process.stdout:
+        sys.stdout.write(f"{prefix} {line}")
+        sys.stdout.flush()
+
+
+def run(shards, runner_args, local_server=None, python=sys.executable):
+    """Lanzar ``shards`` procesos de test_e2e.py (uno por shard) y fusionar sus resultados.
+
+    Con ``local_server`` se arranca un único servidor del sitio que comparten
+    todos los shards, como lo harían varios nodos contra un mismo entorno.
+    """
+    from e2e_server import LocalSiteServer
+
+    server = LocalSiteServer(local_server) if local_server else None
+    directory = tempfile.mkdtemp(prefix="e2e-shards-")
+    started = time.perf_counter()
+    try:
+        base_url = server.start().url if server else None
+        processes = []
+        for index in range(1, shards + 1):
+            command = [python, "-u", os.path.join(ROOT, "test_e2e.py"), "--shard", f"{index}/{shards}",
+                       "--json", os.path.join(directory, f"shard-{index}.json"), *runner_args]
+            if base_url:
+                command += ["--base-url", base_url]
+            process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+                                       encoding="utf-8", errors="replace", cwd=ROOT)
+            thread = threading.Thread(target=_stream, args=(process, f"[{index}/{shards}]"), daemon=True)
+            thread.start()
+            processes.append((index, process, thread))
+        codes = {}
+        for index, process, thread in processes:
+            codes[index] = process.wait()
+            thread.join()
+        print(f"\n[SHARD] Shards terminados en {time.perf_counter() - started:.2f}s: "
+              + ", ".join(f"{index}/{shards}→{code}" for index, code in sorted(codes.items())))
+        paths = [os.path.join(directory, f"shard-{index}.json") for index in sorted(codes)]
+        missing = [path for path in paths if not os.path.exists(path)]
+        if missing:
+            print(f"[SHARD] ✗ Faltan resultados de {len(missing)} shards")
+            if len(missing) == len(paths):
+                return 2
+        code = merge([path for path in paths if path not in missing])
+        # Un shard sin resultados o que terminó con error fatal invalida la ejecución
+        if missing or any(shard_code not in (0, 1) for shard_code in codes.values()):
+            return 2
+        return code
+    finally:
+        if server:
+            server.stop()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Coordinador de shards de los tests E2E de Bright Bogotá")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Ejecutar los shards en local como subprocesos y fusionarlos")
+    run_parser.add_argument("--shards", type=int, required=True, help="Número de shards")
+    run_parser.add_argument("--local-server", choices=("static", "ssr"),
+                            help="Servidor local compartido por todos los shards")
+    run_parser.add_argument("runner_args", nargs=argparse.REMAINDER,
+                            help="Opciones para test_e2e.py (tras --)")
+
+    merge_parser = commands.add_parser("merge", help="Fusionar los JSON de cada shard")
+    merge_parser.add_argument("paths", nargs="+", metavar="SHARD.json")
+    merge_parser.add_argument("--json", metavar="FICHERO", help="Escribir los resultados fusionados en JSON")
+    merge_parser.add_argument("--junit", metavar="FICHERO", help="Escribir los resultados fusionados en JUnit XML")
+    merge_parser.add_argument("--update-durations", metavar="FICHERO", nargs="?", const=DEFAULT_DURATIONS,
+                              help="Actualizar las duraciones históricas con las de esta ejecución "
+                                   f"(por defecto {os.path.basename(DEFAULT_DURATIONS)})")
+    args = parser.parse_args(argv)
+    if args.command == "run" and args.runner_args[:1] == ["--"]:
+        args.runner_args = args.runner_args[1:]
+    return args
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.command == "run":
+        sys.exit(run(args.shards, args.runner_args, args.local_server))
+    sys.exit(merge(args.paths, args.json, args.junit, args.update_durations))
@@ -0,0 +1,264 @@
+"""
+Nivel de humo HTTP para los tests E2E de Bright Bogotá (sin navegador)
+Comprueba el HTML renderizado en servidor con conexiones keep-alive reutilizadas y peticiones concurrentes
+"""
+
+import http.client
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlsplit
+
+from e2e_results import TestResult
+
+VOID_ELEMENTS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta",
+                 "source", "track", "wbr"}
+
+
+class ConnectionPool:
+    """Conexiones HTTP/1.1 keep-alive por origen, reutilizadas entre peticiones e hilos"""
+
+    def __init__(self, timeout=10, size=8):
+        self.timeout = timeout
+        self.size = size
+        self.opened = 0
+        self.requests = 0
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def _queue(self, origin):
+        with self._lock:
+            return self._idle.setdefault(origin, queue.LifoQueue())
+
+    def _connect(self, scheme, netloc):
+        with self._lock:
+            self.opened += 1
+        if scheme == "https":
+            return http.client.HTTPSConnection(netloc, timeout=self.timeout)
+        return http.client.HTTPConnection(netloc, timeout=self.timeout)
+
+    def get(self, url):
+        """GET ``url`` y devolver (status, cabeceras, cuerpo).
+
+        Si la petición falla (el servidor cerró la conexión, timeout, error de
+        red), la conexión se cierra y no vuelve al pool, y se reintenta una vez
+        con una conexión nueva.
+        """
+        parts = urlsplit(url)
+        origin = (parts.scheme, parts.netloc)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        idle = self._queue(origin)
+        for attempt in range(2):
+            connection = None
+            if not attempt:
+                try:
+                    connection = idle.get_nowait()
+                except queue.Empty:
+                    pass
+            if connection is None:
+                connection = self._connect(*origin)
+            try:
+                connection.request("GET", path, headers={"Accept-Encoding": "identity"})
+                response = connection.getresponse()
+                body = response.read()
+            except (http.client.HTTPException, OSError):
+                connection.close()
+                if attempt:
+                    raise
+                continue
+            with self._lock:
+                self.requests += 1
+            if response.will_close or idle.qsize() >= self.size:
+                connection.close()
+            else:
+                idle.put(connection)
+            return response.status, dict(response.getheaders()), body
+
+    def close(self):
+        with self._lock:
+            queues = list(self._idle.values())
+            self._idle.clear()
+        for idle in queues:
+            while not idle.empty():
+                idle.get_nowait().close()
+
+
+@dataclass
+class Element:
+    """Elemento con id del HTML servido"""
+    tag: str
+    attrs: dict
+    text: str = ""
+    links: tuple = ()
+
+
+class _IdIndex(HTMLParser):
+    """Indexa los elementos con id: etiqueta, atributos, texto y textos de sus <a>"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.elements = {}
+        self.assets = []
+        self._stack = []
+        self._texts = {}
+        self._links = {}
+        self._link_text = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "script" and attrs.get("src"):
+            self.assets.append(attrs["src"])
+        elif tag == "link" and "stylesheet" in (attrs.get("rel") or "") and attrs.get("href"):
+            self.assets.append(attrs["href"])
+        element_id = attrs.get("id")
+        if element_id and element_id not in self.elements:
+            self.elements[element_id] = Element(tag, attrs)
+            self._texts[element_id] = []
+            self._links[element_id] = []
+        if tag == "a":
+            self._link_text = []
+        if tag not in VOID_ELEMENTS:
+            self._stack.append((tag, element_id))
+
+    def handle_endtag(self, tag):
+        if tag == "a" and self._link_text is not None:
+            text = " ".join("".join(self._link_text).split())
+            for _, element_id in self._stack:
+                if element_id in self._links:
+                    self._links[element_id].append(text)
+            self._link_text = None
+        # Cerrar también las etiquetas que quedaron abiertas dentro (HTML mal anidado)
+        for index in range(len(self._stack) - 1, -1, -1):
+            if self._stack[index][0] == tag:
+                del self._stack[index:]
+                break
+
+    def handle_data(self, data):
+        if self._link_text is not None:
+            self._link_text.append(data)
+        for _, element_id in self._stack:
+            if element_id in self._texts:
+                self._texts[element_id].append(data)
+
+    def close(self):
+        super().close()
+        for element_id, element in self.elements.items():
+            element.text = " ".join("".join(self._texts[element_id]).split())
+            element.links = tuple(self._links[element_id])
+
+
+@dataclass
+class Page:
+    """Respuesta de la página principal ya indexada"""
+    url: str
+    status: int
+    elements: dict
+    assets: dict
+
+    def element(self, element_id):
+        element = self.elements.get(element_id)
+        assert element is not None, (
+            f"#{element_id} no está en el HTML servido"
+            + ("" if self.elements else " (la página no está renderizada en servidor; usa --local-server ssr)")
+        )
+        return element
+
+
+def fetch_page(pool, url, workers=8):
+    """Descargar la página, indexarla y comprobar en paralelo los recursos propios que referencia"""
+    status, _, body = pool.get(url)
+    index = _IdIndex()
+    index.feed(body.decode("utf-8", errors="replace"))
+    index.close()
+
+    origin = urlsplit(url).netloc
+    assets = [urljoin(url, src) for src in index.assets]
+    logo = index.elements.get("site-logo")
+    if logo and logo.attrs.get("src"):
+        assets.append(urljoin(url, logo.attrs["src"]))
+    assets = [asset for asset in dict.fromkeys(assets) if urlsplit(asset).netloc == origin]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="smoke") as executor:
+        statuses = dict(zip(assets, (result[0] for result in executor.map(pool.get, assets))))
+    return Page(url, status, index.elements, statuses)
+
+
+def check_home(page):
+    assert page.status == 200, f"La página respondió {page.status}"
+    broken = {asset: status for asset, status in page.assets.items() if status != 200}
+    assert not broken, f"Recursos con error: {broken}"
+    page.element("header-component")
+    page.element("site-logo")
+
+
+def check_top_banner(page):
+    page.element("top-banner")
+
+
+def check_main_menu(page):
+    menu_texts = page.element("main-menu").links
+    assert len(menu_texts) > 0, "El menú debería tener items"
+    for expected in ["Catálogo", "Acerca de", "Contacto"]:
+        assert expected in menu_texts, f"'{expected}' debería estar en el menú"
+
+
+def check_product_details(page):
+    page.element("product-details")
+    assert "Stiletto" in page.element("product-title").text, "El título debería contener 'Stiletto'"
+    assert "SKU" in page.element("product-sku").text, "Debería mostrar el SKU"
+    assert len(page.element("product-description").text) > 0, "Debería tener descripción"
+
+
+@dataclass(frozen=True)
+class SmokeCheck:
+    """Comprobación HTTP que sustituye a un test de Selenium (``covers``)"""
+    label: str
+    covers: str
+    check: object
+
+
+SMOKE_CHECKS = [
+    SmokeCheck("Carga de página (HTTP)", "test_homepage_loads", check_home),
+    SmokeCheck("Banner superior (HTTP)", "test_top_banner_display", check_top_banner),
+    SmokeCheck("Menú principal (HTTP)", "test_main_menu_desktop", check_main_menu),
+    SmokeCheck("Detalles del producto (HTTP)", "test_product_details_display", check_product_details),
+]
+
+
+def run_smoke(base_url, checks=SMOKE_CHECKS, pool=None):
+    """Ejecutar las comprobaciones de humo y devolver sus TestResult"""
+    own_pool = pool is None
+    pool = ConnectionPool() if own_pool else pool
+    started = time.perf_counter()
+    print(f"[SMOKE] GET {base_url}")
+    try:
+        page = fetch_page(pool, base_url)
+        fetch_error = None
+    except Exception as e:
+        page, fetch_error = None, e
+    fetched = time.perf_counter() - started
+
+    results = []
+    for check in checks:
+        result = TestResult(check.label, check.covers, False)
+        check_started = time.perf_counter()
+        try:
+            if fetch_error is not None:
+                raise fetch_error
+            check.check(page)
+            result.passed = True
+        except Exception as e:
+            result.set_error(e)
+        result.duration = time.perf_counter() - check_started
+        result.steps = {"navigation": round(fetched, 4)}
+        results.append(result)
+
+    print(f"[SMOKE] {len(checks)} comprobaciones en {time.perf_counter() - started:.3f}s "
+          f"({pool.requests} peticiones, {pool.opened} conexiones)")
+    if own_pool:
+        pool.close()
+    return results
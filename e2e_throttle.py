@@ -0,0 +1,264 @@
+"""
+Matriz de rendimiento con red y CPU limitadas para los tests E2E de Bright Bogotá
+Repite recorridos seleccionados en cada celda viewport × red × CPU emulando la red y la CPU por CDP
+"""
+
+import argparse
+import dataclasses
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from e2e_metrics import PerformanceRecorder
+from e2e_runner import _ThreadOutput
+
+# Perfiles de red para Network.emulateNetworkConditions (latencia en ms, caudal en bytes/s),
+# con los valores de los perfiles de DevTools/Lighthouse
+NETWORKS = {
+    "none": None,
+    "4g": {"latency": 150, "downloadThroughput": 1.6 * 1024 * 1024 / 8,
+           "uploadThroughput": 750 * 1024 / 8, "connectionType": "cellular4g"},
+    "3g": {"latency": 300, "downloadThroughput": 750 * 1024 / 8,
+           "uploadThroughput": 250 * 1024 / 8, "connectionType": "cellular3g"},
+    # Sin conexión al empezar; el recorrido se mide tras recuperar la red con RECOVERY_NETWORK
+    "offline-recovery": {"offline": True, "latency": 0, "downloadThroughput": 0, "uploadThroughput": 0,
+                         "connectionType": "none"},
+}
+RECOVERY_NETWORK = "4g"
+
+NO_THROTTLING = {"offline": False, "latency": 0, "downloadThroughput": -1, "uploadThroughput": -1}
+
+VIEWPORTS = {
+    "mobile": (375, 667),
+    "tablet": (768, 1024),
+    "desktop": (1024, 768),
+}
+
+# Métricas de cada celda en el resumen (clave, etiqueta); todas en ms
+CELL_METRICS = (
+    ("ttfb", "TTFB"),
+    ("first_contentful_paint", "FCP"),
+    ("lcp", "LCP"),
+    ("load", "load"),
+    ("click_to_slide_change", "clic→slide"),
+    ("click_to_cart_update", "clic→carrito"),
+)
+
+
+@dataclass(frozen=True)
+class Cell:
+    """Celda de la matriz: un recorrido en un viewport, perfil de red y factor de CPU"""
+    flow: str
+    viewport: str
+    network: str
+    cpu: float
+
+    @property
+    def label(self):
+        return f"{self.viewport}/{self.network}/cpu{self.cpu:g}x"
+
+
+@dataclass
+class CellResult:
+    """Una ejecución de una celda"""
+    cell: Cell
+    passed: bool
+    duration: float
+    metrics: dict
+    error: str = None
+    recovered: float = None
+
+
+def emulate(driver, network, cpu):
+    """Aplicar el perfil de red y el factor de CPU a la pestaña de la sesión"""
+    driver.execute_cdp_cmd("Network.enable", {})
+    # Sin caché HTTP, como la primera visita de un comprador
+    driver.execute_cdp_cmd("Network.setCacheDisabled", {"cacheDisabled": True})
+    driver.execute_cdp_cmd("Network.emulateNetworkConditions", {**NO_THROTTLING, **(NETWORKS[network] or {})})
+    driver.execute_cdp_cmd("Emulation.setCPUThrottlingRate", {"rate": cpu})
+
+
+def restore(driver):
+    """Quitar la emulación antes de devolver la sesión al pool"""
+    driver.execute_cdp_cmd("Network.emulateNetworkConditions", NO_THROTTLING)
+    driver.execute_cdp_cmd("Network.setCacheDisabled", {"cacheDisabled": False})
+    driver.execute_cdp_cmd("Emulation.setCPUThrottlingRate", {"rate": 1})
+
+
+class ThrottleMatrix:
+    """Ejecuta ``flows`` en cada celda viewport × red × CPU sobre el pool de sesiones.
+
+    ``flows`` es {nombre: pasos (TestSpec)}; los pasos se ejecutan en orden con
+    el viewport de la celda, sobre una sesión reiniciada y sin caché, con la
+    red y la CPU emuladas por CDP. Las celdas van en paralelo, hasta
+    ``workers`` a la vez; como la CPU emulada es relativa a la del host,
+    conviene no pasar del número de núcleos. Las métricas de cada celda se
+    guardan también en ``metrics`` con la celda como viewport y en ``cell``,
+    que los presupuestos usan para no compararlas con las de la suite normal.
+    """
+
+    def __init__(self, suite_factory, pool, flows, viewports=("mobile", "desktop"), networks=("4g", "3g"),
+                 cpus=(1, 4), workers=1, repeat=1, metrics=None):
+        self.suite_factory = suite_factory
+        self.pool = pool
+        self.flows = flows
+        self.cells = [
+            Cell(flow, viewport, network, float(cpu))
+            for flow in flows for viewport in viewports for network in networks for cpu in cpus
+        ]
+        self.workers = max(1, workers)
+        self.repeat = max(1, repeat)
+        self.metrics = metrics
+        self.results = []
+        self._lock = threading.Lock()
+
+    def _run_flow(self, suite, cell):
+        """Pasos del recorrido en el viewport de la celda: (error del primero que falla, duraciones)"""
+        viewport = VIEWPORTS[cell.viewport]
+        durations = []
+        for position, spec in enumerate(self.flows[cell.flow]):
+            result = suite.run_test(dataclasses.replace(spec, viewport=viewport), isolated=position == 0)
+            durations.append(result.duration)
+            if not result.passed:
+                return f"{spec.label}: {result.error or 'el test devolvió False'}", durations
+        return None, durations
+
+    def _run_cell(self, cell):
+        recorder = PerformanceRecorder()
+        started = time.perf_counter()
+        try:
+            session = self.pool.acquire()
+        except Exception as e:
+            return self._record(cell, recorder, f"(sesión) {type(e).__name__}: {e}", time.perf_counter() - started)
+        restored = False
+        recovered = None
+        self._output.capture()
+        try:
+            suite = self.suite_factory(session.driver, metrics=recorder)
+            emulate(session.driver, cell.network, cell.cpu)
+            if cell.network == "offline-recovery":
+                self._go_offline(suite)
+                emulate(session.driver, RECOVERY_NETWORK, cell.cpu)
+                started = time.perf_counter()
+            error, durations = self._run_flow(suite, cell)
+            if cell.network == "offline-recovery" and durations and error is None:
+                # Desde que vuelve la red hasta que la primera página está lista
+                recovered = durations[0]
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        finally:
+            duration = time.perf_counter() - started
+            self._output.release()
+            try:
+                restore(session.driver)
+                restored = True
+            except Exception as e:
+                print(f"[MATRIX] ⚠ No se pudo quitar la emulación de la sesión {session.id}: {e}")
+            # Una sesión que sigue limitada no vuelve al pool
+            if restored:
+                self.pool.release(session)
+            else:
+                self.pool.evict(session)
+        return self._record(cell, recorder, error, duration, recovered)
+
+    def _record(self, cell, recorder, error, duration, recovered=None):
+        values = {}
+        for sample in recorder.samples:
+            for key, _ in CELL_METRICS:
+                if sample.get(key) is not None:
+                    values.setdefault(key, sample[key])
+        result = CellResult(cell, error is None, duration, values, error, recovered)
+        with self._lock:
+            self.results.append(result)
+            if self.metrics is not None:
+                self.metrics.extend([
+                    {**sample, "viewport": cell.label, "cell": cell.label, "flow": cell.flow}
+                    for sample in recorder.samples
+                ])
+            status = "✓" if result.passed else "✗"
+            print(f"[MATRIX] {status} {cell.flow} @ {cell.label}: {duration:.2f}s" + (f" ({error})" if error else ""))
+        return result
+
+    def _go_offline(self, suite):
+        """Intentar cargar el sitio sin conexión: el recorrido empieza desde la página de error"""
+        try:
+            suite.navigate("/")
+        except Exception:
+            # ChromeDriver puede devolver el error de red de la navegación
+            pass
+        if suite.driver.execute_script("return navigator.onLine"):
+            print("[MATRIX] ⚠ El navegador no se considera sin conexión con la red emulada")
+
+    def run(self):
+        """Ejecutar todas las celdas (``repeat`` veces cada una) y esperar a que terminen"""
+        cells = [cell for _ in range(self.repeat) for cell in self.cells]
+        viewports = sorted({cell.viewport for cell in self.cells})
+        networks = sorted({cell.network for cell in self.cells})
+        cpus = sorted({cell.cpu for cell in self.cells})
+        print(f"[MATRIX] {len(self.flows)} recorridos × {len(viewports)} viewports × {len(networks)} redes × "
+              f"{len(cpus)} CPU = {len(self.cells)} celdas" + (f" × {self.repeat}" if self.repeat > 1 else "")
+              + f", {self.workers} en paralelo")
+        # La salida de los tests de cada celda se descarta; solo queda la línea de [MATRIX]
+        self._output = _ThreadOutput(sys.stdout)
+        original_stdout = sys.stdout
+        sys.stdout = self._output
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                list(executor.map(self._run_cell, cells))
+        finally:
+            sys.stdout = original_stdout
+        return self
+
+    @property
+    def failed(self):
+        return [result for result in self.results if not result.passed]
+
+    def report(self):
+        """Mediana de duración y métricas por recorrido y celda"""
+        if not self.results:
+            return
+        print("\n" + "-" * 60)
+        print("MATRIZ DE RED Y CPU (mediana)")
+        print("-" * 60)
+        groups = {}
+        for result in self.results:
+            groups.setdefault(result.cell, []).append(result)
+        for flow in self.flows:
+            cells = [cell for cell in self.cells if cell.flow == flow]
+            if not any(cell in groups for cell in cells):
+                continue
+            print(f"\n{flow}:")
+            for cell in cells:
+                results = groups.get(cell, [])
+                passed = [result for result in results if result.passed]
+                parts = [f"{len(passed)}/{len(results)} OK"]
+                if passed:
+                    parts.append(f"recorrido {statistics.median(r.duration for r in passed):.2f}s")
+                for key, label in CELL_METRICS:
+                    data = [r.metrics[key] for r in passed if key in r.metrics]
+                    if data:
+                        parts.append(f"{label} {statistics.median(data):.0f}ms")
+                recovered = [r.recovered for r in passed if r.recovered is not None]
+                if recovered:
+                    parts.append(f"recuperación {statistics.median(recovered):.2f}s")
+                print(f"  {cell.label:<32}" + ", ".join(parts))
+        for result in self.failed:
+            print(f"✗ {result.cell.flow} @ {result.cell.label}: {result.error}")
+
+
+def parse_list(choices=None, cast=str):
+    """Tipo de argparse para listas separadas por comas (p. ej. ``--matrix-networks 3g,4g``)"""
+    def parse(value):
+        try:
+            items = tuple(cast(item.strip()) for item in value.split(",") if item.strip())
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"Lista inválida '{value}'")
+        unknown = [item for item in items if choices is not None and item not in choices]
+        if unknown or not items:
+            options = f" (opciones: {', '.join(choices)})" if choices else ""
+            raise argparse.ArgumentTypeError(f"Lista inválida '{value}'{options}")
+        return items
+    return parse
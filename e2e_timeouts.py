@@ -0,0 +1,81 @@
+"""
+Timeouts adaptativos para las esperas de los tests E2E de Bright Bogotá
+Ajusta el límite de cada condición según lo que tardó en ejecuciones anteriores
+"""
+
+import json
+import os
+import threading
+
+from e2e_profiler import describe_condition, percentile
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_STORE = os.path.join(ROOT, ".e2e", "wait_latencies.json")
+
+
+class AdaptiveTimeouts:
+    """Historial de latencias por espera y timeout derivado de él.
+
+    Cada espera que termina bien guarda su duración bajo la clave
+    ``test | condición | nombre``, donde el nombre es el que da AppWaits (sin
+    valores de la ejecución, como el slide o el carrito anteriores) o, si no
+    lo hay, el mensaje. Con al menos ``min_samples`` muestras el
+    timeout de esa espera pasa a ser ``percentil * safety_factor``, acotado
+    entre ``floor`` y el timeout por defecto; sin historia se usa el timeout
+    por defecto. Las esperas que agotan el tiempo no se guardan, para que un
+    fallo no alargue los timeouts siguientes.
+    """
+
+    def __init__(self, path=DEFAULT_STORE, fraction=0.99, safety_factor=3.0, floor=1.0,
+                 min_samples=5, window=50):
+        self.path = path
+        self.fraction = fraction
+        self.safety_factor = safety_factor
+        self.floor = floor
+        self.min_samples = min_samples
+        self.window = window
+        self.adapted = 0
+        self.data = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    self.data = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"[TIMEOUTS] ⚠ No se pudo leer {path} ({e}); se empieza sin historial")
+
+    @staticmethod
+    def key(test, method, name=""):
+        parts = [test or "-", describe_condition(method, name)]
+        if name and name not in parts:
+            parts.append(name)
+        return " | ".join(parts)
+
+    def timeout(self, key, default):
+        """Timeout para la espera ``key`` (``default`` si aún no hay historia suficiente)"""
+        with self._lock:
+            history = list(self.data.get(key, ()))
+        if len(history) < self.min_samples:
+            return default
+        adapted = min(default, max(self.floor, percentile(history, self.fraction) * self.safety_factor))
+        if adapted < default:
+            with self._lock:
+                self.adapted += 1
+        return adapted
+
+    def record(self, key, elapsed):
+        with self._lock:
+            values = self.data.setdefault(key, [])
+            values.append(round(elapsed, 4))
+            del values[:-self.window]
+
+    def save(self):
+        with self._lock:
+            data = {key: list(values) for key, values in self.data.items()}
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        # Fichero temporal y os.replace: una ejecución interrumpida no deja el historial a medias
+        temporary = f"{self.path}.{os.getpid()}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, sort_keys=True, ensure_ascii=False)
+        os.replace(temporary, self.path)
+        print(f"[TIMEOUTS] {len(data)} esperas con historial, {self.adapted} con timeout adaptado en esta ejecución")
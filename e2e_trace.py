@@ -0,0 +1,211 @@
+"""
+Trazas de fallo para los tests E2E de Bright Bogotá
+Guarda en memoria los últimos segundos de comandos, consola, red y estado del DOM de cada sesión y solo los escribe si un test falla
+"""
+
+import collections
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime
+
+from e2e_hooks import add_command_listener
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_TRACE_DIR = os.path.join(ROOT, ".e2e", "traces")
+
+# Registro dentro de la página (Page.addScriptToEvaluateOnNewDocument): consola, errores,
+# recursos de red y un resumen periódico del DOM, en un buffer acotado que sobrevive a
+# las navegaciones dentro del sitio a través de sessionStorage
+TRACE_JS = """
+(function () {
+  if (window.__e2eTrace) { return; }
+  var KEY = '__e2eTrace', WINDOW = %(window)d, INTERVAL = %(interval)d;
+  var trace = window.__e2eTrace = { events: [], max: %(max_events)d };
+  function push(kind, data) {
+    trace.events.push({ t: Date.now(), kind: kind, data: data });
+    if (trace.events.length > trace.max) { trace.events.splice(0, trace.events.length - trace.max); }
+  }
+  function text(value) {
+    try { return typeof value === 'string' ? value : JSON.stringify(value); } catch (e) { return String(value); }
+  }
+  function describe(el) {
+    if (!el || el === document.body || el === document.documentElement) { return null; }
+    var classes = typeof el.className === 'string' && el.className.trim() ? '.' + el.className.trim().split(/\\s+/).join('.') : '';
+    return el.tagName.toLowerCase() + (el.id ? '#' + el.id : '') + classes;
+  }
+  try {
+    var saved = JSON.parse(sessionStorage.getItem(KEY) || '[]');
+    sessionStorage.removeItem(KEY);
+    trace.events = saved.filter(function (event) { return event.t > Date.now() - WINDOW; });
+  } catch (e) {}
+  ['log', 'info', 'warn', 'error', 'debug'].forEach(function (level) {
+    var original = console[level];
+    console[level] = function () {
+      push('console', { level: level, text: Array.prototype.map.call(arguments, text).join(' ').slice(0, 500) });
+      return original.apply(console, arguments);
+    };
+  });
+  window.addEventListener('error', function (event) {
+    push('error', { message: event.message, source: event.filename, line: event.lineno });
+  });
+  window.addEventListener('unhandledrejection', function (event) {
+    push('error', { message: 'Promesa rechazada sin manejar: ' + text(event.reason).slice(0, 500) });
+  });
+  try {
+    new PerformanceObserver(function (list) {
+      list.getEntries().forEach(function (entry) {
+        push('network', { url: entry.name, type: entry.initiatorType, duration: Math.round(entry.duration),
+                          size: entry.transferSize, status: entry.responseStatus });
+      });
+    }).observe({ type: 'resource', buffered: true });
+  } catch (e) {}
+  // Resumen barato del estado: nada de serializar el documento entero
+  function snapshot() {
+    push('dom', {
+      url: location.href, title: document.title, ready: document.readyState,
+      scroll: [window.scrollX, window.scrollY], viewport: [window.innerWidth, window.innerHeight],
+      nodes: document.getElementsByTagName('*').length, active: describe(document.activeElement),
+      open: Array.prototype.map.call(document.querySelectorAll('.open, .open-menu'), describe)
+    });
+  }
+  document.addEventListener('DOMContentLoaded', snapshot);
+  setInterval(snapshot, INTERVAL);
+  window.addEventListener('pagehide', function () {
+    try { sessionStorage.setItem(KEY, JSON.stringify(trace.events)); } catch (e) {}
+  });
+})();
+"""
+
+COLLECT_JS = "return window.__e2eTrace ? window.__e2eTrace.events : [];"
+
+# Comandos cuyo resultado no se guarda (capturas y código de la página: grandes y poco útiles)
+OPAQUE_RESPONSES = ("screenshot", "elementScreenshot", "getPageSource")
+
+
+def _summary(value, limit=200):
+    """Versión corta y serializable de un parámetro o resultado de WebDriver"""
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, str):
+        return value if len(value) <= limit else value[:limit] + "…"
+    if isinstance(value, dict):
+        return {key: _summary(item, limit) for key, item in list(value.items())[:20]}
+    if isinstance(value, (list, tuple)):
+        return [_summary(item, limit) for item in value[:20]]
+    return type(value).__name__
+
+
+def _slug(text):
+    return re.sub(r"[^\w.-]+", "_", text).strip("_")
+
+
+class _Ring:
+    """Últimos ``seconds`` segundos de eventos de una sesión (como mucho ``maxlen``)"""
+
+    def __init__(self, seconds, maxlen):
+        self.seconds = seconds
+        self.events = collections.deque(maxlen=maxlen)
+
+    def add(self, kind, data):
+        now = time.time()
+        self.events.append((now, kind, data))
+        while self.events and self.events[0][0] < now - self.seconds:
+            self.events.popleft()
+
+
+class TraceRecorder:
+    """Traza continua por sesión que solo se escribe a disco cuando un test falla.
+
+    ``attach`` registra, una vez por sesión, un listener de comandos que
+    guarda cada comando de WebDriver en un buffer circular en memoria (en el
+    propio driver, así que desaparece con la sesión cuando el pool la
+    descarta o la cierra y una sesión nueva siempre se registra), y un
+    script que dentro de la página guarda consola, errores de JS, recursos de
+    red y un resumen del DOM cada ``snapshot_interval`` segundos. Mientras
+    los tests pasan no se manda ningún comando extra al navegador. ``flush``
+    reúne los últimos ``seconds`` segundos de ambos buffers, una captura de
+    pantalla y el HTML actual en ``directory/<test>-<hora>/``.
+    """
+
+    def __init__(self, directory=DEFAULT_TRACE_DIR, seconds=30.0, snapshot_interval=2.0, max_events=2000):
+        self.directory = directory
+        self.seconds = seconds
+        self.snapshot_interval = snapshot_interval
+        self.max_events = max_events
+        self.bundles = []
+        self._lock = threading.Lock()
+
+    def attach(self, driver):
+        """Empezar a registrar la sesión de ``driver`` (no hace nada si ya se registra)"""
+        if getattr(driver, "_e2e_trace", None) is not None:
+            return
+        ring = driver._e2e_trace = _Ring(self.seconds, self.max_events)
+
+        def on_command(command, params, response, elapsed, error):
+            value = None
+            if command not in OPAQUE_RESPONSES and isinstance(response, dict):
+                value = _summary(response.get("value"))
+            ring.add("command", {
+                "command": command, "params": _summary(params), "value": value,
+                "elapsed_ms": round(elapsed * 1000, 1), "error": None if error is None else str(error)[:500],
+            })
+
+        add_command_listener(driver, on_command)
+        script = TRACE_JS % {
+            "window": self.seconds * 1000, "interval": self.snapshot_interval * 1000, "max_events": self.max_events,
+        }
+        try:
+            driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": script})
+            driver.execute_script(script)
+        except Exception as e:
+            print(f"[TRACE] ⚠ No se pudo instalar el registro en la página: {e}")
+
+    def flush(self, driver, result):
+        """Escribir la traza del test fallido ``result``; devuelve el directorio o None"""
+        ring = getattr(driver, "_e2e_trace", None)
+        if ring is None:
+            return None
+        since = time.time() - self.seconds
+        events = [
+            {"time": timestamp, "kind": kind, "data": data}
+            for timestamp, kind, data in list(ring.events) if timestamp >= since
+        ]
+        name = _slug(result.test if result.iteration == 1 else f"{result.test}-{result.iteration}")
+        path = os.path.join(self.directory, f"{name}-{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}")
+        os.makedirs(path, exist_ok=True)
+        state = {}
+        try:
+            page_events = driver.execute_script(COLLECT_JS) or []
+            events += [
+                {"time": event["t"] / 1000, "kind": event["kind"], "data": event["data"]}
+                for event in page_events if event["t"] / 1000 >= since
+            ]
+            state = {"url": driver.current_url, "title": driver.title}
+            driver.save_screenshot(os.path.join(path, "screenshot.png"))
+            with open(os.path.join(path, "page.html"), "w", encoding="utf-8") as f:
+                f.write(driver.page_source)
+        except Exception as e:
+            # La sesión puede estar rota: se guarda lo que haya en memoria
+            state["error"] = f"No se pudo leer el estado del navegador: {e}"
+        events.sort(key=lambda event: event["time"])
+        bundle = {
+            "test": result.test,
+            "label": result.label,
+            "iteration": result.iteration,
+            "error": result.error,
+            "error_type": result.error_type,
+            "traceback": result.traceback,
+            "seconds": self.seconds,
+            "state": state,
+            "counts": dict(collections.Counter(event["kind"] for event in events)),
+            "events": events,
+        }
+        with open(os.path.join(path, "trace.json"), "w", encoding="utf-8") as f:
+            json.dump(bundle, f, indent=2, ensure_ascii=False, default=str)
+        with self._lock:
+            self.bundles.append(path)
+        print(f"[TRACE] Traza de {result.label} en {path}")
+        return path
@@ -0,0 +1,277 @@
+"""
+Regresión visual para los tests E2E de Bright Bogotá
+Captura regiones clave por viewport y las compara con líneas base PNG mediante un diff perceptual con NumPy
+"""
+
+import base64
+import io
+import math
+import os
+import re
+import threading
+from dataclasses import dataclass
+
+# NumPy y Pillow solo hacen falta en modo visual (opcionales); se importan en _require
+np = Image = None
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINES_DIR = os.path.join(ROOT, "visual-baselines")
+DEFAULT_DIFF_DIR = os.path.join(ROOT, ".e2e", "visual-diff")
+
+# Regiones que se capturan en cada viewport
+REGIONS = ("#header-component", "#slideshow-container", "#product-details", "#contact-form")
+
+# Zonas de cada región que no se comparan (contenido que cambia entre ejecuciones)
+MASKS = {
+    "#header-component": ("#header-search",),
+    "#contact-form": ("input", "textarea", "select"),
+}
+
+# Sin animaciones, transiciones ni cursor parpadeante mientras se captura
+FREEZE_CSS = """
+*, *::before, *::after {
+  animation: none !important;
+  transition: none !important;
+  caret-color: transparent !important;
+}
+"""
+
+FREEZE_JS = """
+var style = document.getElementById('__e2e-visual-freeze');
+if (!style) {
+  style = document.createElement('style');
+  style.id = '__e2e-visual-freeze';
+  style.textContent = arguments[0];
+  document.head.appendChild(style);
+}
+"""
+
+UNFREEZE_JS = "var style = document.getElementById('__e2e-visual-freeze'); if (style) { style.remove(); }"
+
+# Rectángulos (en píxeles CSS, coordenadas del documento) de cada región y de sus
+# máscaras, si las imágenes de la región terminaron de cargar y el devicePixelRatio
+RECTS_JS = """
+var regions = arguments[0], masks = arguments[1], result = {};
+function rect(el) {
+  var r = el.getBoundingClientRect();
+  return [r.left + window.scrollX, r.top + window.scrollY, r.width, r.height];
+}
+regions.forEach(function (selector) {
+  var el = document.querySelector(selector);
+  if (!el) { result[selector] = null; return; }
+  var masked = [];
+  (masks[selector] || []).forEach(function (maskSelector) {
+    el.querySelectorAll(maskSelector).forEach(function (child) { masked.push(rect(child)); });
+  });
+  var images = Array.prototype.every.call(el.querySelectorAll('img'), function (img) { return img.complete; });
+  result[selector] = { rect: rect(el), masks: masked, loaded: images };
+});
+return { dpr: window.devicePixelRatio || 1, regions: result };
+"""
+
+# Pesos YIQ del diff perceptual (pixelmatch); 35215 es la distancia máxima
+YIQ = ((0.29889531, 0.58662247, 0.11448223), (0.59597799, -0.27417610, -0.32180189),
+       (0.21147017, -0.52261711, 0.31114694))
+YIQ_WEIGHTS = (0.5053, 0.299, 0.1957)
+MAX_DELTA = 35215.0
+
+
+@dataclass
+class VisualResult:
+    """Comparación de una región con su línea base"""
+    region: str
+    viewport: str
+    status: str
+    changed: float = 0.0
+    diff_path: str = None
+
+    @property
+    def passed(self):
+        return self.status in ("match", "new", "updated")
+
+    def __str__(self):
+        if self.status == "mismatch":
+            return f"{self.region} @ {self.viewport}: {self.changed:.2%} de píxeles distintos (diff en {self.diff_path})"
+        if self.status == "size":
+            return f"{self.region} @ {self.viewport}: el tamaño cambió respecto a la línea base"
+        if self.status == "missing":
+            return f"{self.region} @ {self.viewport}: la región no existe en la página"
+        return f"{self.region} @ {self.viewport}: {self.status}"
+
+
+def _require():
+    """Importar numpy y Pillow la primera vez que se usan, no al arrancar el runner"""
+    global np, Image
+    if np is None:
+        try:
+            import numpy
+            from PIL import Image as image
+        except ImportError:
+            raise RuntimeError("El modo visual necesita numpy y Pillow: pip install numpy pillow")
+        np, Image = numpy, image
+
+
+def _yiq(pixels):
+    return pixels.astype(np.float32) @ np.asarray(YIQ, dtype=np.float32).T
+
+
+def changed_pixels(baseline, current, threshold, mask=None, shift=1):
+    """Píxeles de ``current`` cuya distancia perceptual (0..1) a ``baseline`` supera ``threshold``.
+
+    Para tolerar el antialiasing y desplazamientos de un píxel, un píxel solo
+    cuenta como distinto si también difiere de todo su vecindario de
+    ``shift`` píxeles en ``baseline``. El vecindario se mira únicamente en los
+    píxeles que ya difieren en su posición, que suelen ser pocos.
+    """
+    _require()
+    weights = np.asarray(YIQ_WEIGHTS, dtype=np.float32)
+    a = _yiq(baseline)
+    b = _yiq(current)
+    changed = ((a - b) ** 2) @ weights > threshold * MAX_DELTA
+    if mask is not None:
+        changed &= ~mask
+    ys, xs = np.nonzero(changed)
+    if not len(ys) or not shift:
+        return changed
+    height, width = changed.shape
+    candidates = b[ys, xs]
+    still = np.ones(len(ys), dtype=bool)
+    for dy in range(-shift, shift + 1):
+        for dx in range(-shift, shift + 1):
+            if dy == dx == 0:
+                continue
+            neighbours = a[np.clip(ys + dy, 0, height - 1), np.clip(xs + dx, 0, width - 1)]
+            still &= ((neighbours - candidates) ** 2) @ weights > threshold * MAX_DELTA
+    changed[ys[~still], xs[~still]] = False
+    return changed
+
+
+def diff_image(baseline, current, changed, mask):
+    """Imagen de diff: línea base atenuada, píxeles distintos en rojo y zonas ignoradas en azul"""
+    gray = (_yiq(baseline)[..., 0] * 0.3 + 255 * 0.7).clip(0, 255).astype(np.uint8)
+    image = np.repeat(gray[..., None], 3, axis=2)
+    image[mask] = (image[mask] * 0.6 + np.array((0, 0, 255)) * 0.4).astype(np.uint8)
+    image[changed] = (255, 0, 0)
+    return np.concatenate([baseline, image, current], axis=1)
+
+
+def _slug(text):
+    return re.sub(r"[^\w.-]+", "_", text).strip("_")
+
+
+class VisualChecker:
+    """Capturas de regiones comparadas con líneas base PNG en ``baselines``.
+
+    La línea base de cada región se guarda recortada a la región y como PNG
+    optimizado (``<perfil>/<viewport>/<región>.png``). Si no existe se crea y
+    la comparación pasa; con ``update=True`` se reescriben todas. Una región
+    no coincide cuando más de ``max_changed`` de sus píxeles (fuera de las
+    máscaras) superan la distancia perceptual ``threshold``; en ese caso se
+    escribe en ``diffs`` una imagen con línea base, diff y captura.
+    """
+
+    def __init__(self, profile, baselines=DEFAULT_BASELINES_DIR, diffs=DEFAULT_DIFF_DIR, update=False,
+                 threshold=0.1, max_changed=0.001, regions=REGIONS, masks=MASKS):
+        _require()
+        self.baselines = os.path.join(baselines, profile)
+        self.diffs = diffs
+        self.update = update
+        self.threshold = threshold
+        self.max_changed = max_changed
+        self.regions = regions
+        self.masks = masks
+        self.results = []
+        self._lock = threading.Lock()
+
+    def _baseline_path(self, viewport, region):
+        return os.path.join(self.baselines, viewport, _slug(region) + ".png")
+
+    def capture(self, driver):
+        """Capturar las regiones de la página actual: (devicePixelRatio, {región: (RGB, máscara) o None}).
+
+        El recorte se redondea a píxeles CSS enteros para que un tamaño con
+        decimales no dé capturas de distinto tamaño entre ejecuciones. La
+        captura sale a ``devicePixelRatio`` píxeles por píxel CSS, así que las
+        máscaras se escalan igual.
+        """
+        driver.execute_script(FREEZE_JS, FREEZE_CSS)
+        try:
+            data = driver.execute_script(RECTS_JS, list(self.regions), self.masks)
+            dpr = data["dpr"]
+            captures = {}
+            for region in self.regions:
+                info = data["regions"].get(region)
+                left, top, width, height = (round(value) for value in info["rect"]) if info else (0, 0, 0, 0)
+                if width < 1 or height < 1:
+                    captures[region] = None
+                    continue
+                if not info["loaded"]:
+                    print(f"[VISUAL] ⚠ {region}: hay imágenes sin cargar")
+                shot = driver.execute_cdp_cmd("Page.captureScreenshot", {
+                    "format": "png",
+                    "captureBeyondViewport": True,
+                    "clip": {"x": left, "y": top, "width": width, "height": height, "scale": 1},
+                })
+                pixels = np.asarray(Image.open(io.BytesIO(base64.b64decode(shot["data"]))).convert("RGB"))
+                mask = np.zeros(pixels.shape[:2], dtype=bool)
+                for mask_left, mask_top, mask_width, mask_height in info["masks"]:
+                    x0, y0 = math.floor((mask_left - left) * dpr), math.floor((mask_top - top) * dpr)
+                    x1 = math.ceil((mask_left + mask_width - left) * dpr)
+                    y1 = math.ceil((mask_top + mask_height - top) * dpr)
+                    mask[max(0, y0):max(0, y1), max(0, x0):max(0, x1)] = True
+                captures[region] = pixels, mask
+            return dpr, captures
+        finally:
+            driver.execute_script(UNFREEZE_JS)
+
+    def compare(self, viewport, region, pixels, mask):
+        """Comparar una captura con su línea base (creándola si no existe)"""
+        path = self._baseline_path(viewport, region)
+        if self.update or not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            Image.fromarray(pixels).save(path, optimize=True)
+            return VisualResult(region, viewport, "updated" if self.update else "new")
+        with Image.open(path) as stored:
+            baseline = np.asarray(stored.convert("RGB"))
+        if baseline.shape != pixels.shape:
+            return VisualResult(region, viewport, "size", 1.0)
+        if np.array_equal(baseline, pixels):
+            return VisualResult(region, viewport, "match")
+        changed = changed_pixels(baseline, pixels, self.threshold, mask)
+        ratio = float(changed.mean())
+        if ratio <= self.max_changed:
+            return VisualResult(region, viewport, "match", ratio)
+        diff_path = os.path.join(self.diffs, viewport, _slug(region) + ".png")
+        os.makedirs(os.path.dirname(diff_path), exist_ok=True)
+        Image.fromarray(diff_image(baseline, pixels, changed, mask)).save(diff_path)
+        return VisualResult(region, viewport, "mismatch", ratio, diff_path)
+
+    def check(self, driver, viewport):
+        """Capturar y comparar todas las regiones en el viewport actual; devuelve las que fallan"""
+        dpr, captures = self.capture(driver)
+        # Con otra densidad de píxeles la captura tiene otro tamaño: línea base aparte
+        if dpr != 1:
+            viewport = f"{viewport}@{dpr:g}x"
+        results = []
+        for region, capture in captures.items():
+            if capture is None:
+                results.append(VisualResult(region, viewport, "missing"))
+            else:
+                results.append(self.compare(viewport, region, *capture))
+        with self._lock:
+            self.results.extend(results)
+        for result in results:
+            print(f"[VISUAL] {'✓' if result.passed else '✗'} {result}")
+        return [result for result in results if not result.passed]
+
+    def report(self):
+        if not self.results:
+            return
+        failed = [result for result in self.results if not result.passed]
+        created = sum(1 for result in self.results if result.status in ("new", "updated"))
+        print("\n" + "-" * 60)
+        print("REGRESIÓN VISUAL")
+        print("-" * 60)
+        print(f"{len(self.results)} capturas, {len(failed)} distintas, {created} líneas base nuevas o actualizadas")
+        for result in failed:
+            print(f"✗ {result}")
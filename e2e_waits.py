@@ -0,0 +1,234 @@
+"""
+Capa de esperas basadas en condiciones para los tests E2E de Bright Bogotá
+Reemplaza los time.sleep fijos: cada espera termina en cuanto la condición se cumple
+"""
+
+import time
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+from e2e_dom import ANGULAR_STABLE_JS, CART_STATE_JS, SCROLL_POSITION_JS, SLIDE_INDEX_JS, VIEWPORT_JS, snapshot
+
+
+class _Stable:
+    """Condición que se cumple cuando ``probe`` devuelve el mismo valor dos veces seguidas"""
+
+    def __init__(self, probe):
+        self.probe = probe
+        self.last = object()
+
+    def __call__(self, driver):
+        value = self.probe(driver)
+        if value == self.last:
+            return value
+        self.last = value
+        return False
+
+
+class TimedWait(WebDriverWait):
+    """WebDriverWait que informa al StepTimer del tiempo pasado esperando.
+
+    Si se indica ``on_wait``, se llama al terminar cada ``until`` con
+    ``(method, name, elapsed, retries, error)``, donde ``retries`` es el
+    número de evaluaciones de la condición después de la primera. Si se indica
+    ``timeout_for``, ``timeout_for(method, name, timeout)`` decide el límite
+    de cada ``until`` a partir del límite por defecto. ``name`` es el nombre
+    estable de la espera si se indicó (sin valores de la ejecución, sirve de
+    clave de historial) y si no el mensaje.
+    """
+
+    def __init__(self, driver, timeout, poll_frequency=0.5, ignored_exceptions=None, timer=None, on_wait=None,
+                 timeout_for=None, name=None):
+        super().__init__(driver, timeout, poll_frequency, ignored_exceptions)
+        self.timer = timer
+        self.on_wait = on_wait
+        self.timeout_for = timeout_for
+        self.name = name
+
+    def _until(self, method, message, condition=None):
+        default = self._timeout
+        if self.timeout_for is not None:
+            self._timeout = self.timeout_for(method, message if self.name is None else self.name, default)
+        try:
+            if self.timer is None:
+                return super().until(condition or method, message)
+            with self.timer.waiting():
+                return super().until(condition or method, message)
+        finally:
+            self._timeout = default
+
+    def until(self, method, message=""):
+        if self.on_wait is None:
+            return self._until(method, message)
+        calls = 0
+
+        def counted(driver):
+            nonlocal calls
+            calls += 1
+            return method(driver)
+
+        started = time.perf_counter()
+        error = None
+        try:
+            return self._until(method, message, counted)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            name = message if self.name is None else self.name
+            self.on_wait(method, name, time.perf_counter() - started, max(0, calls - 1), error)
+
+
+class AppWaits:
+    """Esperas reutilizables sobre condiciones reales de la aplicación"""
+
+    POLL_FREQUENCY = 0.1
+
+    def __init__(self, driver, timeout, timer=None, on_wait=None, timeout_for=None):
+        self.driver = driver
+        self.timeout = timeout
+        self.timer = timer
+        self.on_wait = on_wait
+        self.timeout_for = timeout_for
+        # Último tamaño pedido con resize() y el viewport medido tras él
+        self.window_size = None
+        self.viewport = None
+        # Las esperas asíncronas (whenStable, requestAnimationFrame) comparten el mismo límite
+        self.driver.set_script_timeout(timeout)
+
+    def until(self, condition, message="", timeout=None, name=None):
+        """Esperar a que ``condition(driver)`` devuelva un valor verdadero y devolverlo.
+
+        Un ``timeout`` explícito no se adapta con ``timeout_for``. ``name``
+        identifica la espera en el perfil y en el historial de latencias; las
+        esperas cuyo mensaje lleva valores de la ejecución deben darlo.
+        """
+        wait = TimedWait(
+            self.driver,
+            self.timeout if timeout is None else timeout,
+            poll_frequency=self.POLL_FREQUENCY,
+            timer=self.timer,
+            on_wait=self.on_wait,
+            timeout_for=self.timeout_for if timeout is None else None,
+            name=name,
+        )
+        return wait.until(condition, message)
+
+    def snapshot(self, selectors, attributes=(), require=None):
+        """Esperar a que los selectores de ``require`` (por defecto el primero) existan y
+        devolver el DomSnapshot de todos los ``selectors``, leído en un solo viaje"""
+        selectors = list(selectors)
+        required = selectors[:1] if require is None else list(require)
+
+        def condition(driver):
+            snap = snapshot(driver, selectors, attributes)
+            return snap if all(snap[selector].present for selector in required) else False
+
+        return self.until(condition, f"No aparecieron {', '.join(required)}", name=", ".join(required))
+
+    def first_present(self, selectors):
+        """Esperar a que exista alguno de los ``selectors`` y devolver (selector, ElementState).
+
+        Todas las alternativas se consultan a la vez en cada sondeo; si hay
+        varias, gana la primera de la lista.
+        """
+        selectors = list(selectors)
+
+        def condition(driver):
+            snap = snapshot(driver, selectors)
+            for selector in selectors:
+                if snap[selector].present:
+                    return selector, snap[selector]
+            return False
+
+        return self.until(condition, f"No apareció ninguno de {selectors}", name=", ".join(selectors))
+
+    def angular_stable(self):
+        """Esperar a que Angular termine de renderizar y no tenga tareas pendientes"""
+        return self.until(
+            lambda d: d.execute_async_script(ANGULAR_STABLE_JS),
+            "Angular no llegó a estado estable",
+        )
+
+    def page_ready(self):
+        """Esperar a que el documento cargue y Angular quede estable"""
+        self.until(EC.presence_of_element_located((By.TAG_NAME, "body")), "El body no apareció")
+        return self.angular_stable()
+
+    def resize(self, width, height):
+        """Cambiar el tamaño de la ventana y esperar a que el viewport deje de cambiar.
+
+        Si la ventana ya tiene ese tamaño (por un resize anterior de esta sesión)
+        no hace nada.
+        """
+        if self.window_size == (width, height):
+            return self.viewport
+        self.driver.set_window_size(width, height)
+        size = self.until(
+            _Stable(lambda d: tuple(d.execute_async_script(VIEWPORT_JS))),
+            f"El viewport no se estabilizó tras cambiar a {width}x{height}",
+            name=f"resize {width}x{height}",
+        )
+        self.angular_stable()
+        self.window_size, self.viewport = (width, height), size
+        return size
+
+    def has_class(self, element_id, class_name, present=True):
+        """Esperar a que el elemento gane (o pierda) una clase CSS"""
+        selector = f"#{element_id}"
+
+        def condition(driver):
+            element = snapshot(driver, [selector])[selector]
+            return element.present and (class_name in element.classes) == present
+
+        state = "tenga" if present else "pierda"
+        return self.until(condition, f"Se esperaba que #{element_id} {state} la clase '{class_name}'",
+                          name=f"{selector} {'+' if present else '-'}{class_name}")
+
+    def menu_open(self, open=True):
+        """Esperar a que #main-header abra o cierre el menú (clase open-menu)"""
+        return self.has_class("main-header", "open-menu", present=open)
+
+    def slide_index(self):
+        """Índice del slide visible actualmente"""
+        return self.driver.execute_script(SLIDE_INDEX_JS)
+
+    def slide_changed(self, previous):
+        """Esperar a que el slide visible sea distinto de ``previous`` y devolver el nuevo índice"""
+        def condition(driver):
+            index = driver.execute_script(SLIDE_INDEX_JS)
+            return index if index and index != previous else False
+
+        return self.until(condition, f"El slideshow no cambió del slide {previous}", name="")
+
+    def cart_state(self):
+        """(líneas, unidades) del carrito según el DOM renderizado"""
+        return tuple(self.driver.execute_script(CART_STATE_JS))
+
+    def cart_changed(self, previous):
+        """Esperar a que el contenido del carrito cambie respecto a ``previous``"""
+        def condition(driver):
+            state = tuple(driver.execute_script(CART_STATE_JS))
+            return state if state != previous else False
+
+        return self.until(condition, f"El carrito no cambió de {previous}", name="")
+
+    def cart_drawer(self, open=True):
+        """Esperar a que el drawer del carrito se abra o se cierre"""
+        def condition(driver):
+            is_open = bool(driver.execute_script(
+                "var el = document.querySelector('.cart-drawer');"
+                "return !!el && el.classList.contains('open');"
+            ))
+            return is_open == open
+
+        return self.until(condition, "El drawer del carrito no cambió de estado")
+
+    def scroll_settled(self):
+        """Esperar a que termine el scroll (posición igual en dos lecturas seguidas)"""
+        return self.until(
+            _Stable(lambda d: tuple(d.execute_script(SCROLL_POSITION_JS))),
+            "El scroll no se detuvo",
+        )
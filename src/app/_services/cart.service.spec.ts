@@ -0,0 +1,62 @@
+import { TestBed } from '@angular/core/testing';
+import { PLATFORM_ID } from '@angular/core';
+import { environment } from '@env/environment';
+import { CartItem, CartService, E2E_CART_HOOK } from './cart.service';
+
+describe('CartService', () => {
+  const item: CartItem = {
+    sku: '123456',
+    name: 'Stiletto Essential 90',
+    size: 34,
+    price: 189900,
+    quantity: 1,
+    image: '/assets/images/media/products/heel-01/front.webp'
+  };
+
+  function createService(platformId = 'browser'): CartService {
+    TestBed.configureTestingModule({
+      providers: [{ provide: PLATFORM_ID, useValue: platformId }]
+    });
+    return TestBed.inject(CartService);
+  }
+
+  afterEach(() => {
+    delete (window as any)[E2E_CART_HOOK];
+    environment.e2eHooks = true;
+  });
+
+  it('should start empty without the E2E hook', () => {
+    const service = createService();
+
+    expect(service.items).toEqual([]);
+  });
+
+  it('should start from the items of the E2E hook and keep it updated', () => {
+    const hook: any = (window as any)[E2E_CART_HOOK] = { items: [item] };
+
+    const service = createService();
+    service.increase(service.items[0]);
+
+    expect(service.items).toEqual([{ ...item, quantity: 2 }]);
+    expect(hook.items).toEqual([{ ...item, quantity: 2 }]);
+    expect(hook.active).toBeTrue();
+  });
+
+  it('should ignore the E2E hook when the build has no E2E hooks', () => {
+    const hook: any = (window as any)[E2E_CART_HOOK] = { items: [item] };
+    environment.e2eHooks = false;
+
+    const service = createService();
+
+    expect(service.items).toEqual([]);
+    expect(hook.active).toBeUndefined();
+  });
+
+  it('should ignore the E2E hook on the server', () => {
+    (window as any)[E2E_CART_HOOK] = { items: [item] };
+
+    const service = createService('server');
+
+    expect(service.items).toEqual([]);
+  });
+});
@@ -1,5 +1,7 @@
-import { Injectable } from '@angular/core';
+import { Inject, Injectable, PLATFORM_ID } from '@angular/core';
+import { isPlatformBrowser } from '@angular/common';
 import { BehaviorSubject } from 'rxjs';
+import { environment } from '@env/environment';
 
 export type CartItem = {
 	sku: string
@@ -10,11 +12,29 @@ export type CartItem = {
 	image: string
 }
 
+// Gancho solo para los tests E2E (e2e_fixtures.py): si el harness define window.__e2eCart
+// antes de que arranque la app, el carrito empieza con sus items y los mantiene al día
+// para que el harness pueda capturarlos. Solo existe en las compilaciones con
+// environment.e2eHooks (desarrollo y la configuración e2e), nunca en producción
+export const E2E_CART_HOOK = '__e2eCart'
+
+type E2eCartHook = { items: CartItem[], active?: boolean }
+
 @Injectable({ providedIn: 'root' })
 export class CartService {
 	private readonly itemsSubject = new BehaviorSubject<CartItem[]>([])
 	readonly items$ = this.itemsSubject.asObservable()
 
+	constructor(@Inject(PLATFORM_ID) platformId: object) {
+		const enabled = environment.e2eHooks && isPlatformBrowser(platformId)
+		const hook: E2eCartHook | undefined = enabled ? (window as any)[E2E_CART_HOOK] : undefined
+		if (hook && Array.isArray(hook.items)) {
+			hook.active = true
+			this.itemsSubject.next([...hook.items])
+			this.items$.subscribe(items => hook.items = items)
+		}
+	}
+
 	get items(): CartItem[] {
 		return this.itemsSubject.getValue()
 	}
@@ -0,0 +1,7 @@
+// Compilación de producción con los ganchos de los tests E2E (`npm run build:e2e`).
+// No se debe desplegar: cualquier script de la página puede fijar el carrito.
+export const environment = {
+  production: true,
+  apiUrl: `https://simplebackend-dmwjvq7ka.now.sh/`,
+  e2eHooks: true
+};
@@ -1,4 +1,5 @@
 export const environment = {
   production: true,
-  apiUrl: `https://simplebackend-dmwjvq7ka.now.sh/`
+  apiUrl: `https://simplebackend-dmwjvq7ka.now.sh/`,
+  e2eHooks: false
 };
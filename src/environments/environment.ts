@@ -4,7 +4,8 @@
 
 export const environment = {
   production: false,
-  apiUrl: `https://simplebackend-dmwjvq7ka.now.sh/`
+  apiUrl: `https://simplebackend-dmwjvq7ka.now.sh/`,
+  e2eHooks: true
 };
 
 /*
@@ -4,24 +4,38 @@ Pruebas automatizadas usando Selenium WebDriver
 URL: https://steelblue-nightingale-206388.hostingersite.com
 """
 
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import Select
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
 import time
 
-# Intentar usar webdriver-manager si está disponible (opcional)
-try:
-    from webdriver_manager.chrome import ChromeDriverManager
-    USE_WEBDRIVER_MANAGER = True
-except ImportError:
-    USE_WEBDRIVER_MANAGER = False
-    print("⚠ webdriver-manager no está instalado. Asegúrate de tener ChromeDriver en el PATH.")
-    print("  Instala con: pip install webdriver-manager")
+IMPORTS_STARTED = time.perf_counter()
+
+from e2e_browser import DEFAULT_PROFILE, DRIVERS, PROFILES, STARTUP, create_driver
+from e2e_fixtures import (FixtureStore, capture as capture_state, inject as inject_state, install_hook,
+                          remove as remove_state)
+from e2e_metrics import PerformanceRecorder, viewport_label
+from e2e_hooks import add_command_listener, remove_command_listener
+from e2e_results import ResultsReport, StepTimer, TestResult
+from e2e_pool import SessionPool
+from e2e_profiler import CommandProfiler, describe_condition
+from e2e_runner import ParallelRunner, TestSpec, print_summary
+from e2e_schedule import blocked_by, plan, skipped_result
+from e2e_timeouts import AdaptiveTimeouts
+import argparse
+import functools
+import os
+import sys
+
+# Selenium solo hace falta para ejecutar TestBrightBogota: TESTS y los modos sin
+# ChromeDriver (--tier smoke, --backend async, e2e_shard.py merge, e2e_impact.py) no lo importan
+By = EC = Select = TimeoutException = None
+
+
+def _import_selenium():
+    global By, EC, Select, TimeoutException
+    if By is None:
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.webdriver.support.ui import Select
+        from selenium.common.exceptions import TimeoutException
 
 
 class TestBrightBogota:
@@ -30,57 +44,38 @@ class TestBrightBogota:
     BASE_URL = "https://steelblue-nightingale-206388.hostingersite.com"
     WAIT_TIMEOUT = 15
     
-    def __init__(self):
-        """Inicializar el driver de Selenium"""
-        print("\n[INIT] Inicializando ChromeDriver...")
+    def __init__(self, driver=None, metrics=None, network=None, profiler=None, timeouts=None, fixtures=None,
+                 visual=None, resources=None, trace=None):
+        """Inicializar la suite sobre un driver existente o arrancar uno propio"""
+        _import_selenium()
+        from e2e_waits import AppWaits, TimedWait
         
-        try:
-            chrome_options = Options()
-            # Descomentar para modo headless (sin ventana del navegador)
-            # chrome_options.add_argument('--headless')
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-            chrome_options.add_argument('--disable-gpu')
-            chrome_options.add_argument('--window-size=1920,1080')
-            chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            chrome_options.add_experimental_option('useAutomationExtension', False)
-            
-            # Usar webdriver-manager si está disponible, sino usar ChromeDriver del PATH
-            if USE_WEBDRIVER_MANAGER:
-                print("[INIT] Usando webdriver-manager para ChromeDriver...")
-                try:
-                    service = Service(ChromeDriverManager().install())
-                    self.driver = webdriver.Chrome(service=service, options=chrome_options)
-                    print("[INIT] ✓ ChromeDriver inicializado con webdriver-manager")
-                except Exception as e:
-                    print(f"[INIT] ⚠ Error con webdriver-manager: {e}")
-                    print("[INIT] Intentando con ChromeDriver del PATH...")
-                    self.driver = webdriver.Chrome(options=chrome_options)
-                    print("[INIT] ✓ ChromeDriver inicializado desde PATH")
-            else:
-                print("[INIT] Usando ChromeDriver del PATH...")
-                self.driver = webdriver.Chrome(options=chrome_options)
-                print("[INIT] ✓ ChromeDriver inicializado")
-            
-            self.wait = WebDriverWait(self.driver, self.WAIT_TIMEOUT)
-            self.driver.maximize_window()
-            print("[INIT] ✓ Navegador configurado correctamente\n")
-            
-        except Exception as e:
-            print(f"\n✗ ERROR CRÍTICO al inicializar ChromeDriver:")
-            print(f"  {str(e)}")
-            print("\nPosibles soluciones:")
-            print("1. Verifica que Chrome esté instalado")
-            print("2. Instala webdriver-manager: pip install webdriver-manager")
-            print("3. O descarga ChromeDriver manualmente desde:")
-            print("   https://chromedriver.chromium.org/downloads")
-            print("4. Asegúrate de que la versión de ChromeDriver coincida con tu versión de Chrome")
-            raise
+        self.owns_driver = driver is None
+        self.driver = create_driver(performance_log=network is not None) if driver is None else driver
+        self.steps = StepTimer()
+        self.profiler = profiler
+        self.timeouts = timeouts
+        on_wait = self.record_wait if profiler or timeouts else None
+        timeout_for = self.adaptive_timeout if timeouts else None
+        self.wait = TimedWait(self.driver, self.WAIT_TIMEOUT, timer=self.steps, on_wait=on_wait,
+                              timeout_for=timeout_for)
+        self.waits = AppWaits(self.driver, self.WAIT_TIMEOUT, timer=self.steps, on_wait=on_wait,
+                              timeout_for=timeout_for)
+        self.metrics = PerformanceRecorder() if metrics is None else metrics
+        self.metrics.install(self.driver)
+        self.network = network
+        self.fixtures = FixtureStore() if fixtures is None else fixtures
+        self.visual = visual
+        self.resources = resources
+        self.trace = trace
+        self.current_test = None
+        self.profile_listener = None
+        self.last_error = None
+        self.page = None
     
     def tearDown(self):
-        """Cerrar el navegador"""
-        if self.driver:
+        """Cerrar el navegador si la suite lo arrancó (los del pool los cierra el pool)"""
+        if self.driver and self.owns_driver:
             self.driver.quit()
     
     def test_homepage_loads(self):
@@ -88,42 +83,39 @@ class TestBrightBogota:
         print("\n[TEST] Verificando carga de la página principal...")
         try:
             print(f"[TEST] Navegando a: {self.BASE_URL}")
-            self.driver.get(self.BASE_URL)
+            self.navigate("/")
             
             # Esperar a que la página cargue
             print("[TEST] Esperando a que la página cargue...")
             self.wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
             print("[TEST] ✓ Página cargada")
             
-            # Esperar un poco más para que Angular termine de renderizar
-            time.sleep(2)
+            # Esperar a que Angular termine de renderizar
+            self.waits.angular_stable()
+            self.capture_metrics()
             
-            # Verificar que el header está presente
+            # Verificar que el header está presente (el ID y el selector alternativo se buscan a la vez)
             print("[TEST] Buscando header...")
-            try:
-                header = self.wait.until(
-                    EC.presence_of_element_located((By.ID, "header-component"))
-                )
-                assert header.is_displayed(), "El header debería estar visible"
+            selector, header = self.waits.first_present(
+                ["#header-component", ".header-component, header, app-header"]
+            )
+            if selector == "#header-component":
+                assert header.visible, "El header debería estar visible"
                 print("[TEST] ✓ Header encontrado")
-            except TimeoutException:
-                # Intentar con selector alternativo
-                print("[TEST] ⚠ Header no encontrado con ID, intentando selector alternativo...")
-                header = self.wait.until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, ".header-component, header, app-header"))
-                )
+            else:
+                print("[TEST] ⚠ Header no encontrado con ID, usando selector alternativo...")
                 print("[TEST] ✓ Header encontrado con selector alternativo")
             
             # Verificar que el logo está presente
             print("[TEST] Buscando logo...")
-            try:
-                logo = self.driver.find_element(By.ID, "site-logo")
-                assert logo.is_displayed(), "El logo debería estar visible"
+            selector, logo = self.waits.first_present(
+                ["#site-logo", ".logo-box img, img[alt*='logo' i], img[alt*='LOGO' i]"]
+            )
+            if selector == "#site-logo":
+                assert logo.visible, "El logo debería estar visible"
                 print("[TEST] ✓ Logo encontrado")
-            except NoSuchElementException:
-                # Intentar con selector alternativo
-                print("[TEST] ⚠ Logo no encontrado con ID, intentando selector alternativo...")
-                logo = self.driver.find_element(By.CSS_SELECTOR, ".logo-box img, img[alt*='logo' i], img[alt*='LOGO' i]")
+            else:
+                print("[TEST] ⚠ Logo no encontrado con ID, usando selector alternativo...")
                 print("[TEST] ✓ Logo encontrado con selector alternativo")
             
             print("✓ Página principal cargada correctamente")
@@ -132,25 +124,23 @@ class TestBrightBogota:
             print(f"✗ Timeout al cargar la página: {e}")
             print(f"  URL actual: {self.driver.current_url}")
             print(f"  Título de la página: {self.driver.title}")
-            return False
+            return self.record_error(e)
         except Exception as e:
             print(f"✗ Error al cargar la página: {e}")
             print(f"  URL actual: {self.driver.current_url if hasattr(self.driver, 'current_url') else 'N/A'}")
-            return False
+            return self.record_error(e)
     
     def test_top_banner_display(self):
         """Test: Verificar que el banner superior se muestra"""
         print("\n[TEST] Verificando banner superior...")
         try:
-            banner = self.wait.until(
-                EC.presence_of_element_located((By.ID, "top-banner"))
-            )
-            assert banner.is_displayed(), "El banner debería estar visible"
+            dom = self.waits.snapshot(["#top-banner"])
+            assert dom["#top-banner"].visible, "El banner debería estar visible"
             print("✓ Banner superior visible")
             return True
         except Exception as e:
             print(f"✗ Error: {e}")
-            return False
+            return self.record_error(e)
     
     def test_search_box_functionality(self):
         """Test: Verificar funcionalidad de la caja de búsqueda"""
@@ -173,16 +163,12 @@ class TestBrightBogota:
             return True
         except Exception as e:
             print(f"✗ Error: {e}")
-            return False
+            return self.record_error(e)
     
     def test_hamburger_menu_mobile(self):
         """Test: Verificar menú hamburguesa en vista móvil"""
         print("\n[TEST] Verificando menú hamburguesa (vista móvil)...")
         try:
-            # Cambiar a vista móvil
-            self.driver.set_window_size(375, 667)
-            time.sleep(1)
-            
             # Verificar que el botón hamburguesa es visible
             hamburger_btn = self.wait.until(
                 EC.element_to_be_clickable((By.ID, "hamburger-menu-btn"))
@@ -191,7 +177,7 @@ class TestBrightBogota:
             
             # Hacer clic en el botón
             hamburger_btn.click()
-            time.sleep(1)
+            self.waits.menu_open()
             
             # Verificar que el menú se abre
             main_header = self.driver.find_element(By.ID, "main-header")
@@ -203,30 +189,24 @@ class TestBrightBogota:
                 EC.element_to_be_clickable((By.ID, "close-menu-btn"))
             )
             close_btn.click()
-            time.sleep(1)
+            self.waits.menu_open(False)
             
             print("✓ Menú hamburguesa funcional en móvil")
             return True
         except Exception as e:
             print(f"✗ Error: {e}")
-            return False
+            return self.record_error(e)
     
     def test_main_menu_desktop(self):
         """Test: Verificar menú principal en vista desktop"""
         print("\n[TEST] Verificando menú principal (vista desktop)...")
         try:
-            # Cambiar a vista desktop
-            self.driver.set_window_size(1024, 768)
-            time.sleep(1)
-            
-            # Verificar que el menú principal está visible
-            main_menu = self.wait.until(
-                EC.presence_of_element_located((By.ID, "main-menu"))
-            )
-            assert main_menu.is_displayed(), "El menú principal debería estar visible"
+            # Menú e items en una sola consulta al DOM
+            dom = self.waits.snapshot(["#main-menu", "#main-menu li > a"])
+            assert dom["#main-menu"].visible, "El menú principal debería estar visible"
             
             # Verificar que los items del menú están presentes
-            menu_items = main_menu.find_elements(By.CSS_SELECTOR, "li > a")
+            menu_items = dom.all("#main-menu li > a")
             assert len(menu_items) > 0, "El menú debería tener items"
             
             # Verificar textos esperados
@@ -240,16 +220,12 @@ class TestBrightBogota:
             return True
         except Exception as e:
             print(f"✗ Error: {e}")
-            return False
+            return self.record_error(e)
     
     def test_slideshow_navigation(self):
         """Test: Verificar navegación del slideshow"""
         print("\n[TEST] Verificando navegación del slideshow...")
         try:
-            # Cambiar a vista desktop
-            self.driver.set_window_size(1024, 768)
-            time.sleep(1)
-            
             # Verificar que el contenedor del slideshow está presente
             slideshow = self.wait.until(
                 EC.presence_of_element_located((By.ID, "slideshow-container"))
@@ -265,54 +241,51 @@ class TestBrightBogota:
             )
             
             # Navegar al siguiente slide
+            first_slide = self.waits.slide_index()
+            started = time.perf_counter()
             next_btn.click()
-            time.sleep(1)
+            next_slide = self.waits.slide_changed(first_slide)
+            self.metrics.record(self.current_test, "click_to_slide_change", (time.perf_counter() - started) * 1000)
             
             # Navegar al slide anterior
             prev_btn.click()
-            time.sleep(1)
+            prev_slide = self.waits.slide_changed(next_slide)
+            assert prev_slide == first_slide, "El botón anterior debería volver al slide inicial"
             
             print("✓ Navegación del slideshow funcional")
             return True
         except Exception as e:
             print(f"✗ Error: {e}")
-            return False
+            return self.record_error(e)
     
     def test_product_details_display(self):
         """Test: Verificar que los detalles del producto se muestran"""
         print("\n[TEST] Verificando detalles del producto...")
         try:
-            product_section = self.wait.until(
-                EC.presence_of_element_located((By.ID, "product-details"))
+            dom = self.waits.snapshot(
+                ["#product-details", "#product-title", "#product-sku", "#product-description"]
             )
-            assert product_section.is_displayed(), "La sección de producto debería estar visible"
+            assert dom["#product-details"].visible, "La sección de producto debería estar visible"
             
             # Verificar título del producto
-            product_title = self.driver.find_element(By.ID, "product-title")
-            assert "Stiletto" in product_title.text, "El título debería contener 'Stiletto'"
+            assert "Stiletto" in dom["#product-title"].text, "El título debería contener 'Stiletto'"
             
             # Verificar SKU
-            product_sku = self.driver.find_element(By.ID, "product-sku")
-            assert "SKU" in product_sku.text, "Debería mostrar el SKU"
+            assert "SKU" in dom["#product-sku"].text, "Debería mostrar el SKU"
             
             # Verificar descripción
-            product_description = self.driver.find_element(By.ID, "product-description")
-            assert len(product_description.text) > 0, "Debería tener descripción"
+            assert len(dom["#product-description"].text) > 0, "Debería tener descripción"
             
             print("✓ Detalles del producto mostrados correctamente")
             return True
         except Exception as e:
             print(f"✗ Error: {e}")
-            return False
+            return self.record_error(e)
     
     def test_add_to_cart_functionality(self):
         """Test: Verificar funcionalidad de agregar al carrito"""
         print("\n[TEST] Verificando agregar producto al carrito...")
         try:
-            # Cambiar a vista desktop
-            self.driver.set_window_size(1024, 768)
-            time.sleep(1)
-            
             # Esperar a que la sección de producto esté visible
             self.wait.until(
                 EC.presence_of_element_located((By.ID, "product-details"))
@@ -326,7 +299,7 @@ class TestBrightBogota:
             
             # Seleccionar la primera talla disponible (34)
             select.select_by_value("34")
-            time.sleep(0.5)
+            self.waits.angular_stable()
             
             # Verificar que la cantidad es 1 por defecto
             quantity_input = self.driver.find_element(By.ID, "quantity")
@@ -338,14 +311,18 @@ class TestBrightBogota:
             )
             assert add_to_cart_btn.is_enabled(), "El botón debería estar habilitado"
             
+            cart_before = self.waits.cart_state()
+            started = time.perf_counter()
             add_to_cart_btn.click()
-            time.sleep(2)
+            self.waits.cart_changed(cart_before)
+            self.metrics.record(self.current_test, "click_to_cart_update", (time.perf_counter() - started) * 1000)
+            self.waits.cart_drawer()
             
             print("✓ Producto agregado al carrito")
             return True
         except Exception as e:
             print(f"✗ Error: {e}")
-            return False
+            return self.record_error(e)
     
     def test_cart_icon_clickable(self):
         """Test: Verificar que el icono del carrito es clickeable"""
@@ -357,13 +334,13 @@ class TestBrightBogota:
             assert cart_icon.is_displayed(), "El icono del carrito debería estar visible"
             
             cart_icon.click()
-            time.sleep(2)
+            self.waits.cart_drawer()
             
             print("✓ Icono del carrito clickeable")
             return True
         except Exception as e:
             print(f"✗ Error: {e}")
-            return False
+            return self.record_error(e)
     
     def test_cart_functionality(self):
         """Test: Verificar funcionalidad del carrito"""
@@ -373,7 +350,7 @@ class TestBrightBogota:
             try:
                 cart_nav = self.driver.find_element(By.ID, "cart-nav")
                 cart_nav.click()
-                time.sleep(2)
+                self.waits.cart_drawer()
             except:
                 pass
             
@@ -388,33 +365,30 @@ class TestBrightBogota:
                 print("⚠ Carrito no visible (puede requerir interacción previa)")
                 return True
             
-            # Si hay items, verificar botones
-            try:
-                cart_items = self.driver.find_elements(By.CSS_SELECTOR, "[id^='cart-item-']")
-                if len(cart_items) > 0:
-                    # Verificar botones de cantidad
-                    increase_btn = self.driver.find_element(By.ID, "increase-qty-0")
-                    decrease_btn = self.driver.find_element(By.ID, "decrease-qty-0")
-                    assert increase_btn.is_displayed(), "Botón aumentar cantidad debería estar visible"
-                    assert decrease_btn.is_displayed(), "Botón disminuir cantidad debería estar visible"
-                    
-                    # Verificar botones de acción
-                    checkout_btn = self.driver.find_element(By.ID, "cart-checkout")
-                    clear_btn = self.driver.find_element(By.ID, "cart-clear")
-                    assert checkout_btn.is_displayed(), "Botón checkout debería estar visible"
-                    assert clear_btn.is_displayed(), "Botón vaciar carrito debería estar visible"
-                    
-                    print("✓ Funcionalidad del carrito verificada")
-            except NoSuchElementException:
+            # Items, botones y mensaje de carrito vacío en una sola consulta al DOM
+            dom = self.waits.snapshot([
+                "#cart-container", "[id^='cart-item-']", "#increase-qty-0", "#decrease-qty-0",
+                "#cart-checkout", "#cart-clear", "#cart-empty",
+            ])
+            if dom.all("[id^='cart-item-']"):
+                # Verificar botones de cantidad
+                assert dom["#increase-qty-0"].visible, "Botón aumentar cantidad debería estar visible"
+                assert dom["#decrease-qty-0"].visible, "Botón disminuir cantidad debería estar visible"
+                
+                # Verificar botones de acción
+                assert dom["#cart-checkout"].visible, "Botón checkout debería estar visible"
+                assert dom["#cart-clear"].visible, "Botón vaciar carrito debería estar visible"
+                
+                print("✓ Funcionalidad del carrito verificada")
+            else:
                 # Carrito vacío
-                empty_message = self.driver.find_element(By.ID, "cart-empty")
-                assert "vacío" in empty_message.text.lower(), "Debería mostrar mensaje de carrito vacío"
+                assert "vacío" in dom["#cart-empty"].text.lower(), "Debería mostrar mensaje de carrito vacío"
                 print("✓ Carrito vacío (comportamiento esperado)")
             
             return True
         except Exception as e:
             print(f"✗ Error: {e}")
-            return False
+            return self.record_error(e)
     
     def test_contact_form_display(self):
         """Test: Verificar que el formulario de contacto se muestra"""
@@ -422,34 +396,28 @@ class TestBrightBogota:
         try:
             # Hacer scroll hasta el formulario
             self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(1)
+            self.waits.scroll_settled()
             
-            # Verificar que el formulario está presente
-            contact_form = self.wait.until(
-                EC.presence_of_element_located((By.ID, "contact-form"))
-            )
-            assert contact_form.is_displayed(), "El formulario debería estar visible"
+            # Formulario y campos en una sola consulta al DOM
+            dom = self.waits.snapshot([
+                "#contact-form", "#form-name", "#form-email", "#form-phone",
+                "#form-city", "#form-message", "#form-submit",
+            ])
+            assert dom["#contact-form"].visible, "El formulario debería estar visible"
             
             # Verificar campos del formulario
-            form_name = self.driver.find_element(By.ID, "form-name")
-            form_email = self.driver.find_element(By.ID, "form-email")
-            form_phone = self.driver.find_element(By.ID, "form-phone")
-            form_city = self.driver.find_element(By.ID, "form-city")
-            form_message = self.driver.find_element(By.ID, "form-message")
-            form_submit = self.driver.find_element(By.ID, "form-submit")
-            
-            assert form_name.is_displayed(), "Campo nombre debería estar visible"
-            assert form_email.is_displayed(), "Campo email debería estar visible"
-            assert form_phone.is_displayed(), "Campo teléfono debería estar visible"
-            assert form_city.is_displayed(), "Campo ciudad debería estar visible"
-            assert form_message.is_displayed(), "Campo mensaje debería estar visible"
-            assert form_submit.is_displayed(), "Botón enviar debería estar visible"
+            assert dom["#form-name"].visible, "Campo nombre debería estar visible"
+            assert dom["#form-email"].visible, "Campo email debería estar visible"
+            assert dom["#form-phone"].visible, "Campo teléfono debería estar visible"
+            assert dom["#form-city"].visible, "Campo ciudad debería estar visible"
+            assert dom["#form-message"].visible, "Campo mensaje debería estar visible"
+            assert dom["#form-submit"].visible, "Botón enviar debería estar visible"
             
             print("✓ Formulario de contacto mostrado correctamente")
             return True
         except Exception as e:
             print(f"✗ Error: {e}")
-            return False
+            return self.record_error(e)
     
     def test_contact_form_validation(self):
         """Test: Verificar validación del formulario de contacto"""
@@ -457,7 +425,7 @@ class TestBrightBogota:
         try:
             # Hacer scroll hasta el formulario
             self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(1)
+            self.waits.scroll_settled()
             
             form_submit = self.wait.until(
                 EC.presence_of_element_located((By.ID, "form-submit"))
@@ -480,15 +448,22 @@ class TestBrightBogota:
             return True
         except Exception as e:
             print(f"✗ Error: {e}")
-            return False
+            return self.record_error(e)
     
     def test_responsive_design(self):
         """Test: Verificar diseño responsive"""
         print("\n[TEST] Verificando diseño responsive...")
         try:
+            visual_failures = []
+            if self.visual:
+                # Capturar sobre una carga limpia, sin lo que dejaron los tests anteriores
+                self.load_page("/")
+            
             # Vista móvil
-            self.driver.set_window_size(375, 667)
-            time.sleep(1)
+            self.waits.resize(375, 667)
+            self.capture_metrics(viewport_label(375, 667))
+            if self.visual:
+                visual_failures += self.visual.check(self.driver, viewport_label(375, 667))
             
             # Verificar que el menú hamburguesa es visible en móvil
             hamburger_btn = self.wait.until(
@@ -497,12 +472,16 @@ class TestBrightBogota:
             assert hamburger_btn.is_displayed(), "Menú hamburguesa debería estar visible en móvil"
             
             # Vista tablet
-            self.driver.set_window_size(768, 1024)
-            time.sleep(1)
+            self.waits.resize(768, 1024)
+            self.capture_metrics(viewport_label(768, 1024))
+            if self.visual:
+                visual_failures += self.visual.check(self.driver, viewport_label(768, 1024))
             
             # Vista desktop
-            self.driver.set_window_size(1024, 768)
-            time.sleep(1)
+            self.waits.resize(1024, 768)
+            self.capture_metrics(viewport_label(1024, 768))
+            if self.visual:
+                visual_failures += self.visual.check(self.driver, viewport_label(1024, 768))
             
             # Verificar que el menú principal es visible en desktop
             main_menu = self.wait.until(
@@ -510,122 +489,655 @@ class TestBrightBogota:
             )
             assert main_menu.is_displayed(), "Menú principal debería estar visible en desktop"
             
+            assert not visual_failures, "Diferencias visuales: " + "; ".join(str(f) for f in visual_failures)
+            
             print("✓ Diseño responsive verificado")
             return True
         except Exception as e:
             print(f"✗ Error: {e}")
-            return False
+            return self.record_error(e)
+    
+    def record_error(self, error):
+        """Guardar la excepción que hizo fallar el test en curso y devolver False"""
+        self.last_error = error
+        return False
+    
+    def capture_metrics(self, viewport=None):
+        """Registrar las métricas de rendimiento de la página actual para el test en curso"""
+        try:
+            self.metrics.capture(self.driver, self.current_test, viewport)
+        except Exception as e:
+            print(f"[METRICS] ⚠ No se pudieron capturar las métricas: {e}")
+    
+    def record_wait(self, method, name, elapsed, retries, error):
+        """Registrar una espera del test en curso en el perfil de comandos y en el historial de latencias"""
+        if self.profiler:
+            self.profiler.record_wait(self.current_test, describe_condition(method, name), elapsed, retries, error)
+        if self.timeouts and error is None:
+            self.timeouts.record(AdaptiveTimeouts.key(self.current_test, method, name), elapsed)
     
-    def run_all_tests(self):
-        """Ejecutar todos los tests"""
+    def adaptive_timeout(self, method, name, default):
+        """Timeout de una espera según su historial"""
+        return self.timeouts.timeout(AdaptiveTimeouts.key(self.current_test, method, name), default)
+    
+    def navigate(self, path):
+        """Navegar a ``path`` dentro del sitio y recordar la página actual"""
+        self.driver.get(self.BASE_URL.rstrip("/") + path)
+        self.page = path
+    
+    def load_page(self, path="/"):
+        """Cargar una página del sitio y esperar a que Angular quede estable"""
+        self.navigate(path)
+        self.waits.page_ready()
+        self.capture_metrics()
+    
+    def prepare(self, spec, isolated=False):
+        """Dejar el navegador en el viewport y la página que declara el test.
+        
+        Solo cambia de tamaño o navega si el estado actual no coincide; con
+        ``isolated=True`` la sesión viene reiniciada y la página siempre se carga.
+        Si el test declara un fixture, su estado se inyecta y la página se
+        recarga con él.
+        """
+        if isolated:
+            self.page = None
+        if spec.viewport:
+            self.waits.resize(*spec.viewport)
+        if spec.fixture:
+            self.load_with_fixture(spec.fixture, spec.start_url or "/")
+        elif spec.start_url is not None and self.page != spec.start_url:
+            self.load_page(spec.start_url)
+    
+    def load_with_fixture(self, name, path="/"):
+        """Cargar ``path`` partiendo del estado guardado en el fixture ``name``"""
+        snapshot = self.fixtures.get_or_build(name, functools.partial(self.build_fixture, name), self.BASE_URL)
+        identifier = inject_state(self.driver, snapshot, self.BASE_URL)
+        try:
+            self.load_page(path)
+        finally:
+            remove_state(self.driver, identifier)
+    
+    def build_fixture(self, name):
+        """Llegar al estado del fixture ``name`` a través de la UI y capturarlo.
+        
+        Las métricas, esperas y comandos de la preparación se registran como
+        ``fixture:<nombre>``, no como el test que pidió el fixture.
+        """
+        setup = TESTS_BY_METHOD[FIXTURES[name]]
+        test, self.current_test = self.current_test, f"fixture:{name}"
+        listener = self.profile_listener
+        if listener:
+            remove_command_listener(self.driver, listener)
+            self.profile_listener = self.profiler.listener(self.current_test)
+            add_command_listener(self.driver, self.profile_listener)
+        hook = install_hook(self.driver)
+        try:
+            self.prepare(setup, isolated=True)
+            if not getattr(self, setup.method)():
+                raise RuntimeError(f"No se pudo preparar el fixture '{name}': falló {setup.method}") from self.last_error
+            return capture_state(self.driver, name)
+        finally:
+            remove_state(self.driver, hook)
+            self.current_test = test
+            if listener:
+                remove_command_listener(self.driver, self.profile_listener)
+                self.profile_listener = listener
+                add_command_listener(self.driver, listener)
+    
+    def run_test(self, spec, isolated=False):
+        """Ejecutar un test del registro y devolver su TestResult.
+        
+        Antes del test se ajustan su viewport y su página inicial; con
+        ``isolated=True`` la página se carga siempre, sin depender de lo que
+        dejaron los tests anteriores.
+        """
+        self.current_test = spec.method
+        self.last_error = None
+        self.steps.reset()
+        add_command_listener(self.driver, self.steps.on_command)
+        self.profile_listener = self.profiler.listener(spec.method) if self.profiler else None
+        if self.profile_listener:
+            add_command_listener(self.driver, self.profile_listener)
+        if self.network:
+            self.network.begin(self.driver)
+        if self.resources:
+            self.resources.begin(self.driver, spec.method)
+        if self.trace:
+            self.trace.attach(self.driver)
+        result = TestResult(spec.label, spec.method, False)
+        started = time.perf_counter()
+        try:
+            self.prepare(spec, isolated)
+            result.passed = bool(getattr(self, spec.method)())
+        except Exception as e:
+            print(f"✗ Error inesperado en {spec.method}: {e}")
+            self.last_error = e
+        finally:
+            result.duration = time.perf_counter() - started
+            remove_command_listener(self.driver, self.steps.on_command)
+            if self.profile_listener:
+                remove_command_listener(self.driver, self.profile_listener)
+                self.profile_listener = None
+            result.steps = self.steps.breakdown(result.duration)
+            if self.last_error is not None:
+                result.set_error(self.last_error)
+            if self.trace and not result.passed:
+                try:
+                    result.trace = self.trace.flush(self.driver, result)
+                except Exception as e:
+                    print(f"[TRACE] ⚠ No se pudo guardar la traza de {spec.method}: {e}")
+            if self.network:
+                try:
+                    self.network.end(self.driver, spec.method)
+                except Exception as e:
+                    print(f"[NETWORK] ⚠ No se pudo registrar la red de {spec.method}: {e}")
+            if self.resources:
+                result.resources = self.resources.end(self.driver)
+        return result
+    
+    def run_all_tests(self, specs=None):
+        """Ejecutar todos los tests (o solo ``specs``)"""
         print("=" * 60)
         print("INICIANDO TESTS E2E PARA BRIGHT BOGOTÁ")
         print("=" * 60)
         
         results = []
         
+        outcomes = {}
         try:
-            # Test 1: Carga de página
-            results.append(("Carga de página", self.test_homepage_loads()))
-            
-            # Test 2: Banner superior
-            results.append(("Banner superior", self.test_top_banner_display()))
-            
-            # Test 3: Caja de búsqueda
-            results.append(("Caja de búsqueda", self.test_search_box_functionality()))
-            
-            # Test 4: Menú hamburguesa móvil
-            results.append(("Menú hamburguesa móvil", self.test_hamburger_menu_mobile()))
-            
-            # Test 5: Menú principal desktop
-            results.append(("Menú principal desktop", self.test_main_menu_desktop()))
-            
-            # Test 6: Navegación slideshow
-            results.append(("Navegación slideshow", self.test_slideshow_navigation()))
-            
-            # Test 7: Detalles del producto
-            results.append(("Detalles del producto", self.test_product_details_display()))
-            
-            # Test 8: Agregar al carrito
-            results.append(("Agregar al carrito", self.test_add_to_cart_functionality()))
-            
-            # Test 9: Icono del carrito
-            results.append(("Icono del carrito", self.test_cart_icon_clickable()))
-            
-            # Test 10: Funcionalidad del carrito
-            results.append(("Funcionalidad del carrito", self.test_cart_functionality()))
-            
-            # Test 11: Formulario de contacto
-            results.append(("Formulario de contacto", self.test_contact_form_display()))
-            
-            # Test 12: Validación del formulario
-            results.append(("Validación del formulario", self.test_contact_form_validation()))
-            
-            # Test 13: Diseño responsive
-            results.append(("Diseño responsive", self.test_responsive_design()))
+            for spec in plan(TESTS if specs is None else specs):
+                requirement = blocked_by(spec, outcomes)
+                if requirement:
+                    result = skipped_result(spec, requirement)
+                else:
+                    result = self.run_test(spec)
+                outcomes[spec.method] = result.passed
+                results.append(result)
             
         except Exception as e:
             print(f"\n✗ Error crítico durante la ejecución: {e}")
         
         finally:
             # Mostrar resumen
-            print("\n" + "=" * 60)
-            print("RESUMEN DE RESULTADOS")
-            print("=" * 60)
-            
-            passed = sum(1 for _, result in results if result)
-            failed = len(results) - passed
-            
-            for test_name, result in results:
-                status = "✓ PASS" if result else "✗ FAIL"
-                print(f"{status} - {test_name}")
-            
-            print("\n" + "-" * 60)
-            print(f"Total: {len(results)} tests")
-            print(f"Exitosos: {passed}")
-            print(f"Fallidos: {failed}")
-            print("=" * 60)
-            
-            # Esperar antes de cerrar
-            input("\nPresiona Enter para cerrar el navegador...")
+            print_summary(results)
+            self.metrics.report()
+            if self.network:
+                self.network.report()
+            if self.profiler:
+                self.profiler.report()
             self.tearDown()
+        
+        return results
+
+
+# Registro de tests: viewport, página inicial y prerrequisitos de cada uno.
+# El orden de ejecución lo decide e2e_schedule.plan.
+MOBILE = (375, 667)
+DESKTOP = (1024, 768)
+
+TESTS = [
+    TestSpec("Carga de página", "test_homepage_loads", start_url=None),
+    TestSpec("Banner superior", "test_top_banner_display"),
+    TestSpec("Caja de búsqueda", "test_search_box_functionality"),
+    TestSpec("Menú hamburguesa móvil", "test_hamburger_menu_mobile", viewport=MOBILE),
+    TestSpec("Menú principal desktop", "test_main_menu_desktop", viewport=DESKTOP),
+    TestSpec("Navegación slideshow", "test_slideshow_navigation", viewport=DESKTOP),
+    TestSpec("Detalles del producto", "test_product_details_display"),
+    TestSpec("Agregar al carrito", "test_add_to_cart_functionality", viewport=DESKTOP),
+    TestSpec("Icono del carrito", "test_cart_icon_clickable", viewport=DESKTOP),
+    TestSpec("Funcionalidad del carrito", "test_cart_functionality", viewport=DESKTOP,
+             fixture="cart_with_item"),
+    TestSpec("Formulario de contacto", "test_contact_form_display"),
+    TestSpec("Validación del formulario", "test_contact_form_validation",
+             requires=("test_contact_form_display",)),
+    TestSpec("Diseño responsive", "test_responsive_design"),
+]
+
+TESTS_BY_METHOD = {spec.method: spec for spec in TESTS}
+
+# Fixtures de estado: nombre -> test que deja la app en ese estado la primera vez
+FIXTURES = {
+    "cart_with_item": "test_add_to_cart_functionality",
+}
+
+
+def journey(*methods):
+    """Pasos de un escenario de carga a partir de los métodos del registro"""
+    return tuple(TESTS_BY_METHOD[method] for method in methods)
+
+
+# Recorridos de compradores para el modo carga (--load): (nombre, peso, pasos); el peso es
+# la proporción de cada uno
+SCENARIOS = [
+    ("Explorar", 5, journey(
+        "test_homepage_loads", "test_main_menu_desktop", "test_slideshow_navigation",
+        "test_product_details_display",
+    )),
+    ("Menú móvil", 2, journey("test_homepage_loads", "test_hamburger_menu_mobile")),
+    ("Comprar", 3, journey(
+        "test_homepage_loads", "test_add_to_cart_functionality", "test_cart_icon_clickable",
+        "test_cart_functionality",
+    )),
+    ("Contactar", 1, journey(
+        "test_homepage_loads", "test_contact_form_display", "test_contact_form_validation",
+    )),
+]
+
+# Recorridos de la matriz de red y CPU (--matrix)
+MATRIX_FLOWS = {
+    "home": journey("test_homepage_loads"),
+    "slideshow": journey("test_homepage_loads", "test_slideshow_navigation"),
+    "add-to-cart": journey("test_homepage_loads", "test_add_to_cart_functionality"),
+    "contact-form": journey("test_homepage_loads", "test_contact_form_display", "test_contact_form_validation"),
+}
+
+
+def parse_args(argv=None):
+    """Opciones de línea de comandos del runner"""
+    # Solo las constantes y tipos de las opciones; el resto de cada modo se importa al usarlo
+    from e2e_budgets import DEFAULT_BUDGETS
+    from e2e_server import MODES as SERVER_MODES
+    from e2e_shard import parse_shard
+    from e2e_throttle import NETWORKS, VIEWPORTS as MATRIX_VIEWPORTS, parse_list
+
+    parser = argparse.ArgumentParser(description="Tests E2E de Bright Bogotá")
+    parser.add_argument(
+        "--workers", type=int, default=int(os.environ.get("E2E_WORKERS", "1")),
+        help="Sesiones de Chrome en paralelo (1 = ejecución secuencial; env E2E_WORKERS)",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=int(os.environ.get("E2E_REPEAT", "1")),
+        help="Repetir la suite N veces reutilizando las mismas sesiones (env E2E_REPEAT)",
+    )
+    parser.add_argument(
+        "--profile", choices=sorted(PROFILES), default=os.environ.get("E2E_PROFILE") or None,
+        help=f"Perfil de navegador: full, headless o lean (por defecto {DEFAULT_PROFILE}, "
+             "o headless con --load; env E2E_PROFILE)",
+    )
+    parser.add_argument(
+        "--local-server", choices=SERVER_MODES, default=os.environ.get("E2E_LOCAL_SERVER") or None,
+        help="Servir el sitio en local en vez de usar el despliegue remoto: "
+             "static (dist/.../browser) o ssr (server.ts) (env E2E_LOCAL_SERVER)",
+    )
+    parser.add_argument(
+        "--base-url", metavar="URL", default=os.environ.get("E2E_BASE_URL") or None,
+        help="Probar el sitio en URL (p. ej. un servidor ya levantado por el coordinador de shards) "
+             "en vez del despliegue remoto (env E2E_BASE_URL)",
+    )
+    parser.add_argument(
+        "--changed-since", metavar="REF", default=os.environ.get("E2E_CHANGED_SINCE") or None,
+        help="Ejecutar solo los tests cuyos selectores define alguna plantilla o componente cambiado "
+             "respecto a REF (p. ej. origin/main, más los cambios sin commitear); los cambios globales "
+             "ejecutan la suite completa (ver e2e_impact.py; env E2E_CHANGED_SINCE)",
+    )
+    parser.add_argument(
+        "--shard", metavar="i/N", type=parse_shard, default=os.environ.get("E2E_SHARD") or None,
+        help="Ejecutar solo la parte i de N de la suite (y de sus --repeat iteraciones), repartida por "
+             "la duración histórica de e2e_durations.json; ver e2e_shard.py (env E2E_SHARD)",
+    )
+    parser.add_argument(
+        "--metrics", metavar="FICHERO", default=os.environ.get("E2E_METRICS") or None,
+        help="Guardar las métricas de rendimiento por test y viewport en JSON (env E2E_METRICS)",
+    )
+    parser.add_argument(
+        "--budgets", metavar="FICHERO", nargs="?", const=DEFAULT_BUDGETS,
+        default=os.environ.get("E2E_BUDGETS") or None,
+        help="Comparar las métricas contra presupuestos y la línea base; sale con código 1 si hay "
+             f"regresiones (por defecto {os.path.basename(DEFAULT_BUDGETS)}; env E2E_BUDGETS)",
+    )
+    parser.add_argument(
+        "--network", metavar="DIRECTORIO", nargs="?", const="e2e-network",
+        default=os.environ.get("E2E_NETWORK") or None,
+        help="Registrar la red de cada test (HAR por test y recursos más pesados) en DIRECTORIO "
+             "(por defecto e2e-network; env E2E_NETWORK)",
+    )
+    parser.add_argument(
+        "--json", metavar="FICHERO", default=os.environ.get("E2E_JSON") or None,
+        help="Escribir los resultados (estado, excepción y tiempos por paso) en JSON (env E2E_JSON)",
+    )
+    parser.add_argument(
+        "--junit", metavar="FICHERO", default=os.environ.get("E2E_JUNIT") or None,
+        help="Escribir los resultados en formato JUnit XML (env E2E_JUNIT)",
+    )
+    parser.add_argument(
+        "--command-profile", metavar="FICHERO", nargs="?", const="",
+        default=os.environ.get("E2E_COMMAND_PROFILE"),
+        help="Perfilar cada comando de WebDriver y cada espera (selector, duración, reintentos) e "
+             "imprimir el agregado por comando y selector; con FICHERO guarda además el detalle "
+             "en JSON (env E2E_COMMAND_PROFILE)",
+    )
+    parser.add_argument(
+        "--load", metavar="USUARIOS", type=int, default=int(os.environ.get("E2E_LOAD_USERS", "0")),
+        help="Modo carga: repetir los escenarios de SCENARIOS con USUARIOS sesiones concurrentes "
+             "en lugar de ejecutar la suite (env E2E_LOAD_USERS)",
+    )
+    parser.add_argument(
+        "--duration", metavar="SEGUNDOS", type=float, default=float(os.environ.get("E2E_LOAD_DURATION", "0")) or None,
+        help="Duración de la carga (env E2E_LOAD_DURATION)",
+    )
+    parser.add_argument(
+        "--iterations", metavar="N", type=int, default=int(os.environ.get("E2E_LOAD_ITERATIONS", "0")) or None,
+        help="Número total de recorridos de la carga; sin --duration ni --iterations se hace "
+             "uno por usuario (env E2E_LOAD_ITERATIONS)",
+    )
+    parser.add_argument(
+        "--ramp-up", metavar="SEGUNDOS", type=float, default=float(os.environ.get("E2E_LOAD_RAMP_UP", "0")),
+        help="Tiempo en el que entran escalonadamente todos los usuarios (env E2E_LOAD_RAMP_UP)",
+    )
+    parser.add_argument(
+        "--matrix", action="store_true", default=os.environ.get("E2E_MATRIX") == "1",
+        help="Matriz de rendimiento: repetir los recorridos de MATRIX_FLOWS en cada combinación de "
+             "viewport, red y CPU emuladas por CDP, --workers celdas a la vez (env E2E_MATRIX=1)",
+    )
+    parser.add_argument(
+        "--matrix-flows", type=parse_list(tuple(MATRIX_FLOWS)), default=tuple(MATRIX_FLOWS),
+        help=f"Recorridos de la matriz (por defecto {','.join(MATRIX_FLOWS)})",
+    )
+    parser.add_argument(
+        "--matrix-viewports", type=parse_list(tuple(MATRIX_VIEWPORTS)), default=("mobile", "desktop"),
+        help=f"Viewports de la matriz: {','.join(MATRIX_VIEWPORTS)} (por defecto mobile,desktop)",
+    )
+    parser.add_argument(
+        "--matrix-networks", type=parse_list(tuple(NETWORKS)), default=("4g", "3g", "offline-recovery"),
+        help=f"Perfiles de red de la matriz: {','.join(NETWORKS)} (por defecto 4g,3g,offline-recovery)",
+    )
+    parser.add_argument(
+        "--matrix-cpu", type=parse_list(cast=float), default=(1.0, 4.0),
+        help="Factores de ralentización de CPU de la matriz (por defecto 1,4)",
+    )
+    parser.add_argument(
+        "--tier", choices=("browser", "smoke", "tiered"), default=os.environ.get("E2E_TIER", "browser"),
+        help="browser: todos los tests en Chrome; smoke: solo las comprobaciones HTTP sobre el HTML "
+             "renderizado en servidor, sin navegador; tiered: las comprobaciones HTTP sustituyen a los "
+             "tests estáticos y solo los interactivos se ejecutan en Chrome (env E2E_TIER)",
+    )
+    parser.add_argument(
+        "--no-adaptive-timeouts", dest="adaptive_timeouts", action="store_false",
+        default=os.environ.get("E2E_ADAPTIVE_TIMEOUTS", "1") != "0",
+        help="Usar siempre WAIT_TIMEOUT en lugar de timeouts derivados del historial de "
+             "latencias de cada espera (env E2E_ADAPTIVE_TIMEOUTS=0)",
+    )
+    parser.add_argument(
+        "--refresh-fixtures", action="store_true", default=os.environ.get("E2E_REFRESH_FIXTURES") == "1",
+        help="Volver a preparar desde la UI los fixtures de estado guardados en .e2e/fixtures "
+             "(env E2E_REFRESH_FIXTURES=1)",
+    )
+    parser.add_argument(
+        "--reruns", metavar="K", type=int, default=int(os.environ.get("E2E_RERUNS", "0")),
+        help="Reejecutar hasta K veces cada test fallido en una sesión nueva del pool; un test que "
+             "pasa al reintentar se marca como inestable (env E2E_RERUNS)",
+    )
+    parser.add_argument(
+        "--no-quarantine", dest="quarantine", action="store_false",
+        default=os.environ.get("E2E_QUARANTINE", "1") != "0",
+        help="No apartar del resultado los fallos de tests marcados como inestables por el "
+             "historial de .e2e/history.sqlite3 (env E2E_QUARANTINE=0)",
+    )
+    parser.add_argument(
+        "--visual", action="store_true", default=os.environ.get("E2E_VISUAL") == "1",
+        help="Regresión visual: en test_responsive_design capturar las regiones clave en cada viewport "
+             "y compararlas con visual-baselines/ (requiere numpy y Pillow; env E2E_VISUAL=1)",
+    )
+    parser.add_argument(
+        "--update-visual-baselines", action="store_true",
+        default=os.environ.get("E2E_UPDATE_VISUAL_BASELINES") == "1",
+        help="Reescribir las líneas base visuales con las capturas de esta ejecución "
+             "(implica --visual; env E2E_UPDATE_VISUAL_BASELINES=1)",
+    )
+    parser.add_argument(
+        "--backend", choices=("selenium", "async"), default=os.environ.get("E2E_BACKEND", "selenium"),
+        help="selenium: ChromeDriver y un hilo por sesión; async: un solo Chrome por CDP con --workers "
+             "páginas aisladas en un solo event loop y esperas resueltas por el navegador "
+             "(requiere websockets; env E2E_BACKEND)",
+    )
+    parser.add_argument(
+        "--resources", metavar="SEGUNDOS", type=float, nargs="?", const=0.5,
+        default=float(os.environ.get("E2E_RESOURCES", "0")) or None,
+        help="Muestrear cada SEGUNDOS (por defecto 0.5) RSS, CPU y procesos de ChromeDriver y Chrome "
+             "y el heap de JS de cada test; van al JSON/JUnit y al resumen (requiere psutil; "
+             "env E2E_RESOURCES)",
+    )
+    parser.add_argument(
+        "--trace", metavar="SEGUNDOS", type=float, nargs="?", const=30.0,
+        default=float(os.environ.get("E2E_TRACE", "0")) or None,
+        help="Guardar en memoria los últimos SEGUNDOS (por defecto 30) de comandos, consola, red y estado "
+             "del DOM de cada sesión y escribirlos en .e2e/traces solo cuando un test falla (env E2E_TRACE)",
+    )
+    args = parser.parse_args(argv)
+    if args.matrix and args.backend != "selenium":
+        parser.error("--matrix solo está disponible con --backend selenium")
+    if args.load and args.network:
+        # Cada usuario escribiría el mismo <test>.har a la vez
+        parser.error("--network no se puede combinar con --load")
+    args.visual = args.visual or args.update_visual_baselines
+    if args.profile is None:
+        args.profile = "headless" if args.load else DEFAULT_PROFILE
+    if args.load and args.duration is None and args.iterations is None:
+        args.iterations = args.load
+    return args
 
 
 if __name__ == "__main__":
-    test_suite = None
+    STARTUP.add("imports", time.perf_counter() - IMPORTS_STARTED)
+    args = parse_args()
+    pool = SessionPool(
+        functools.partial(create_driver, args.profile, performance_log=bool(args.network)),
+        size=args.load or args.workers,
+    )
+    server = None
+    if args.local_server:
+        from e2e_server import LocalSiteServer
+        server = LocalSiteServer(args.local_server)
+    metrics = PerformanceRecorder()
+    network = None
+    if args.network:
+        from e2e_network import NetworkRecorder
+        network = NetworkRecorder(args.network)
+    profiler = CommandProfiler() if args.command_profile is not None else None
+    # Bajo carga las latencias no son representativas: ni se usan ni se guardan
+    timeouts = AdaptiveTimeouts() if args.adaptive_timeouts and not args.load else None
+    fixtures = FixtureStore(refresh=args.refresh_fixtures)
+    visual = None
+    resources = None
+    trace = None
+    if args.trace:
+        from e2e_trace import TraceRecorder
+        trace = TraceRecorder(seconds=args.trace)
+    if args.base_url:
+        TestBrightBogota.BASE_URL = args.base_url.rstrip("/")
+    report = ResultsReport(
+        base_url=TestBrightBogota.BASE_URL, profile=args.profile, workers=args.workers, repeat=args.repeat,
+    )
+    if args.shard:
+        report.context["shard"] = "{}/{}".format(*args.shard)
+    exit_code = 0
     try:
         print("=" * 60)
         print("INICIANDO TESTS E2E PARA BRIGHT BOGOTÁ")
         print("=" * 60)
         
-        # Verificar que Chrome está disponible
-        try:
-            from selenium.webdriver.chrome.service import Service
-            from selenium import webdriver
-            # Intentar crear un driver de prueba para verificar que todo funciona
-            test_options = Options()
-            test_options.add_argument('--headless')
-            test_options.add_argument('--no-sandbox')
-            test_options.add_argument('--disable-dev-shm-usage')
-            test_driver = webdriver.Chrome(options=test_options)
-            test_driver.quit()
-            print("✓ Chrome y ChromeDriver verificados correctamente\n")
-        except Exception as e:
-            print(f"\n⚠ ADVERTENCIA: Problema al verificar ChromeDriver: {e}")
-            print("  Continuando de todas formas...\n")
+        if server:
+            with STARTUP.phase("servidor local"):
+                TestBrightBogota.BASE_URL = report.context["base_url"] = server.start().url
+        if args.visual:
+            from e2e_visual import VisualChecker
+            visual = VisualChecker(args.profile, update=args.update_visual_baselines)
+        if args.resources:
+            from e2e_resources import ResourceSampler
+            resources = ResourceSampler(args.resources).start()
         
-        test_suite = TestBrightBogota()
-        test_suite.run_all_tests()
+        browser_tests = TESTS
+        if args.tier != "browser" and not args.load and not args.matrix:
+            from e2e_smoke import SMOKE_CHECKS, run_smoke
+            covered = {check.covers for check in SMOKE_CHECKS}
+            browser_tests = [spec for spec in TESTS if spec.method not in covered]
+            if args.tier == "smoke":
+                browser_tests = []
+            # Cada shard comprueba el despliegue antes de abrir Chrome; para no duplicar
+            # resultados en la fusión, solo el primero los guarda si pasan
+            smoke_results = run_smoke(TestBrightBogota.BASE_URL)
+            print_summary(smoke_results)
+            smoke_failed = any(not result.passed for result in smoke_results)
+            if not args.shard or args.shard[0] == 1 or smoke_failed:
+                report.extend(smoke_results)
+            if smoke_failed:
+                print("\n[SMOKE] ✗ Fallaron las comprobaciones HTTP; no se ejecutan los tests en Chrome")
+                browser_tests = []
+        
+        if args.changed_since and browser_tests and not args.load and not args.matrix:
+            from e2e_impact import changed_files, select as select_impacted
+            try:
+                files = changed_files(args.changed_since)
+            except Exception as e:
+                print(f"[IMPACT] ⚠ No se pudieron obtener los cambios de git ({e}); se ejecuta la suite completa")
+            else:
+                selection = select_impacted(browser_tests, files)
+                selection.report(len(browser_tests))
+                browser_tests = selection.specs
+        
+        # (iteración, tests) a ejecutar; con --shard solo la parte que le toca a este nodo
+        iterations = [(iteration, browser_tests) for iteration in range(1, args.repeat + 1)]
+        if args.shard and browser_tests and not args.load and not args.matrix:
+            from e2e_shard import load_durations, shard_iterations
+            iterations = shard_iterations(browser_tests, args.repeat, *args.shard, durations=load_durations())
+            browser_tests = [spec for _, specs in iterations for spec in specs]
+        
+        if browser_tests and args.backend == "selenium":
+            # Versiones de Chrome y ChromeDriver sin abrir ningún navegador; después
+            # arrancar todas las sesiones una sola vez, en paralelo
+            DRIVERS.probe()
+            with STARTUP.phase("sesiones"):
+                pool.start()
+        STARTUP.report()
+        
+        if args.load:
+            from e2e_load import LoadGenerator, Scenario
+            suite_factory = functools.partial(
+                TestBrightBogota, metrics=metrics, profiler=profiler, fixtures=fixtures, resources=resources,
+            )
+            load = LoadGenerator(
+                suite_factory, pool, [Scenario(*scenario) for scenario in SCENARIOS], users=args.load, duration=args.duration,
+                iterations=args.iterations, ramp_up=args.ramp_up,
+            ).run()
+            load.report()
+            metrics.report()
+            if profiler:
+                profiler.report()
+            if load.failed:
+                exit_code = 1
+        elif args.matrix:
+            from e2e_throttle import ThrottleMatrix
+            # Bajo red y CPU limitadas las latencias no sirven para los timeouts adaptativos
+            suite_factory = functools.partial(
+                TestBrightBogota, network=network, profiler=profiler, fixtures=fixtures, resources=resources,
+            )
+            matrix = ThrottleMatrix(
+                suite_factory, pool, {name: MATRIX_FLOWS[name] for name in args.matrix_flows},
+                viewports=args.matrix_viewports, networks=args.matrix_networks, cpus=args.matrix_cpu,
+                workers=args.workers, repeat=args.repeat, metrics=metrics,
+            ).run()
+            matrix.report()
+            metrics.report()
+            if matrix.failed:
+                exit_code = 1
+        elif browser_tests and args.backend == "async":
+            from e2e_async import AsyncRunner
+            from e2e_flaky import TestHistory, rerun_failed
+            history = TestHistory()
+            runner = AsyncRunner(
+                TestBrightBogota.BASE_URL, profile=args.profile, sessions=args.workers,
+                timeout=TestBrightBogota.WAIT_TIMEOUT, fixtures=fixtures,
+                fixture_builders={name: TESTS_BY_METHOD[method] for name, method in FIXTURES.items()},
+            )
+            for iteration, specs in iterations:
+                results = attempts = runner.run(specs, iteration=iteration)
+                if args.reruns and any(not result.passed for result in results):
+                    results, attempts = rerun_failed(runner, specs, results, args.reruns, iteration)
+                # La cuarentena se decide con el historial anterior a esta ejecución
+                reasons = history.apply_quarantine(results) if args.quarantine else {}
+                history.record(attempts)
+                print_summary(results)
+                history.report(results, reasons)
+                report.extend(results)
+        elif browser_tests:
+            from e2e_flaky import TestHistory, rerun_failed
+            history = TestHistory()
+            suite_factory = functools.partial(
+                TestBrightBogota, metrics=metrics, network=network, profiler=profiler, timeouts=timeouts,
+                fixtures=fixtures, visual=visual, resources=resources, trace=trace,
+            )
+            # Los reintentos van siempre por el runner paralelo, cada cadena en una sesión nueva
+            runner = ParallelRunner(suite_factory, pool, workers=args.workers)
+            parallel = args.workers > 1 or args.repeat > 1
+            for iteration, specs in iterations:
+                if parallel:
+                    if args.repeat > 1:
+                        print(f"\n[RUNNER] Iteración {iteration}/{args.repeat}")
+                    results = runner.run(specs, iteration=iteration)
+                else:
+                    with pool.session() as session:
+                        suite = suite_factory(session.driver)
+                        results = suite.run_all_tests(specs)
+                        for result in results:
+                            result.iteration = iteration
+                attempts = results
+                if args.reruns and any(not result.passed for result in results):
+                    results, attempts = rerun_failed(runner, specs, results, args.reruns, iteration)
+                reasons = history.apply_quarantine(results) if args.quarantine else {}
+                history.record(attempts)
+                if parallel or attempts is not results or reasons:
+                    print_summary(results)
+                history.report(results, reasons)
+                report.extend(results)
+            if visual:
+                visual.report()
+            if parallel:
+                metrics.report()
+                if network:
+                    network.report()
+                if profiler:
+                    profiler.report()
+        
+        report.report_slowest_steps()
+        if resources:
+            resources.report()
+        if report.failed:
+            exit_code = 1
+        if args.budgets and args.load:
+            # Las latencias bajo carga no se comparan con los presupuestos ni entran en la línea base
+            print("\n[BUDGETS] Con --load no se comprueban los presupuestos de rendimiento")
+        elif args.budgets:
+            from e2e_budgets import check_budgets
+            if not check_budgets(metrics.samples, args.budgets):
+                exit_code = 1
         
     except KeyboardInterrupt:
         print("\n\n⚠ Tests interrumpidos por el usuario")
-        if test_suite:
-            test_suite.tearDown()
+        exit_code = 130
     except Exception as e:
         print(f"\n\n✗ ERROR FATAL: {e}")
         import traceback
         print("\nTraceback completo:")
         traceback.print_exc()
-        if test_suite:
-            test_suite.tearDown()
-
+        exit_code = 2
+    finally:
+        report.finish()
+        if resources:
+            resources.stop()
+        if args.json:
+            report.write_json(args.json)
+        if args.junit:
+            report.write_junit(args.junit)
+        if pool.stats.created:
+            pool.stats.report()
+        pool.close()
+        if server:
+            server.stop()
+        if args.metrics:
+            metrics.save(args.metrics)
+        if timeouts:
+            timeouts.save()
+        if profiler and args.command_profile:
+            profiler.save(args.command_profile)
+    
+    sys.exit(exit_code)
@@ -0,0 +1,11 @@
+"""
+Tests unitarios de la lógica del harness E2E (sin navegador)
+
+    python -m pytest tests
+"""
+
+import os
+import sys
+
+# Los módulos e2e_*.py están en la raíz del repositorio
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
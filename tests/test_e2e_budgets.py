@@ -0,0 +1,82 @@
+import json
+
+from e2e_budgets import BaselineStore, check_budgets, evaluate, group_samples, regression_limit
+
+BUDGETS = {
+    "tolerance": {"relative": 0.2, "mad_factor": 3, "min_baseline_samples": 5},
+    "tests": {"test_home": {"lcp": 2500}},
+}
+
+
+def samples(test, *values, **extra):
+    return [dict(test=test, lcp=value, fcp=value / 2, timestamp=123.0, **extra) for value in values]
+
+
+def test_group_samples_keeps_numeric_metrics_and_separates_matrix_cells():
+    grouped = group_samples(samples("test_home", 1000) + samples("test_home", 3000, cell="mobile/3g/cpu4x")
+                            + [{"test": "test_home", "viewport": "1024x768", "cached": True}])
+
+    assert grouped == {
+        "test_home": {"lcp": [1000], "fcp": [500.0]},
+        "test_home@mobile/3g/cpu4x": {"lcp": [3000], "fcp": [1500.0]},
+    }
+
+
+def test_evaluate_compares_the_median_with_the_budget():
+    # Un pico aislado no supera el presupuesto: cuenta la mediana
+    assert evaluate(samples("test_home", 1000, 9000, 1200), BUDGETS) == []
+
+    violations = evaluate(samples("test_home", 2600, 2700, 1000), BUDGETS)
+
+    assert [(v.test, v.metric, v.kind, v.value, v.samples) for v in violations] == [
+        ("test_home", "lcp", "budget", 2600, 3),
+    ]
+
+
+def test_evaluate_ignores_metrics_and_cells_without_budget():
+    assert evaluate(samples("test_other", 99999) + samples("test_home", 99999, cell="mobile/3g/cpu4x"), BUDGETS) == []
+
+
+def test_evaluate_flags_regressions_against_the_baseline(tmp_path):
+    baseline = BaselineStore(str(tmp_path / "baseline.json"))
+    for value in (1000, 1010, 990, 1005, 995):
+        baseline.add("test_home", "lcp", value)
+
+    limit = regression_limit(baseline.history("test_home", "lcp"), 0.2, 3)
+    assert limit == 1200
+
+    assert evaluate(samples("test_home", 1150), BUDGETS, baseline) == []
+    violations = evaluate(samples("test_home", 1300), BUDGETS, baseline)
+    assert [(v.kind, v.limit) for v in violations] == [("regression", 1200)]
+
+
+def test_evaluate_needs_enough_history_for_regressions(tmp_path):
+    baseline = BaselineStore(str(tmp_path / "baseline.json"))
+    for value in (1000, 1000):
+        baseline.add("test_home", "lcp", value)
+
+    assert evaluate(samples("test_home", 2000), BUDGETS, baseline) == []
+
+
+def test_baseline_is_only_updated_by_passing_runs(tmp_path):
+    budgets_path, baseline_path = tmp_path / "budgets.json", tmp_path / "baseline.json"
+    budgets_path.write_text(json.dumps(BUDGETS), encoding="utf-8")
+
+    assert not check_budgets(samples("test_home", 3000), str(budgets_path), str(baseline_path))
+    assert not baseline_path.exists()
+
+    assert check_budgets(samples("test_home", 1000, 1200), str(budgets_path), str(baseline_path))
+    assert json.loads(baseline_path.read_text(encoding="utf-8")) == {"test_home": {"lcp": [1100.0]}}
+
+
+def test_corrupt_baseline_starts_empty(tmp_path, capsys):
+    path = tmp_path / "baseline.json"
+    path.write_text('{"test_home": {"lcp": [1', encoding="utf-8")
+
+    baseline = BaselineStore(str(path))
+    baseline.add("test_home", "lcp", 1000)
+    baseline.save()
+
+    assert "No se pudo leer" in capsys.readouterr().out
+    assert json.loads(path.read_text(encoding="utf-8")) == {"test_home": {"lcp": [1000]}}
+    assert [p.name for p in tmp_path.iterdir()] == ["baseline.json"]
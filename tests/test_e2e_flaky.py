@@ -0,0 +1,99 @@
+from e2e_flaky import TestHistory as History, _is_flaky, rerun_failed
+from e2e_results import TestResult as Result
+from e2e_runner import TestSpec as Spec
+
+
+def rows(*outcomes, run="r"):
+    """Filas (run_id, iteración, intento, pasó, duración) de una ejecución por intento"""
+    return [(f"{run}{position}", 1, 1, passed, 1.0) for position, passed in enumerate(outcomes)]
+
+
+def test_retry_that_passes_in_the_same_run_is_flaky():
+    assert _is_flaky([("a", 1, 1, False, 1.0), ("a", 1, 2, True, 1.0)])
+
+
+def test_failures_in_another_iteration_do_not_count_as_a_retry():
+    assert not _is_flaky([("a", 1, 1, True, 1.0), ("a", 2, 1, False, 1.0)])
+
+
+def test_alternating_results_need_two_recoveries():
+    assert not _is_flaky(rows(True, True, False, True, True))
+    assert _is_flaky(rows(True, False, True, False, True))
+
+
+def test_a_test_that_breaks_and_stays_broken_is_not_flaky():
+    assert not _is_flaky(rows(True, True, True, False, False, False))
+
+
+def record_runs(path, outcomes, duration=1.0):
+    for passed in outcomes:
+        run = History(str(path), min_runs=4)
+        run.record([Result("Test", "test_x", passed, duration=duration)])
+
+
+def test_flaky_test_is_quarantined(tmp_path):
+    path = tmp_path / "history.sqlite3"
+    record_runs(path, [True, False, True, False, True])
+
+    current = History(str(path), min_runs=4)
+    result = Result("Test", "test_x", False)
+    reasons = current.apply_quarantine([result])
+
+    assert result.quarantined and "falla en el 40%" in reasons["test_x"]
+
+
+def test_newly_broken_test_is_not_quarantined(tmp_path):
+    path = tmp_path / "history.sqlite3"
+    record_runs(path, [True, True, True, False, False])
+
+    current = History(str(path), min_runs=4)
+    result = Result("Test", "test_x", False)
+
+    assert current.apply_quarantine([result]) == {} and not result.quarantined
+
+
+def test_attempts_of_the_current_run_are_not_used(tmp_path):
+    path = tmp_path / "history.sqlite3"
+    record_runs(path, [True, True])
+    current = History(str(path), min_runs=4)
+    current.record([Result("Test", "test_x", False), Result("Test", "test_x", True, attempts=2)] * 3)
+
+    assert current.stats("test_x")[0] == 2
+
+
+def test_duration_trigger_does_not_hide_a_test_that_failed_every_attempt(tmp_path):
+    path = tmp_path / "history.sqlite3"
+    for duration, passed in ((1.0, True), (5.0, False), (9.0, True), (1.0, False), (9.0, True), (1.0, True)):
+        record_runs(path, [passed], duration=duration)
+    current = History(str(path), min_runs=4, max_failure_rate=0.9)
+
+    assert "duración inestable" in current.quarantine_reason("test_x")
+    assert current.quarantine_reason("test_x", failed=True) is None
+
+
+class FakeRunner:
+    """ParallelRunner de mentira: cada test pasa a partir del intento de ``passes_on``"""
+
+    def __init__(self, passes_on):
+        self.passes_on = passes_on
+        self.calls = []
+
+    def run(self, specs, iteration=1):
+        self.calls.append([spec.method for spec in specs])
+        attempt = len(self.calls) + 1
+        return [Result(spec.label, spec.method, attempt >= self.passes_on.get(spec.method, 1), iteration=iteration)
+                for spec in specs]
+
+
+def test_rerun_failed_retries_only_failures_and_marks_recoveries():
+    specs = [Spec("A", "a"), Spec("B", "b"), Spec("C", "c")]
+    runner = FakeRunner({"b": 2, "c": 99})
+    first = [Result("A", "a", True), Result("B", "b", False), Result("C", "c", False)]
+
+    final, attempts = rerun_failed(runner, specs, first, reruns=2)
+
+    assert runner.calls == [["b", "c"], ["c"]]
+    assert [(r.test, r.passed, r.flaky, r.attempts) for r in final] == [
+        ("a", True, False, 1), ("b", True, True, 2), ("c", False, False, 3),
+    ]
+    assert len(attempts) == 6
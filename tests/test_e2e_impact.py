@@ -0,0 +1,160 @@
+import textwrap
+
+import pytest
+
+import e2e_impact
+from e2e_impact import _SelectorCollector, css_tokens, index_templates, js_tokens, select
+from e2e_runner import TestSpec as Spec
+
+FILES = {
+    "src/app/header/header.component.ts": """
+        import { Component } from '@angular/core';
+        import { CartService } from '@core/cart.service';
+
+        @Component({
+          selector: 'app-header',
+          templateUrl: './header.component.html',
+          styleUrls: ['./header.component.scss']
+        })
+        export class HeaderComponent {}
+    """,
+    "src/app/header/header.component.html": """
+        <header id="header-component" class="site-header"><a id="cart-nav" class="icon"></a></header>
+    """,
+    "src/app/header/header.component.scss": "",
+    "src/app/cart.service.ts": "import { Item } from './item';",
+    "src/app/item.ts": "export type Item = {}",
+    "src/app/form/form.component.ts": """
+        import { Component } from '@angular/core';
+
+        @Component({selector: 'app-form', templateUrl: './form.component.html'})
+        export class FormComponent {}
+    """,
+    "src/app/form/form.component.html": """
+        <form id="contact-form"><input id="field-{{i}}"><button id="send-btn"></button></form>
+    """,
+    "test_e2e.py": """
+        THANKS_JS = "return document.querySelector('#thanks');"
+
+        class TestBrightBogota:
+            def test_header(self):
+                self.driver.find_element(By.ID, "header-component")
+
+            def test_cart(self):
+                self.waits.has_class("cart-nav", "open")
+
+            def test_open_form(self):
+                self.waits.snapshot(["#contact-page"])
+
+            def test_fill_form(self):
+                self.waits.first_present(["[id^='field-']"])
+
+            def test_send_form(self):
+                self.driver.execute_script(THANKS_JS)
+    """,
+    "e2e_waits.py": """
+        class AppWaits:
+            def snapshot(self, selectors):
+                pass
+
+            def first_present(self, selectors):
+                pass
+
+            def has_class(self, element_id, name):
+                pass
+    """,
+    "e2e_dom.py": "",
+}
+
+SPECS = [
+    Spec("Header", "test_header"),
+    Spec("Carrito", "test_cart"),
+    Spec("Abrir formulario", "test_open_form"),
+    Spec("Rellenar formulario", "test_fill_form", requires=("test_open_form",)),
+    Spec("Enviar formulario", "test_send_form", requires=("test_fill_form",)),
+]
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    for path, content in FILES.items():
+        target = tmp_path / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(textwrap.dedent(content), encoding="utf-8")
+    monkeypatch.setattr(e2e_impact, "ROOT", str(tmp_path))
+    return tmp_path
+
+
+def selected(files):
+    return [spec.method for spec in select(SPECS, files).specs]
+
+
+def test_css_tokens():
+    assert css_tokens("#header-component .logo > app-cart, [id^='cart-item-']") == {
+        ("id", "header-component"), ("class", "logo"), ("tag", "app-cart"), ("id^", "cart-item-"),
+    }
+
+
+def test_js_tokens_read_query_selectors():
+    assert js_tokens("document.querySelectorAll(\"[id^='item-qty-']\"); x.querySelector('.open')") == {
+        ("id^", "item-qty-"), ("class", "open"),
+    }
+
+
+def test_index_follows_templates_styles_and_imports(repo):
+    components, affects = index_templates()
+
+    header = components["src/app/header/header.component.ts"]
+    assert header.selector == "app-header"
+    assert {"header-component", "cart-nav"} <= header.ids
+    assert components["src/app/form/form.component.ts"].id_prefixes == {"field-"}
+    for path in ("src/app/header/header.component.scss", "src/app/cart.service.ts", "src/app/item.ts"):
+        assert affects[path] == {"src/app/header/header.component.ts"}
+
+
+def test_template_change_selects_tests_that_use_its_selectors(repo):
+    assert selected(["src/app/header/header.component.html"]) == ["test_header", "test_cart"]
+
+
+def test_indirect_import_change_reaches_the_component(repo):
+    assert selected(["src/app/item.ts"]) == ["test_header", "test_cart"]
+
+
+def test_collector_reads_locators_waits_and_script_constants(repo):
+    collector = _SelectorCollector()
+
+    assert collector.tokens("test_header") == {("id", "header-component")}
+    assert collector.tokens("test_cart") == {("id", "cart-nav")}
+    assert collector.tokens("test_fill_form") == {("id^", "field-")}
+    assert collector.tokens("test_send_form") == {("id", "thanks")}
+
+
+def test_selection_adds_prerequisites_and_dependents(repo):
+    # Solo test_fill_form usa un selector del formulario; necesita test_open_form y test_send_form depende de él
+    selection = select(SPECS, ["src/app/form/form.component.html"])
+
+    assert [spec.method for spec in selection.specs] == ["test_open_form", "test_fill_form", "test_send_form"]
+    assert selection.reasons["test_fill_form"] == {"src/app/form/form.component.html"}
+    assert selection.reasons["test_open_form"] == selection.reasons["test_send_form"] == {"(dependencia)"}
+
+
+def test_ignored_files_select_nothing(repo):
+    selection = select(SPECS, ["README.md", "src/app/form/form.component.spec.ts", "tests/test_x.py"])
+
+    assert not selection.full and selection.specs == []
+
+
+@pytest.mark.parametrize("path", [
+    "e2e_budgets.json", "visual-baselines/desktop/header.png", "run_tests.sh", "angular.json", "e2e_waits.py",
+])
+def test_global_changes_run_the_full_suite(repo, path):
+    selection = select(SPECS, [path])
+
+    assert selection.full and selection.specs == SPECS
+
+
+@pytest.mark.parametrize("path", ["src/app/unknown.pipe.ts", "notes.txt"])
+def test_unattributable_changes_run_the_full_suite(repo, path):
+    selection = select(SPECS, [path])
+
+    assert selection.full and "no se puede atribuir" in selection.reason
@@ -0,0 +1,71 @@
+import pytest
+
+from e2e_runner import TestSpec as Spec
+from e2e_schedule import blocked_by, chains, plan
+
+MOBILE = (375, 667)
+DESKTOP = (1024, 768)
+
+
+def spec(method, **options):
+    return Spec(method, method, **options)
+
+
+def methods(specs):
+    return [s.method for s in specs]
+
+
+def test_plan_puts_prerequisites_first():
+    specs = [spec("checkout", requires=("add",)), spec("add", requires=("open",)), spec("open")]
+
+    assert methods(plan(specs)) == ["open", "add", "checkout"]
+
+
+def test_plan_groups_tests_by_viewport():
+    specs = [spec("a", viewport=MOBILE), spec("b", viewport=DESKTOP), spec("c", viewport=MOBILE),
+             spec("d", viewport=DESKTOP), spec("e", viewport=DESKTOP)]
+
+    ordered = plan(specs)
+
+    viewports = [s.viewport for s in ordered]
+    changes = sum(1 for previous, current in zip(viewports, viewports[1:]) if previous != current)
+    assert changes == 1
+    # Sin estado previo, empieza por el viewport con más tests listos
+    assert viewports[0] == DESKTOP
+
+
+def test_plan_keeps_registry_order_on_ties():
+    specs = [spec("c"), spec("a"), spec("b")]
+
+    assert methods(plan(specs)) == ["c", "a", "b"]
+
+
+def test_plan_ignores_prerequisites_outside_the_selection():
+    assert methods(plan([spec("add", requires=("open",))])) == ["add"]
+
+
+def test_plan_rejects_cycles():
+    with pytest.raises(ValueError, match="circulares"):
+        plan([spec("a", requires=("b",)), spec("b", requires=("a",))])
+
+
+def test_chains_group_tests_joined_by_requires():
+    specs = [spec("open"), spec("alone"), spec("add", requires=("open",)), spec("checkout", requires=("add",)),
+             spec("other", requires=("missing",))]
+
+    groups = [methods(chain) for chain in chains(specs)]
+
+    assert sorted(groups) == [["alone"], ["open", "add", "checkout"], ["other"]]
+
+
+def test_chains_merge_tests_that_share_a_prerequisite():
+    specs = [spec("a", requires=("base",)), spec("b", requires=("base",)), spec("base")]
+
+    assert [methods(chain) for chain in chains(specs)] == [["base", "a", "b"]]
+
+
+def test_blocked_by_returns_the_first_failed_prerequisite():
+    dependent = spec("c", requires=("a", "b"))
+
+    assert blocked_by(dependent, {"a": True, "b": False}) == "b"
+    assert blocked_by(dependent, {"a": True}) is None
@@ -0,0 +1,95 @@
+import argparse
+import json
+
+import pytest
+
+from e2e_results import ResultsReport, TestResult as Result
+from e2e_runner import TestSpec as Spec
+from e2e_shard import load_report, merge, parse_shard, shard_iterations
+
+SPECS = [
+    Spec("open", "open"),
+    Spec("add", "add", requires=("open",)),
+    Spec("banner", "banner"),
+    Spec("menu", "menu"),
+    Spec("form", "form"),
+]
+DURATIONS = {"open": 4.0, "add": 6.0, "banner": 1.0, "menu": 2.0, "form": 3.0}
+
+
+def assignment(count, repeat=2, durations=DURATIONS):
+    return [shard_iterations(SPECS, repeat, index, count, durations=durations) for index in range(1, count + 1)]
+
+
+def units(iterations):
+    return [(iteration, spec.method) for iteration, specs in iterations for spec in specs]
+
+
+def test_parse_shard():
+    assert parse_shard("2/4") == (2, 4)
+    for value in ("0/2", "3/2", "x"):
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_shard(value)
+
+
+def test_every_test_and_iteration_goes_to_exactly_one_shard():
+    shards = assignment(3)
+
+    everything = sorted(unit for shard in shards for unit in units(shard))
+    assert everything == sorted((iteration, spec.method) for iteration in (1, 2) for spec in SPECS)
+
+
+def test_chains_are_not_split_across_shards():
+    for shard in assignment(3):
+        for _, specs in shard:
+            methods = [spec.method for spec in specs]
+            assert ("open" in methods) == ("add" in methods)
+
+
+def test_assignment_is_deterministic():
+    assert [units(shard) for shard in assignment(3)] == [units(shard) for shard in assignment(3)]
+
+
+def test_longest_units_are_spread_first():
+    # LPT con repeat=1: open+add (10s) a un shard, form+menu (5s) y banner (1s) al otro
+    first, second = assignment(2, repeat=1)
+
+    assert units(first) == [(1, "open"), (1, "add")]
+    assert units(second) == [(1, "banner"), (1, "menu"), (1, "form")]
+
+
+def test_tests_without_history_count_as_the_median():
+    shards = assignment(2, repeat=1, durations={"banner": 1.0, "menu": 3.0})
+
+    assert sorted(unit for shard in shards for unit in units(shard)) == sorted((1, s.method) for s in SPECS)
+
+
+def write_shard(path, results, shard):
+    report = ResultsReport(base_url="http://localhost", shard=shard)
+    report.extend(results)
+    report.finish()
+    report.write_json(str(path))
+    return str(path)
+
+
+def test_merge_counts_each_test_once_and_keeps_the_failure(tmp_path):
+    smoke_passed = Result("Home", "test_homepage_loads", True)
+    smoke_failed = Result("Home", "test_homepage_loads", False)
+    first = write_shard(tmp_path / "1.json", [smoke_passed, Result("Menú", "menu", True)], "1/2")
+    second = write_shard(tmp_path / "2.json", [smoke_failed, Result("Form", "form", True, iteration=2)], "2/2")
+
+    report = load_report([first, second])
+
+    assert [(r.iteration, r.test, r.passed) for r in report.results] == [
+        (1, "menu", True), (1, "test_homepage_loads", False), (2, "form", True),
+    ]
+    assert report.context["shards"] == 2 and "shard" not in report.context
+
+
+def test_merge_writes_the_combined_report_and_exit_code(tmp_path):
+    first = write_shard(tmp_path / "1.json", [Result("Menú", "menu", True)], "1/2")
+    second = write_shard(tmp_path / "2.json", [Result("Form", "form", False)], "2/2")
+    merged = tmp_path / "merged.json"
+
+    assert merge([first, second], json_path=str(merged)) == 1
+    assert json.loads(merged.read_text(encoding="utf-8"))["summary"]["total"] == 2
@@ -0,0 +1,56 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("PIL")
+
+from e2e_visual import changed_pixels  # noqa: E402
+
+THRESHOLD = 0.1
+
+
+def white(height=10, width=10):
+    return np.full((height, width, 3), 255, dtype=np.uint8)
+
+
+def test_identical_images_have_no_changes():
+    image = white()
+    image[2:5, 2:5] = (30, 60, 90)
+
+    assert not changed_pixels(image, image.copy(), THRESHOLD).any()
+
+
+def test_changes_below_the_threshold_are_ignored():
+    current = white()
+    current[:, :] = (250, 252, 249)
+
+    assert not changed_pixels(white(), current, THRESHOLD).any()
+
+
+def test_changed_block_is_reported():
+    current = white()
+    current[3:6, 3:6] = (0, 0, 0)
+
+    changed = changed_pixels(white(), current, THRESHOLD)
+
+    assert changed.sum() == 9
+    assert changed[3:6, 3:6].all()
+
+
+def test_one_pixel_shift_is_tolerated_only_with_a_neighbourhood():
+    baseline, current = white(), white()
+    baseline[:, 4] = (0, 0, 0)
+    current[:, 5] = (0, 0, 0)
+
+    assert not changed_pixels(baseline, current, THRESHOLD).any()
+    assert changed_pixels(baseline, current, THRESHOLD, shift=0).sum() == 20
+
+
+def test_masked_pixels_are_never_reported():
+    current = white()
+    current[3:6, 3:6] = (0, 0, 0)
+    mask = np.zeros((10, 10), dtype=bool)
+    mask[3:6, 3:5] = True
+
+    changed = changed_pixels(white(), current, THRESHOLD, mask=mask)
+
+    assert changed.sum() == 3 and changed[3:6, 5].all()